@@ -1,18 +1,134 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Optional
 
 class Settings(BaseSettings):
     # API Settings
     API_V1_STR: str = "/api/v1"
     PROJECT_NAME: str = "AI Portfolio"
-    
-    # OpenAI Settings
-    OPENAI_API_KEY: str
+
+    # OpenAI Settings (without an API key the app still starts; LLM
+    # endpoints answer 503)
+    OPENAI_API_KEY: Optional[str] = None
     OPENAI_MODEL: str = "gpt-4o-mini"
-    
+    OPENAI_BASE_URL: Optional[str] = None
+    OPENAI_TIMEOUT: float = 60.0
+    OPENAI_MAX_CONCURRENCY: int = 32
+    OPENAI_MAX_CONNECTIONS: int = 64
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = 32
+    # Identical concurrent completions share one in-flight call
+    OPENAI_COALESCE_REQUESTS: bool = True
+
+    # LLM resilience: retries with jittered backoff on timeouts, connection
+    # errors, 429 and 5xx; OPENAI_TIMEOUT bounds one attempt and
+    # OPENAI_DEADLINE_SECONDS the whole call
+    OPENAI_MAX_RETRIES: int = 3
+    OPENAI_RETRY_BASE_DELAY: float = 0.5
+    OPENAI_RETRY_MAX_DELAY: float = 8.0
+    OPENAI_DEADLINE_SECONDS: float = 120.0
+    # Send a second request when one runs past this latency percentile (e.g. 95)
+    OPENAI_HEDGE_PERCENTILE: Optional[float] = None
+    OPENAI_HEDGE_MIN_SAMPLES: int = 20
+    # Fail fast for OPENAI_BREAKER_RESET_SECONDS after this many failures in a row
+    OPENAI_BREAKER_FAILURES: int = 5
+    OPENAI_BREAKER_RESET_SECONDS: float = 30.0
+
+    # Model routing: prompts and small refinements go to the fast model, long
+    # inputs to the large model, and calls whose X-Latency-Budget-Ms the
+    # routed model's recent p90 latency exceeds to the fast model. A call
+    # that times out is retried once on the fallback model. Unset models
+    # mean OPENAI_MODEL.
+    OPENAI_FAST_MODEL: Optional[str] = None
+    OPENAI_LARGE_MODEL: Optional[str] = None
+    OPENAI_FALLBACK_MODEL: Optional[str] = None
+    OPENAI_FAST_OPERATIONS: list = ["extract_prompt", "extract_resume_fields", "refine_patch"]
+    OPENAI_FAST_MAX_TOKENS: int = 2000
+    OPENAI_LARGE_MIN_TOKENS: int = 4000
+    # Share of the latency budget (or of OPENAI_DEADLINE_SECONDS without one)
+    # the routed model gets before the fallback
+    OPENAI_FALLBACK_BUDGET_SHARE: float = 0.6
+
+    # Resumes estimated above this many tokens are extracted in parallel chunks
+    CHUNKED_EXTRACTION_THRESHOLD_TOKENS: int = 6000
+    CHUNK_TARGET_TOKENS: int = 2500
+
+    # Rule-based resume extraction: rules alone above MIN_CONFIDENCE, rules
+    # plus an LLM call for the missing fields above PARTIAL_CONFIDENCE
+    RULE_EXTRACTION_ENABLED: bool = True
+    RULE_EXTRACTION_MIN_CONFIDENCE: float = 0.85
+    RULE_EXTRACTION_PARTIAL_CONFIDENCE: float = 0.5
+
+    # Refine Settings ("patch" sends only relevant sections, "full" the whole portfolio)
+    REFINE_MODE: str = "patch"
+
+    # Extraction cache Settings
+    EXTRACTION_CACHE_SIZE: int = 256
+    EXTRACTION_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    EXTRACTION_CACHE_DB_PATH: Optional[str] = None
+    EXTRACTION_CACHE_MAX_DISK_ENTRIES: int = 10000
+
+    # Upload Settings: larger files get 413; uploads stay in memory up to
+    # UPLOAD_SPOOL_MAX_MEMORY and go to a temp file (in UPLOAD_TMP_DIR) beyond
+    UPLOAD_MAX_BYTES: int = 10 * 1024 * 1024
+    UPLOAD_SPOOL_MAX_MEMORY: int = 1024 * 1024
+    UPLOAD_CHUNK_SIZE: int = 64 * 1024
+    UPLOAD_TMP_DIR: Optional[str] = None
+
+    # Resume parsing Settings
+    PARSE_POOL_WORKERS: int = 2
+    PARSE_TIMEOUT_SECONDS: float = 20.0
+    PARSE_MAX_PAGES: Optional[int] = 50
+    PARSE_WORKER_MAX_JOBS: int = 100
+
+    # Rendered portfolios kept (with gzip/brotli variants) for repeat previews
+    RENDER_CACHE_SIZE: int = 512
+    # Rendered section fragments memoized by the hash of their data
+    FRAGMENT_CACHE_SIZE: int = 4096
+
+    # Batch generation Settings (0 workers = one per CPU)
+    RENDER_POOL_WORKERS: int = 0
+    BATCH_MAX_RECORDS: int = 5000
+    # Largest JSON or NDJSON body /generate/batch and /export accept (413 beyond)
+    BATCH_MAX_BYTES: int = 50 * 1024 * 1024
+
+    # Extraction job Settings (JOB_STORE is "memory" or "sqlite")
+    JOB_WORKERS: int = 4
+    JOB_QUEUE_SIZE: int = 100
+    JOB_STORE: str = "memory"
+    JOB_STORE_PATH: str = "jobs.sqlite3"
+    JOB_MAX_STORED: int = 10000
+    # With the sqlite store, a worker silent for this long is taken as gone
+    # and its unfinished jobs are marked failed
+    JOB_LEASE_SECONDS: float = 60.0
+    JOB_RETRY_AFTER_SECONDS: int = 5
+    JOB_WEBHOOK_TIMEOUT_SECONDS: float = 10.0
+    # Webhooks may only target hosts resolving to public addresses; hosts
+    # listed here (e.g. an internal receiver, or localhost in development)
+    # are exempt
+    JOB_WEBHOOK_ALLOWED_HOSTS: list = []
+
+    # Portfolio store Settings: extracted and refined portfolios are kept as
+    # numbered versions under an id (PORTFOLIO_STORE is "sqlite" or "memory")
+    PORTFOLIO_STORE: str = "sqlite"
+    PORTFOLIO_STORE_PATH: str = "portfolios.sqlite3"
+    PORTFOLIO_MAX_VERSIONS: int = 20
+    PORTFOLIO_MAX_STORED: int = 10000
+    # Published sites: POST /portfolio/publish/{id} writes the page (with
+    # .gz/.br siblings) under SITES_DIR, served at /sites/{id}/
+    SITES_DIR: str = "sites"
+
+    # Multi-worker Settings: with SHARED_STATE_PATH set, workers share
+    # metrics, usage stats, rendered previews and the extraction cache
+    # through that SQLite file, flushing counters every FLUSH_SECONDS
+    SHARED_STATE_PATH: Optional[str] = None
+    SHARED_STATE_FLUSH_SECONDS: float = 5.0
+    SHARED_RENDER_TTL_SECONDS: int = 3600
+    # Open the LLM connection, parse pool and templates before serving
+    WARMUP_ON_STARTUP: bool = False
+
     # CORS Settings
     BACKEND_CORS_ORIGINS: list = ["http://localhost:3000", "http://localhost:5173"]
-    
+
     class Config:
         env_file = ".env"
         case_sensitive = True
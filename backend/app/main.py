@@ -1,11 +1,28 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.config import settings
-from app.routes import portfolio
+from app.routes import portfolio, jobs, sites
+from app.services.parse_pool import get_parse_pool
+from app.services.portfolio_generator import get_portfolio_generator
+from app.services.metrics import metrics, ServerTimingMiddleware
+from app.services.model_router import LatencyBudgetMiddleware
+from app.services.uploads import UploadLimitMiddleware
+from app.services.responses import FastJSONResponse
+from app.services.usage_stats import get_usage_stats
+from app.services.shared_state import CounterSync, get_shared_state
+from app.services.warmup import warm_up
+from app.services.static_sites import SITES_URL
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    # Routes returning plain dicts are encoded with orjson when available
+    default_response_class=FastJSONResponse
 )
 
 # CORS middleware
@@ -15,15 +32,77 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-Cache", "ETag", "Content-Range"],
 )
 
+# Per-stage timings for every response
+app.add_middleware(ServerTimingMiddleware)
+
+# X-Latency-Budget-Ms request header for LLM model routing
+app.add_middleware(LatencyBudgetMiddleware)
+
+# Refuse oversized uploads before the form parser spools them
+app.add_middleware(UploadLimitMiddleware, max_bytes=settings.UPLOAD_MAX_BYTES)
+
 # Include routers
 app.include_router(portfolio.router, prefix=f"{settings.API_V1_STR}/portfolio", tags=["portfolio"])
+app.include_router(jobs.router, prefix=f"{settings.API_V1_STR}/jobs", tags=["jobs"])
+app.include_router(sites.router, prefix=SITES_URL, tags=["sites"])
+
+@app.on_event("startup")
+async def start_job_queue():
+    # The queue (and its SQLite store, if configured) is built here rather
+    # than when the router is imported
+    await jobs.get_job_queue().start()
+
+async def _flush_shared_counters(interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            metrics.flush()
+            get_usage_stats().flush()
+        except Exception as e:
+            logger.warning("Flushing shared counters failed: %s", e)
+
+@app.on_event("startup")
+async def attach_shared_state():
+    # With several workers, /metrics and usage stats report the sum over all
+    # of them; each worker pushes its changes periodically and on shutdown
+    store = get_shared_state()
+    if store is None:
+        return
+    metrics.attach(CounterSync(store, "metrics:"))
+    get_usage_stats().attach(CounterSync(store, "usage:"))
+    app.state.flush_task = asyncio.create_task(_flush_shared_counters(settings.SHARED_STATE_FLUSH_SECONDS))
+
+@app.on_event("startup")
+async def warm_up_worker():
+    # Runs before this worker accepts connections
+    if settings.WARMUP_ON_STARTUP:
+        await warm_up(get_portfolio_generator())
+
+@app.on_event("shutdown")
+async def shutdown_worker_pools():
+    flush_task = getattr(app.state, "flush_task", None)
+    if flush_task is not None:
+        flush_task.cancel()
+        metrics.flush()
+        get_usage_stats().flush()
+    if jobs.get_job_queue.cache_info().currsize:
+        await jobs.get_job_queue().stop()
+    get_parse_pool().shutdown()
+    # Only shut down the generator's render pool if it was ever built
+    if get_portfolio_generator.cache_info().currsize:
+        get_portfolio_generator().shutdown()
 
 @app.get("/")
 async def root():
     return {"message": "AI Portfolio Generator API", "status": "running"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthyyy"}
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr
-from typing import List, Optional, Union
+from typing import List, Literal, Optional, Union
 
 class PersonalInfo(BaseModel):
     name: str
@@ -47,4 +47,21 @@ class TextPromptRequest(BaseModel):
 
 class PortfolioGenerateRequest(BaseModel):
     data: PortfolioData
-    template: str = "template1"
\ No newline at end of file
+    template: str = "template1"
+
+class BatchGenerateRequest(BaseModel):
+    records: List[PortfolioData]
+    template: str = "template1"
+    format: Literal["ndjson", "zip"] = "ndjson"
+
+class Job(BaseModel):
+    id: str
+    kind: Literal["resume", "prompt"]
+    status: Literal["queued", "running", "succeeded", "failed"] = "queued"
+    created_at: float
+    updated_at: float
+    webhook_url: Union[str, None] = None
+    result: Union[PortfolioData, None] = None
+    # Stored portfolio holding the result (see /portfolio/{id})
+    portfolio_id: Union[str, None] = None
+    error: Union[str, None] = None
@@ -0,0 +1,118 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import JSONResponse
+from app.config import settings
+from app.models import TextPromptRequest
+from app.services.nlp_extractor import get_nlp_extractor
+from app.services.portfolio_store import get_portfolio_store
+from app.services.jobs import JobQueue, QueueFullError, WebhookURLError, check_webhook_url, get_job_store
+from app.services.uploads import SpooledUpload, receive_upload, upload_openapi
+from app.services.responses import success_response
+from functools import lru_cache
+from typing import Optional
+
+router = APIRouter()
+
+async def _run_resume_job(upload: SpooledUpload):
+    with upload:
+        portfolio_data, _ = await get_nlp_extractor().extract_from_resume_cached(upload, upload.file_type)
+    return portfolio_data, get_portfolio_store().create(portfolio_data).id
+
+async def _run_prompt_job(prompt: str):
+    portfolio_data = await get_nlp_extractor().extract_from_prompt(prompt)
+    return portfolio_data, get_portfolio_store().create(portfolio_data).id
+
+@lru_cache()
+def get_job_queue() -> JobQueue:
+    """Process-wide job queue; started and stopped with the app"""
+    return JobQueue(
+        store=get_job_store(),
+        handlers={
+            "resume": _run_resume_job,
+            "prompt": _run_prompt_job,
+        },
+        workers=settings.JOB_WORKERS,
+        max_queued=settings.JOB_QUEUE_SIZE,
+        webhook_timeout=settings.JOB_WEBHOOK_TIMEOUT_SECONDS,
+        webhook_allowed_hosts=settings.JOB_WEBHOOK_ALLOWED_HOSTS,
+        heartbeat_seconds=settings.JOB_LEASE_SECONDS / 4
+    )
+
+async def _accepted(
+    job_queue: JobQueue,
+    job_kind: str,
+    payload: dict,
+    webhook_url: Optional[str]
+) -> JSONResponse:
+    if webhook_url:
+        try:
+            await check_webhook_url(webhook_url, settings.JOB_WEBHOOK_ALLOWED_HOSTS)
+        except WebhookURLError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        job = job_queue.submit(job_kind, payload, webhook_url)
+    except QueueFullError:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many extraction jobs queued. Retry later.",
+            headers={"Retry-After": str(settings.JOB_RETRY_AFTER_SECONDS)}
+        )
+
+    return JSONResponse(
+        status_code=202,
+        content={
+            "success": True,
+            "job_id": job.id,
+            "status": job.status,
+            "status_url": f"{settings.API_V1_STR}/jobs/{job.id}"
+        }
+    )
+
+@router.post(
+    "/extract/resume",
+    openapi_extra=upload_openapi(webhook_url="URL to POST the finished job to")
+)
+async def submit_resume_job(
+    request: Request,
+    job_queue: JobQueue = Depends(get_job_queue)
+):
+    """
+    Endpoint: POST /api/v1/jobs/extract/resume
+
+    Queue a resume extraction and return its job id right away.
+    Poll GET /api/v1/jobs/{job_id}, or pass webhook_url to receive the
+    finished job as a POST.
+    """
+    # The job owns the spooled upload from here and deletes it when done
+    upload, fields = await receive_upload(request)
+    try:
+        return await _accepted(job_queue, "resume", {"upload": upload}, fields.get("webhook_url") or None)
+    except HTTPException:
+        upload.close()
+        raise
+
+@router.post("/extract/prompt")
+async def submit_prompt_job(
+    request: TextPromptRequest,
+    webhook_url: Optional[str] = None,
+    job_queue: JobQueue = Depends(get_job_queue)
+):
+    """
+    Endpoint: POST /api/v1/jobs/extract/prompt
+
+    Queue an extraction from a text description
+    """
+    return await _accepted(job_queue, "prompt", {"prompt": request.prompt}, webhook_url)
+
+@router.get("/{job_id}")
+async def get_job(job_id: str, job_queue: JobQueue = Depends(get_job_queue)):
+    """
+    Endpoint: GET /api/v1/jobs/{job_id}
+
+    Status of a job, with the extracted data once it has succeeded
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return success_response(job, key="job")
@@ -1,114 +1,513 @@
-from fastapi import APIRouter, File, UploadFile, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
+from starlette.background import BackgroundTask
+from app.config import settings
 from app.models import (
     PortfolioData, 
     TextPromptRequest, 
-    PortfolioGenerateRequest
+    PortfolioGenerateRequest,
+    BatchGenerateRequest
 )
-from app.services.nlp_extractor import NLPExtractor
-from app.services.portfolio_generator import PortfolioGenerator
+from app.services.nlp_extractor import NLPExtractor, get_nlp_extractor
+from app.services.portfolio_generator import TEMPLATES, PortfolioGenerator, get_portfolio_generator
+from app.services.parse_pool import ParseTimeoutError
+from app.services.resilience import CircuitOpenError, LLMNotConfiguredError, LLM_UNAVAILABLE_ERRORS
+from app.services.uploads import read_body, receive_upload, upload_openapi
+from app.services.batch_output import iter_ndjson, iter_file, write_zip
+from app.services.static_export import PAGE_ASSET_BASE, iter_site_files, write_site_zip
+from app.services.usage_stats import get_usage_stats
+from app.services.model_router import get_model_router
+from app.services.render_cache import CODINGS, RenderCache, RenderedPortfolio, get_render_cache, negotiate_encoding, etag_matches
+from app.services.metrics import timed
+from app.services.responses import dumps, envelope_body
+from app.services.portfolio_store import (
+    PortfolioStore,
+    PortfolioVersion,
+    VersionConflictError,
+    get_portfolio_store,
+    version_etag
+)
+from app.services.static_sites import SITE_ASSET_BASE, SitePublisher, get_site_publisher
+from typing import Dict, Literal, Optional
+import json
+import math
+import tempfile
 
 router = APIRouter()
 
-# Initialize services
-nlp_extractor = NLPExtractor()
-portfolio_generator = PortfolioGenerator()
+# Services are built on first use and injected with Depends, so importing
+# the app (and answering /health) does not wait for them
+
+def _llm_unavailable(e: Exception) -> HTTPException:
+    """503 while the LLM circuit is open (with Retry-After) or no API key is set, 504 on LLM deadline"""
+    if isinstance(e, CircuitOpenError):
+        return HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(math.ceil(e.retry_after))}
+        )
+    if isinstance(e, LLMNotConfiguredError):
+        return HTTPException(status_code=503, detail=str(e))
+    return HTTPException(status_code=504, detail=str(e))
 
 # Request model for refine endpoint
 class RefineRequest(BaseModel):
     current_data: PortfolioData
     refinement: str
+    mode: Optional[Literal["patch", "full"]] = None
+
+# Request model for refining a stored portfolio
+class RefineByIdRequest(BaseModel):
+    refinement: str
+    mode: Optional[Literal["patch", "full"]] = None
+
+# Request model for fragments endpoint
+class FragmentsRequest(BaseModel):
+    data: PortfolioData
+    template: str = "template1"
+    # Section digests the client is already showing, from an earlier response
+    known: Dict[str, str] = {}
+
+def _stored_response(stored: PortfolioVersion, headers: Optional[Dict[str, str]] = None) -> Response:
+    """A stored portfolio version in the usual envelope, with its id, version and ETag"""
+    return Response(
+        content=envelope_body("data", stored.data_json.encode(), {"id": stored.id, "version": stored.version}),
+        media_type="application/json",
+        headers={"ETag": stored.etag, **(headers or {})}
+    )
+
+def _version_from_etag(etag: str, portfolio_id: str) -> Optional[int]:
+    """Version number from a portfolio ETag ("<id>.<version>"), or None if it is not one"""
+    portfolio, _, version = etag.strip().removeprefix("W/").strip('"').rpartition(".")
+    if portfolio != portfolio_id or not version.isdigit():
+        return None
+    return int(version)
 
-@router.post("/extract/resume")
-async def extract_from_resume(file: UploadFile = File(...)):
+@router.post("/extract/resume", openapi_extra=upload_openapi())
+async def extract_from_resume(
+    request: Request,
+    nlp_extractor: NLPExtractor = Depends(get_nlp_extractor),
+    portfolio_store: PortfolioStore = Depends(get_portfolio_store)
+):
     """
     Endpoint: POST /api/v1/portfolio/extract/resume
     
-    Upload resume file and extract structured portfolio data
+    Upload resume file and extract structured portfolio data.
+    The file type is detected from the content (PDF or DOCX; 415 for
+    anything else) and files over UPLOAD_MAX_BYTES are refused with 413.
+    Repeat uploads of the same file are served from the extraction cache;
+    the X-Cache response header reports HIT or MISS. The result is stored
+    as a new portfolio; its "id" works with /refine/{id}, /generate/{id}
+    and GET /{id}.
     """
     try:
-        contents = await file.read()
-        file_extension = file.filename.split('.')[-1].lower()
+        with timed("upload"):
+            upload, _ = await receive_upload(request)
         
-        if file_extension not in ['pdf', 'docx', 'doc']:
-            raise HTTPException(
-                status_code=400, 
-                detail="Invalid file type. Only PDF and DOCX are supported."
+        with upload:
+            portfolio_data, cache_hit = await nlp_extractor.extract_from_resume_cached(
+                upload,
+                upload.file_type
             )
         
-        portfolio_data = await nlp_extractor.extract_from_resume(
-            contents, 
-            file_extension
-        )
-        
-        return {
-            "success": True,
-            "data": portfolio_data.model_dump()
-        }
+        stored = portfolio_store.create(portfolio_data)
+        return _stored_response(stored, headers={"X-Cache": "HIT" if cache_hit else "MISS"})
     
+    except HTTPException:
+        raise
+    except ParseTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except LLM_UNAVAILABLE_ERRORS as e:
+        raise _llm_unavailable(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def _sse_raw_event(event: str, data: bytes) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + data + b"\n\n"
+
+@router.post("/extract/resume/stream", openapi_extra=upload_openapi())
+async def extract_from_resume_stream(
+    request: Request,
+    nlp_extractor: NLPExtractor = Depends(get_nlp_extractor),
+    portfolio_store: PortfolioStore = Depends(get_portfolio_store)
+):
+    """
+    Endpoint: POST /api/v1/portfolio/extract/resume/stream
+    
+    Same as /extract/resume, but answers with Server-Sent Events: a
+    "section" event for each part of the portfolio as soon as the model has
+    written it ({"path": "experience[0]", "value": {...}}), then one
+    "complete" event carrying the validated data and the id it was stored
+    under, or an "error" event.
+    """
+    with timed("upload"):
+        upload, _ = await receive_upload(request)
+    
+    async def events():
+        try:
+            async for path, value in nlp_extractor.stream_from_resume(upload, upload.file_type):
+                if path == "complete":
+                    stored = portfolio_store.create(value)
+                    yield _sse_raw_event("complete", envelope_body(
+                        "data",
+                        stored.data_json.encode(),
+                        {"id": stored.id, "version": stored.version}
+                    ))
+                else:
+                    yield _sse_event("section", {"path": path, "value": value})
+        except Exception as e:
+            yield _sse_event("error", {"success": False, "detail": str(e)})
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(upload.close)
+    )
+
 @router.post("/extract/prompt")
-async def extract_from_prompt(request: TextPromptRequest):
+async def extract_from_prompt(
+    request: TextPromptRequest,
+    nlp_extractor: NLPExtractor = Depends(get_nlp_extractor),
+    portfolio_store: PortfolioStore = Depends(get_portfolio_store)
+):
     """
     Endpoint: POST /api/v1/portfolio/extract/prompt
     
-    Extract portfolio data from text description
+    Extract portfolio data from text description, stored as a new
+    portfolio like /extract/resume
     """
     try:
         portfolio_data = await nlp_extractor.extract_from_prompt(request.prompt)
         
-        return {
-            "success": True,
-            "data": portfolio_data.model_dump()
-        }
+        return _stored_response(portfolio_store.create(portfolio_data))
     
+    except LLM_UNAVAILABLE_ERRORS as e:
+        raise _llm_unavailable(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _rendered_response(
+    request: Request,
+    entry: RenderedPortfolio,
+    representation: str,
+    media_type: str,
+    cache_hit: bool
+) -> Response:
+    """Serve a cached render, honouring If-None-Match and Accept-Encoding"""
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", ""), CODINGS)
+    etag = entry.etag(representation, encoding)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+        "X-Cache": "HIT" if cache_hit else "MISS",
+    }
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=entry.body(representation, encoding), media_type=media_type, headers=headers)
+
 @router.post("/generate")
-async def generate_portfolio(request: PortfolioGenerateRequest):
+async def generate_portfolio(
+    request: PortfolioGenerateRequest,
+    http_request: Request,
+    format: Literal["json", "html"] = "json",
+    stream: bool = False,
+    portfolio_generator: PortfolioGenerator = Depends(get_portfolio_generator),
+    render_cache: RenderCache = Depends(get_render_cache)
+):
     """
     Endpoint: POST /api/v1/portfolio/generate
     
-    Generate HTML portfolio website from structured data
+    Generate HTML portfolio website from structured data.
+    Renders are cached by content: the ETag identifies the data and
+    template, a matching If-None-Match returns 304, and repeat requests are
+    served from cached (compressed once) bodies without rendering again. The
+    "sections" digests can be passed to /generate/fragments later.
+    
+    With ?format=html the page itself is returned as text/html instead of
+    a JSON-escaped string. Adding &stream=true streams a page that is not
+    cached yet, head first, rendering each section as it is sent.
     """
     try:
-        website_files = portfolio_generator.generate(
-            request.data, 
-            request.template
+        return _generate(
+            http_request,
+            request.data,
+            request.template,
+            format,
+            stream,
+            portfolio_generator,
+            render_cache
         )
-        
-        return {
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+def _generate(
+    http_request: Request,
+    data: PortfolioData,
+    template: str,
+    format: str,
+    stream: bool,
+    portfolio_generator: PortfolioGenerator,
+    render_cache: RenderCache
+) -> Response:
+    """Render (or reuse the cached render of) a portfolio in the requested format"""
+    # Checked before anything renders or a stream starts
+    try:
+        render_version = portfolio_generator.render_version(template)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    key = RenderCache.make_key(data, template, render_version)
+    entry = render_cache.get(key)
+    cache_hit = entry is not None
+    
+    if entry is None and format == "html" and stream:
+        etag = RenderCache.etag_for(key, "html")
+        if etag_matches(http_request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        pieces = portfolio_generator.iter_html(data, template)
+        return StreamingResponse(
+            (piece.encode() for piece in pieces),
+            media_type="text/html",
+            headers={"ETag": etag, "Cache-Control": "no-cache", "X-Cache": "MISS"}
+        )
+    
+    if entry is None:
+        website_files, sections = portfolio_generator.generate_with_sections(data, template)
+        json_body = dumps({
             "success": True,
-            "files": website_files
-        }
+            "files": website_files,
+            "sections": sections
+        })
+        entry = render_cache.set(key, website_files, json_body)
+    
+    if format == "html":
+        return _rendered_response(http_request, entry, "html", "text/html", cache_hit)
+    return _rendered_response(http_request, entry, "json", "application/json", cache_hit)
+
+@router.post("/generate/fragments")
+async def generate_fragments(
+    request: FragmentsRequest,
+    portfolio_generator: PortfolioGenerator = Depends(get_portfolio_generator)
+):
+    """
+    Endpoint: POST /api/v1/portfolio/generate/fragments
     
+    Render only the sections whose data changed since the client's last
+    render. Each section of the page sits in an element with a matching
+    data-section attribute ("title" is the document title), so the preview
+    can swap the returned fragments in place.
+    """
+    try:
+        with timed("render"):
+            fragments = portfolio_generator.render_fragments(request.data, request.template)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    
+    return {
+        "success": True,
+        "sections": {slot: digest for slot, (digest, _) in fragments.items()},
+        "fragments": {
+            slot: html for slot, (digest, html) in fragments.items()
+            if request.known.get(slot) != digest
+        }
+    }
+
+@router.get("/preview/{etag}")
+async def get_preview(
+    request: Request,
+    etag: str,
+    render_cache: RenderCache = Depends(get_render_cache)
+):
+    """
+    Endpoint: GET /api/v1/portfolio/preview/{etag}
+    
+    Rendered HTML of a portfolio previously returned by /generate,
+    addressed by its ETag. Supports conditional GET and gzip/brotli.
+    """
+    entry = render_cache.get_by_etag(etag)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Preview not found. Generate it again.")
+    
+    return _rendered_response(request, entry, "html", "text/html", True)
+
+async def _read_batch_request(request: Request) -> BatchGenerateRequest:
+    """Accept either a JSON BatchGenerateRequest or an NDJSON stream of records"""
+    content_type = request.headers.get("content-type", "")
+    body = await read_body(request, settings.BATCH_MAX_BYTES)
+    
+    if content_type.startswith(("application/x-ndjson", "application/jsonl")):
+        records = []
+        for line_number, line in enumerate(body.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                records.append(PortfolioData.model_validate_json(line))
+            except ValidationError as e:
+                raise HTTPException(status_code=422, detail=f"Line {line_number}: {e}")
+        try:
+            return BatchGenerateRequest(
+                records=records,
+                template=request.query_params.get("template", "template1"),
+                format=request.query_params.get("format", "ndjson")
+            )
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=e.errors())
+    
+    try:
+        return BatchGenerateRequest.model_validate_json(body)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors())
+
+@router.post("/generate/batch")
+async def generate_portfolio_batch(
+    request: Request,
+    portfolio_generator: PortfolioGenerator = Depends(get_portfolio_generator)
+):
+    """
+    Endpoint: POST /api/v1/portfolio/generate/batch
+    
+    Generate many portfolios in one call. The body is either a JSON
+    BatchGenerateRequest or NDJSON (one PortfolioData per line, with
+    template and format as query parameters). Results stream back as NDJSON
+    lines in input order, or as a ZIP with one folder per portfolio. Bodies
+    over BATCH_MAX_BYTES get 413.
+    """
+    batch = await _read_batch_request(request)
+    
+    if len(batch.records) > settings.BATCH_MAX_RECORDS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large. At most {settings.BATCH_MAX_RECORDS} records per request."
+        )
+    if batch.template not in TEMPLATES:
+        raise HTTPException(status_code=400, detail=f"Unknown template: {batch.template}")
+    
+    results = portfolio_generator.generate_many(
+        batch.records,
+        batch.template,
+        workers=settings.RENDER_POOL_WORKERS
+    )
+    
+    if batch.format == "ndjson":
+        return StreamingResponse(iter_ndjson(results), media_type="application/x-ndjson")
+    
+    names = {i: record.personal_info.name for i, record in enumerate(batch.records)}
+    archive = tempfile.SpooledTemporaryFile(max_size=16 * 1024 * 1024)
+    await run_in_threadpool(write_zip, results, names, archive)
+    return StreamingResponse(
+        iter_file(archive),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="portfolios.zip"'}
+    )
+
+@router.post("/export")
+async def export_static_site(
+    request: Request,
+    portfolio_generator: PortfolioGenerator = Depends(get_portfolio_generator)
+):
+    """
+    Endpoint: POST /api/v1/portfolio/export
+    
+    Export portfolios as a deployable static site (ZIP). Takes the same
+    body as /generate/batch. Pages link to one shared, minified,
+    content-hashed stylesheet instead of inlining it, and the archive has a
+    manifest.json and a _headers file with long-lived caching for assets.
+    """
+    batch = await _read_batch_request(request)
+    
+    if len(batch.records) > settings.BATCH_MAX_RECORDS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large. At most {settings.BATCH_MAX_RECORDS} records per request."
+        )
+    
+    try:
+        bundles = portfolio_generator.asset_bundles(batch.template)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    results = portfolio_generator.generate_many(
+        batch.records,
+        batch.template,
+        workers=settings.RENDER_POOL_WORKERS,
+        asset_base=PAGE_ASSET_BASE
+    )
+    names = {i: record.personal_info.name for i, record in enumerate(batch.records)}
+    files = iter_site_files(results, names, bundles, batch.template)
+    
+    archive = tempfile.SpooledTemporaryFile(max_size=16 * 1024 * 1024)
+    await run_in_threadpool(write_site_zip, files, archive)
+    return StreamingResponse(
+        iter_file(archive),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="site.zip"'}
+    )
 
 @router.post("/refine")
-async def refine_portfolio(request: RefineRequest):
+async def refine_portfolio(
+    request: RefineRequest,
+    nlp_extractor: NLPExtractor = Depends(get_nlp_extractor),
+    portfolio_store: PortfolioStore = Depends(get_portfolio_store)
+):
     """
     Endpoint: POST /api/v1/portfolio/refine
     
-    Refine existing portfolio based on user feedback
+    Refine existing portfolio based on user feedback. The result is
+    stored as a new portfolio; later refines can use /refine/{id} and
+    send only the refinement.
     """
     try:
         refined_data = await nlp_extractor.refine_data(
             request.current_data,
-            request.refinement
+            request.refinement,
+            request.mode
         )
         
-        return {
-            "success": True,
-            "data": refined_data.model_dump()
-        }
+        return _stored_response(portfolio_store.create(refined_data))
     
+    except LLM_UNAVAILABLE_ERRORS as e:
+        raise _llm_unavailable(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/refine/stats")
+async def get_refine_stats():
+    """
+    Endpoint: GET /api/v1/portfolio/refine/stats
+    
+    Token and latency totals for patch-mode vs full round-trip refines
+    """
+    stats = get_usage_stats().snapshot()
+    return {
+        mode: stats.get(f"refine_{mode}")
+        for mode in ("patch", "full")
+    }
+
+@router.get("/routing/stats")
+async def get_routing_stats():
+    """
+    Endpoint: GET /api/v1/portfolio/routing/stats
+    
+    Configured models, recent latency per model and the latest routing
+    decisions with their outcomes
+    """
+    return get_model_router().snapshot()
+
 @router.get("/templates")
 async def get_available_templates():
     """
@@ -134,4 +533,162 @@ async def get_available_templates():
                 "description": "Traditional business style (coming soon)"
             }
         ]
-    }
\ No newline at end of file
+    }
+
+# Routes on a stored portfolio id are declared last, so the fixed paths
+# above (/generate/batch, /refine/stats, /templates, ...) match first
+
+def _load_stored(
+    portfolio_store: PortfolioStore,
+    portfolio_id: str,
+    version: Optional[int] = None
+) -> PortfolioVersion:
+    stored = portfolio_store.get(portfolio_id, version)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Portfolio not found")
+    return stored
+
+@router.get("/{portfolio_id}")
+async def get_stored_portfolio(
+    portfolio_id: str,
+    request: Request,
+    version: Optional[int] = None,
+    portfolio_store: PortfolioStore = Depends(get_portfolio_store)
+):
+    """
+    Endpoint: GET /api/v1/portfolio/{portfolio_id}
+    
+    Latest version of a stored portfolio, or ?version=N. The ETag names
+    the version, so a client that already has it gets 304 after a lookup
+    of the version number alone; the stored JSON is sent without
+    re-validating it. Numbered versions never change and may be cached.
+    """
+    if version is None:
+        current = portfolio_store.current_version(portfolio_id)
+        if current is None:
+            raise HTTPException(status_code=404, detail="Portfolio not found")
+        etag, cache_control = version_etag(portfolio_id, current), "no-cache"
+    else:
+        etag, cache_control = version_etag(portfolio_id, version), "private, max-age=31536000, immutable"
+    
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+    
+    stored = _load_stored(portfolio_store, portfolio_id, version)
+    return _stored_response(stored, headers={"Cache-Control": cache_control})
+
+@router.post("/generate/{portfolio_id}")
+async def generate_stored_portfolio(
+    portfolio_id: str,
+    http_request: Request,
+    template: str = "template1",
+    version: Optional[int] = None,
+    format: Literal["json", "html"] = "json",
+    stream: bool = False,
+    portfolio_store: PortfolioStore = Depends(get_portfolio_store),
+    portfolio_generator: PortfolioGenerator = Depends(get_portfolio_generator),
+    render_cache: RenderCache = Depends(get_render_cache)
+):
+    """
+    Endpoint: POST /api/v1/portfolio/generate/{portfolio_id}
+    
+    Same as /generate for a stored portfolio (the latest version, or
+    ?version=N), so the request carries no body. Rendering does not change
+    the data, so no new version is stored.
+    """
+    stored = _load_stored(portfolio_store, portfolio_id, version)
+    try:
+        return _generate(
+            http_request,
+            stored.data(),
+            template,
+            format,
+            stream,
+            portfolio_generator,
+            render_cache
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/refine/{portfolio_id}")
+async def refine_stored_portfolio(
+    portfolio_id: str,
+    request: RefineByIdRequest,
+    if_match: Optional[str] = Header(None),
+    nlp_extractor: NLPExtractor = Depends(get_nlp_extractor),
+    portfolio_store: PortfolioStore = Depends(get_portfolio_store)
+):
+    """
+    Endpoint: POST /api/v1/portfolio/refine/{portfolio_id}
+    
+    Refine the latest version of a stored portfolio and store the result
+    as the next version. Send If-Match with the ETag of the version being
+    edited to get 412 instead of refining a newer one. If another edit is
+    stored while the model runs, the result is not stored and the answer
+    is 409; retry against the new version.
+    """
+    stored = _load_stored(portfolio_store, portfolio_id)
+    if if_match is not None and if_match.strip() != "*" and _version_from_etag(if_match, portfolio_id) != stored.version:
+        raise HTTPException(
+            status_code=412,
+            detail=f"Portfolio is at version {stored.version}",
+            headers={"ETag": stored.etag}
+        )
+    
+    try:
+        refined_data = await nlp_extractor.refine_data(stored.data(), request.refinement, request.mode)
+        refined = portfolio_store.add_version(portfolio_id, refined_data, expected_version=stored.version)
+    except VersionConflictError as e:
+        raise HTTPException(
+            status_code=409,
+            detail=str(e),
+            headers={"ETag": version_etag(portfolio_id, e.current_version)}
+        )
+    except LLM_UNAVAILABLE_ERRORS as e:
+        raise _llm_unavailable(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    if refined is None:
+        raise HTTPException(status_code=404, detail="Portfolio not found")
+    return _stored_response(refined)
+
+@router.post("/publish/{portfolio_id}")
+async def publish_stored_portfolio(
+    portfolio_id: str,
+    template: str = "template1",
+    version: Optional[int] = None,
+    portfolio_store: PortfolioStore = Depends(get_portfolio_store),
+    portfolio_generator: PortfolioGenerator = Depends(get_portfolio_generator),
+    publisher: SitePublisher = Depends(get_site_publisher)
+):
+    """
+    Endpoint: POST /api/v1/portfolio/publish/{portfolio_id}
+    
+    Render a stored portfolio (the latest version, or ?version=N) once and
+    publish it as a static site at /sites/{id}/, plus an immutable copy at
+    version_url (/sites/{id}/v{N}-{hash}/) that later publishes never
+    rewrite. The page links to the shared stylesheet, and every file
+    is written with precompressed .gz/.br siblings, so visits are served
+    from disk without rendering.
+    """
+    stored = _load_stored(portfolio_store, portfolio_id, version)
+    try:
+        bundles = portfolio_generator.asset_bundles(template)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        files = await run_in_threadpool(
+            portfolio_generator.generate,
+            stored.data(),
+            template,
+            SITE_ASSET_BASE
+        )
+        urls = await run_in_threadpool(publisher.publish, stored.id, stored.version, files["html"], bundles)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error publishing portfolio: {str(e)}")
+    
+    return {"success": True, "id": stored.id, "version": stored.version, **urls}
@@ -0,0 +1,78 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import RedirectResponse
+from app.services.render_cache import etag_matches
+from app.services.static_sites import SitePublisher, SiteFileResponse, get_site_publisher, parse_byte_range, SITE_SECURITY_HEADERS
+from email.utils import formatdate
+
+router = APIRouter()
+
+@router.get("/{site_id}")
+async def site_root(site_id: str, request: Request):
+    """Redirect /sites/{id} to /sites/{id}/ so relative links resolve"""
+    return RedirectResponse(url=f"{request.url.path}/", status_code=308)
+
+@router.api_route("/{site_id}/{path:path}", methods=["GET", "HEAD"])
+async def serve_site_file(
+    site_id: str,
+    path: str,
+    request: Request,
+    publisher: SitePublisher = Depends(get_site_publisher)
+):
+    """
+    Endpoint: GET /sites/{site_id}/{path}
+
+    Serve a published portfolio (see POST /api/v1/portfolio/publish/{id})
+    straight from disk. The .br or .gz sibling is sent when the client
+    accepts it, so nothing is rendered or compressed per request.
+    Versioned pages and the shared assets are immutable; the latest page at
+    /sites/{id}/ is revalidated with its ETag. A single byte range is
+    served with 206.
+    """
+    target = publisher.resolve(site_id, path)
+    if target is None:
+        raise HTTPException(status_code=404, detail="Not found")
+
+    site_file = await run_in_threadpool(publisher.open, target, request.headers.get("accept-encoding", ""))
+    if site_file is None:
+        if await run_in_threadpool(target.is_dir):
+            return RedirectResponse(url=f"{request.url.path}/", status_code=308)
+        raise HTTPException(status_code=404, detail="Not found")
+
+    headers = {
+        "ETag": site_file.etag,
+        "Last-Modified": formatdate(site_file.stat.st_mtime, usegmt=True),
+        "Cache-Control": site_file.cache_control,
+        "Accept-Ranges": "bytes",
+        "Vary": "Accept-Encoding",
+        **SITE_SECURITY_HEADERS
+    }
+    if site_file.coding != "identity":
+        headers["Content-Encoding"] = site_file.coding
+
+    if etag_matches(request.headers.get("if-none-match"), site_file.etag):
+        site_file.file.close()
+        return Response(status_code=304, headers=headers)
+
+    size = site_file.stat.st_size
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    # A Range is only honoured while the client's copy is current
+    if range_header and (if_range is None or if_range.strip() == site_file.etag):
+        try:
+            byte_range = parse_byte_range(range_header, size)
+        except ValueError:
+            site_file.file.close()
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+        if byte_range is not None:
+            first, last = byte_range
+            return SiteFileResponse(
+                site_file,
+                offset=first,
+                count=last - first + 1,
+                status_code=206,
+                headers={**headers, "Content-Range": f"bytes {first}-{last}/{size}"},
+                method=request.method
+            )
+
+    return SiteFileResponse(site_file, headers=headers, method=request.method)
@@ -0,0 +1,60 @@
+from app.services.responses import dumps
+from typing import Any, Dict, IO, Iterable, Iterator
+import json
+import re
+import zipfile
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+def slugify(text: str) -> str:
+    """Lowercase, filesystem-safe version of text"""
+    slug = re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+    return slug or "portfolio"
+
+def iter_ndjson(results: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    """
+    Encode batch results as newline-delimited JSON
+
+    Args:
+        results: Results from PortfolioGenerator.generate_many
+
+    Yields:
+        One encoded line per result
+    """
+    for result in results:
+        yield dumps(result) + b"\n"
+
+def write_zip(results: Iterable[Dict[str, Any]], names: Dict[int, str], fileobj: IO[bytes]) -> None:
+    """
+    Write batch results into a ZIP archive
+
+    Every successful result becomes <index>-<slug>/index.html; failures are
+    listed in errors.json at the archive root.
+
+    Args:
+        results: Results from PortfolioGenerator.generate_many
+        names: Portfolio owner name for each record index
+        fileobj: Writable binary file the archive is written to
+    """
+    errors = []
+    with zipfile.ZipFile(fileobj, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for result in results:
+            index = result["index"]
+            if not result["success"]:
+                errors.append({"index": index, "error": result["error"]})
+                continue
+            folder = f"{index:05d}-{slugify(names.get(index, ''))}"
+            archive.writestr(f"{folder}/index.html", result["files"]["html"])
+        archive.writestr("errors.json", json.dumps(errors, indent=2))
+
+def iter_file(fileobj: IO[bytes]) -> Iterator[bytes]:
+    """Stream a file from the start in fixed-size chunks, then close it"""
+    try:
+        fileobj.seek(0)
+        while True:
+            chunk = fileobj.read(STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        fileobj.close()
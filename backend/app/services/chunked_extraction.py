@@ -0,0 +1,156 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import re
+
+# Rough size of a token in characters for English resume text
+CHARS_PER_TOKEN = 4
+
+SECTION_HEADING = re.compile(
+    r"^\s*(experience|work experience|professional experience|employment( history)?|"
+    r"education|skills|technical skills|projects|publications|research|teaching|"
+    r"certifications?|awards|honou?rs|grants|presentations|talks|service|"
+    r"summary|profile|objective|references)\s*:?\s*$",
+    re.I | re.M
+)
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate used to decide between single and chunked extraction"""
+    return len(text) // CHARS_PER_TOKEN
+
+def _split_oversized(block: str, max_chars: int) -> List[str]:
+    """Split a block larger than max_chars on paragraph, then line boundaries"""
+    pieces: List[str] = []
+    current: List[str] = []
+    size = 0
+    separator = "\n\n" if "\n\n" in block else "\n"
+    for part in block.split(separator):
+        while len(part) > max_chars:
+            if current:
+                pieces.append(separator.join(current))
+                current, size = [], 0
+            pieces.append(part[:max_chars])
+            part = part[max_chars:]
+        if current and size + len(part) > max_chars:
+            pieces.append(separator.join(current))
+            current, size = [], 0
+        current.append(part)
+        size += len(part) + len(separator)
+    if current:
+        pieces.append(separator.join(current))
+    return pieces
+
+def split_resume(text: str, target_tokens: int) -> List[str]:
+    """
+    Split resume text into chunks of about target_tokens each
+
+    Chunks break at section headings where possible, so each section is
+    extracted with its own context. Neighbouring small sections are packed
+    together; oversized sections are split on paragraph boundaries.
+
+    Args:
+        text: Full resume text
+        target_tokens: Desired chunk size in tokens
+
+    Returns:
+        Non-empty chunks in document order
+    """
+    max_chars = max(1, target_tokens * CHARS_PER_TOKEN)
+
+    starts = [match.start() for match in SECTION_HEADING.finditer(text)]
+    bounds = [0] + [start for start in starts if start > 0] + [len(text)]
+    sections = [text[a:b].strip() for a, b in zip(bounds, bounds[1:])]
+
+    chunks: List[str] = []
+    current = ""
+    for section in sections:
+        if not section:
+            continue
+        for piece in _split_oversized(section, max_chars) if len(section) > max_chars else [section]:
+            if current and len(current) + len(piece) + 2 > max_chars:
+                chunks.append(current)
+                current = ""
+            current = f"{current}\n\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+
+    # Fold slivers left over from splitting a large section into the previous
+    # chunk rather than paying for a completion on a few lines
+    packed: List[str] = []
+    for chunk in chunks:
+        if packed and len(chunk) < max_chars // 4:
+            packed[-1] = f"{packed[-1]}\n\n{chunk}"
+        else:
+            packed.append(chunk)
+    return packed
+
+def _norm(value: Any) -> str:
+    return re.sub(r"[^a-z0-9]+", "", str(value or "").lower())
+
+def _merge_unique(lists: List[List[Any]], key: Callable[[Any], str] = _norm) -> List[Any]:
+    seen = set()
+    merged = []
+    for items in lists:
+        for item in items or []:
+            k = key(item)
+            if k and k not in seen:
+                seen.add(k)
+                merged.append(item)
+    return merged
+
+def _merge_records(
+    partials: List[Dict[str, Any]],
+    field: str,
+    key_fields: Tuple[str, ...],
+    list_fields: Tuple[str, ...] = ()
+) -> List[Dict[str, Any]]:
+    """
+    Concatenate record lists in chunk order, folding duplicates into the
+    first occurrence: missing scalar fields are filled and list fields are
+    unioned.
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    for partial in partials:
+        for record in partial.get(field) or []:
+            if not isinstance(record, dict):
+                continue
+            key = "|".join(_norm(record.get(name)) for name in key_fields)
+            existing = merged.get(key)
+            if existing is None:
+                merged[key] = dict(record)
+                continue
+            for name, value in record.items():
+                if name in list_fields:
+                    existing[name] = _merge_unique([existing.get(name) or [], value or []])
+                elif not existing.get(name) and value:
+                    existing[name] = value
+    return list(merged.values())
+
+def merge_partials(partials: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Deterministically merge per-chunk extraction results
+
+    Args:
+        partials: Decoded model output for each chunk, in document order
+
+    Returns:
+        One portfolio dict suitable for PortfolioData(**result)
+    """
+    personal_info: Dict[str, Any] = {}
+    summary: Optional[str] = None
+    for partial in partials:
+        for name, value in (partial.get("personal_info") or {}).items():
+            if value and not personal_info.get(name):
+                personal_info[name] = value
+        if not summary and partial.get("summary"):
+            summary = partial["summary"]
+
+    return {
+        "personal_info": personal_info,
+        "summary": summary,
+        "experience": _merge_records(
+            partials, "experience", ("company", "position", "start_date"), ("responsibilities",)
+        ),
+        "education": _merge_records(partials, "education", ("institution", "degree")),
+        "skills": _merge_unique([partial.get("skills") for partial in partials]),
+        "projects": _merge_records(partials, "projects", ("name",), ("technologies",)),
+        "certifications": _merge_unique([partial.get("certifications") for partial in partials]),
+    }
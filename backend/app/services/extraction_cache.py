@@ -0,0 +1,140 @@
+from app.models import PortfolioData
+from app.services.shared_state import connect_sqlite
+from collections import OrderedDict
+from typing import Optional
+import hashlib
+import sqlite3
+import threading
+import time
+
+class ExtractionCache:
+    """
+    Content-addressed cache for resume extraction results
+
+    Entries are keyed by a hash of the uploaded file bytes plus the model
+    name and prompt version, so a changed prompt or model never serves
+    stale data. A memory LRU tier sits in front of an optional SQLite tier.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl_seconds: int = 86400,
+        db_path: Optional[str] = None,
+        max_disk_entries: int = 10000
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_disk_entries = max_disk_entries
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+        if db_path:
+            self._db = connect_sqlite(db_path)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS extraction_cache ("
+                "key TEXT PRIMARY KEY, data TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_extraction_cache_created "
+                "ON extraction_cache (created_at)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def make_key(file_bytes: bytes, model: str, prompt_version: str) -> str:
+        """
+        Build the cache key for an upload
+
+        Args:
+            file_bytes: Raw uploaded file content
+            model: Model, or description of the model setup, used for extraction
+            prompt_version: Version of the extraction prompt
+
+        Returns:
+            Hex digest identifying the extraction
+        """
+        return ExtractionCache.key_from_digest(hashlib.sha256(file_bytes), model, prompt_version)
+
+    @staticmethod
+    def key_from_digest(content_digest: "hashlib._Hash", model: str, prompt_version: str) -> str:
+        """
+        Same as make_key, from a sha256 of the file computed while it streamed in
+
+        Args:
+            content_digest: sha256 object fed with the file content (not modified)
+            model: Model, or description of the model setup, used for extraction
+            prompt_version: Version of the extraction prompt
+
+        Returns:
+            Hex digest identifying the extraction
+        """
+        digest = content_digest.copy()
+        digest.update(b"\0" + model.encode() + b"\0" + prompt_version.encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[PortfolioData]:
+        """Return the cached PortfolioData for key, or None"""
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                data_json, created_at = entry
+                if now - created_at < self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    return PortfolioData.model_validate_json(data_json)
+                del self._memory[key]
+
+            if self._db is None:
+                return None
+
+            row = self._db.execute(
+                "SELECT data, created_at FROM extraction_cache WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            data_json, created_at = row
+            if now - created_at >= self.ttl_seconds:
+                self._db.execute("DELETE FROM extraction_cache WHERE key = ?", (key,))
+                self._db.commit()
+                return None
+
+            self._remember(key, data_json, created_at)
+            return PortfolioData.model_validate_json(data_json)
+
+    def set(self, key: str, data: PortfolioData) -> None:
+        """Store extraction result under key in every tier"""
+        data_json = data.model_dump_json()
+        created_at = time.time()
+
+        with self._lock:
+            self._remember(key, data_json, created_at)
+
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO extraction_cache (key, data, created_at) VALUES (?, ?, ?)",
+                    (key, data_json, created_at)
+                )
+                self._evict_disk(created_at)
+                self._db.commit()
+
+    def _remember(self, key: str, data_json: str, created_at: float) -> None:
+        self._memory[key] = (data_json, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self, now: float) -> None:
+        self._db.execute(
+            "DELETE FROM extraction_cache WHERE created_at < ?",
+            (now - self.ttl_seconds,)
+        )
+        self._db.execute(
+            "DELETE FROM extraction_cache WHERE key IN ("
+            "SELECT key FROM extraction_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_disk_entries,)
+        )
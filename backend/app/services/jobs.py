@@ -0,0 +1,386 @@
+from app.config import settings
+from app.models import Job
+from app.services.shared_state import connect_sqlite
+from collections import OrderedDict
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+import asyncio
+import ipaddress
+import logging
+import socket
+import threading
+import time
+import uuid
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+class QueueFullError(Exception):
+    """Raised when the job queue has no room for another job"""
+
+class WebhookURLError(Exception):
+    """Raised when a webhook URL may not be called from the server"""
+
+async def check_webhook_url(url: str, allowed_hosts: Iterable[str] = ()) -> Optional[str]:
+    """
+    Make sure a client-supplied webhook URL is safe to POST to
+
+    The URL must be http(s). Hosts on allowed_hosts are accepted as they
+    are; any other host must resolve only to public addresses, so a
+    webhook cannot reach loopback, private, link-local (cloud metadata) or
+    other internal addresses.
+
+    Args:
+        url: Webhook URL from the request
+        allowed_hosts: Hostnames accepted without the address check
+
+    Returns:
+        The checked address to connect to, or None for an allowed host.
+        Connecting anywhere else (say, by resolving the name again) would
+        let a host that changes its DNS answer slip through.
+
+    Raises:
+        WebhookURLError: The URL is malformed or points at a non-public host
+    """
+    try:
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+    except ValueError:
+        raise WebhookURLError("Invalid webhook URL")
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise WebhookURLError("Webhook URL must be an http or https URL")
+    if parts.username or parts.password:
+        raise WebhookURLError("Webhook URL must not carry credentials")
+
+    host = parts.hostname.lower().rstrip(".")
+    if host in {allowed.lower() for allowed in allowed_hosts}:
+        return None
+
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except (socket.gaierror, UnicodeError):
+        raise WebhookURLError(f"Webhook host {host} does not resolve")
+    addresses = [info[4][0].split("%", 1)[0] for info in infos]
+    for address in addresses:
+        if not ipaddress.ip_address(address).is_global:
+            raise WebhookURLError(f"Webhook host {host} is not a public address")
+    return addresses[0]
+
+class JobStore:
+    """
+    Interface for job state storage
+    """
+
+    def create(self, job: Job) -> None:
+        raise NotImplementedError
+
+    def get(self, job_id: str) -> Optional[Job]:
+        raise NotImplementedError
+
+    def update(self, job: Job) -> None:
+        raise NotImplementedError
+
+    def heartbeat(self) -> None:
+        """Renew this process's claim on its jobs, for stores shared between processes"""
+
+class InMemoryJobStore(JobStore):
+    """
+    Keeps jobs in process memory, dropping the oldest beyond max_jobs
+    """
+
+    def __init__(self, max_jobs: int = 10000):
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, job: Job) -> None:
+        with self._lock:
+            self._jobs[job.id] = job.model_copy()
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.model_copy() if job else None
+
+    def update(self, job: Job) -> None:
+        with self._lock:
+            if job.id in self._jobs:
+                self._jobs[job.id] = job.model_copy()
+
+class SQLiteJobStore(JobStore):
+    """
+    Keeps jobs in a SQLite database so status survives restarts
+
+    Several worker processes may share the database. Each store registers
+    under a random token, renewed by heartbeat(), and every job records the
+    token of the store running it. Jobs left queued or running by a store
+    whose lease has lapsed cannot be resumed (their uploads lived in that
+    process), so they are marked failed, both when a store is opened and on
+    every heartbeat. Beyond max_jobs, the oldest finished jobs are deleted.
+    """
+
+    def __init__(self, db_path: str, max_jobs: int = 10000, lease_seconds: float = 60.0):
+        self.max_jobs = max_jobs
+        self.lease_seconds = lease_seconds
+        # A pid would not do: pids are reused, and in containers every
+        # worker may well be pid 1
+        self.worker = uuid.uuid4().hex
+        self._db = connect_sqlite(db_path)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, status TEXT NOT NULL, data TEXT NOT NULL, updated_at REAL NOT NULL, "
+                "owner TEXT)"
+            )
+            columns = [row[1] for row in self._db.execute("PRAGMA table_info(jobs)")]
+            if "owner" not in columns:
+                self._db.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+            self._db.execute("CREATE INDEX IF NOT EXISTS jobs_updated_at ON jobs (updated_at)")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS job_workers (id TEXT PRIMARY KEY, seen_at REAL NOT NULL)"
+            )
+            self._db.commit()
+        self.heartbeat()
+
+    def heartbeat(self) -> None:
+        with self._lock:
+            now = time.time()
+            self._db.execute(
+                "INSERT OR REPLACE INTO job_workers (id, seen_at) VALUES (?, ?)",
+                (self.worker, now)
+            )
+            self._db.execute("DELETE FROM job_workers WHERE seen_at < ?", (now - self.lease_seconds,))
+            rows = self._db.execute(
+                "SELECT data FROM jobs WHERE status IN ('queued', 'running') "
+                "AND (owner IS NULL OR owner NOT IN (SELECT id FROM job_workers))"
+            ).fetchall()
+            for (data,) in rows:
+                job = Job.model_validate_json(data)
+                job.status = "failed"
+                job.error = "Interrupted: the worker running it went away"
+                job.updated_at = now
+                self._db.execute(
+                    "UPDATE jobs SET status = ?, data = ?, updated_at = ? WHERE id = ?",
+                    (job.status, job.model_dump_json(), job.updated_at, job.id)
+                )
+            self._db.commit()
+
+    def _write(self, job: Job) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO jobs (id, status, data, updated_at, owner) VALUES (?, ?, ?, ?, ?)",
+            (job.id, job.status, job.model_dump_json(), job.updated_at, self.worker)
+        )
+
+    def create(self, job: Job) -> None:
+        with self._lock:
+            self._write(job)
+            self._prune()
+            self._db.commit()
+
+    def _prune(self) -> None:
+        """Delete the oldest finished jobs beyond max_jobs; queued and running jobs are kept"""
+        count = self._db.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+        if count <= self.max_jobs:
+            return
+        self._db.execute(
+            "DELETE FROM jobs WHERE id IN ("
+            "SELECT id FROM jobs WHERE status IN ('succeeded', 'failed') ORDER BY updated_at LIMIT ?)",
+            (count - self.max_jobs,)
+        )
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._db.execute("SELECT data FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return Job.model_validate_json(row[0]) if row else None
+
+    def update(self, job: Job) -> None:
+        with self._lock:
+            self._write(job)
+            self._db.commit()
+
+class JobQueue:
+    """
+    Bounded in-process queue of extraction jobs served by worker tasks
+
+    Args:
+        store: Where job state is kept
+        handlers: Coroutine per job kind; called with the job's payload and
+            returning the PortfolioData result, or a (result, portfolio_id)
+            pair when the result was stored
+        workers: Number of worker tasks
+        max_queued: Jobs that may wait before submit() raises QueueFullError
+        webhook_timeout: Seconds allowed for a completion webhook
+        webhook_allowed_hosts: Webhook hosts exempt from the public-address
+            check (see check_webhook_url)
+        heartbeat_seconds: How often the store's claim on this process's
+            jobs is renewed (see JobStore.heartbeat)
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        handlers: Dict[str, Callable[..., Awaitable[Any]]],
+        workers: int = 4,
+        max_queued: int = 100,
+        webhook_timeout: float = 10.0,
+        webhook_allowed_hosts: Iterable[str] = (),
+        heartbeat_seconds: float = 15.0
+    ):
+        self.store = store
+        self.handlers = handlers
+        self.workers = workers
+        self.max_queued = max_queued
+        self.webhook_timeout = webhook_timeout
+        self.webhook_allowed_hosts = tuple(webhook_allowed_hosts)
+        self.heartbeat_seconds = heartbeat_seconds
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._http: Optional["httpx.AsyncClient"] = None
+
+    async def start(self) -> None:
+        """Start the worker tasks on the running event loop"""
+        self._queue = asyncio.Queue(maxsize=self.max_queued)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._heartbeat()))
+
+    async def stop(self) -> None:
+        """Cancel the workers, fail the jobs still queued and close the webhook client"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        # Queued jobs will never run; their spooled uploads are deleted here
+        while self._queue is not None and not self._queue.empty():
+            job, payload = self._queue.get_nowait()
+            for value in payload.values():
+                if hasattr(value, "close"):
+                    value.close()
+            job.status = "failed"
+            job.error = "Cancelled"
+            job.updated_at = time.time()
+            self.store.update(job)
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    def submit(self, kind: str, payload: Dict[str, Any], webhook_url: Optional[str] = None) -> Job:
+        """
+        Queue a job
+
+        Args:
+            kind: Job kind, one of the handler names
+            payload: Keyword arguments for the handler
+            webhook_url: URL to POST the finished job to, already accepted
+                by check_webhook_url
+
+        Returns:
+            The queued Job
+        """
+        if self._queue is None:
+            raise RuntimeError("Job queue is not running")
+        if self._queue.full():
+            raise QueueFullError("Job queue is full")
+
+        now = time.time()
+        job = Job(id=uuid.uuid4().hex, kind=kind, created_at=now, updated_at=now, webhook_url=webhook_url)
+        self.store.create(job)
+        self._queue.put_nowait((job, payload))
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.store.get(job_id)
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                self.store.heartbeat()
+            except Exception as e:
+                logger.warning("Job store heartbeat failed: %s", e)
+
+    async def _worker(self) -> None:
+        while True:
+            job, payload = await self._queue.get()
+            try:
+                await self._run(job, payload)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job, payload: Dict[str, Any]) -> None:
+        job.status = "running"
+        job.updated_at = time.time()
+        self.store.update(job)
+
+        try:
+            result = await self.handlers[job.kind](**payload)
+            if isinstance(result, tuple):
+                job.result, job.portfolio_id = result
+            else:
+                job.result = result
+            job.status = "succeeded"
+        except asyncio.CancelledError:
+            job.status = "failed"
+            job.error = "Cancelled"
+            self.store.update(job)
+            raise
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+
+        job.updated_at = time.time()
+        self.store.update(job)
+
+        if job.webhook_url:
+            await self._notify(job)
+
+    async def _notify(self, job: Job) -> None:
+        # Imported on the first webhook; most deployments never send one
+        import httpx
+        if self._http is None:
+            # Redirects are not followed, so a public URL cannot bounce the
+            # POST to an internal one, and connections are not kept alive,
+            # since they are made to an address rather than a host name
+            self._http = httpx.AsyncClient(
+                timeout=self.webhook_timeout,
+                follow_redirects=False,
+                limits=httpx.Limits(max_keepalive_connections=0)
+            )
+        try:
+            # Resolved and checked again at send time, then the POST goes to
+            # exactly the address that passed; the Host header and TLS SNI
+            # (and so certificate verification) still use the URL's host
+            address = await check_webhook_url(job.webhook_url, self.webhook_allowed_hosts)
+            url = httpx.URL(job.webhook_url)
+            headers = {"Content-Type": "application/json"}
+            extensions = {}
+            if address is not None:
+                headers["Host"] = url.netloc.decode("ascii")
+                extensions["sni_hostname"] = url.host
+                url = url.copy_with(host=address)
+            response = await self._http.post(
+                url,
+                content=job.model_dump_json(),
+                headers=headers,
+                extensions=extensions
+            )
+            response.raise_for_status()
+        except Exception as e:
+            logger.warning("Webhook for job %s failed: %s", job.id, e)
+
+@lru_cache()
+def get_job_store() -> JobStore:
+    """Process-wide job store built from Settings"""
+    if settings.JOB_STORE == "sqlite":
+        return SQLiteJobStore(
+            settings.JOB_STORE_PATH,
+            max_jobs=settings.JOB_MAX_STORED,
+            lease_seconds=settings.JOB_LEASE_SECONDS
+        )
+    return InMemoryJobStore(max_jobs=settings.JOB_MAX_STORED)
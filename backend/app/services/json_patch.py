@@ -0,0 +1,97 @@
+from typing import Any, Dict, Iterable, List, Optional
+import copy
+
+class PatchError(Exception):
+    """Raised when a patch is malformed or does not apply to the document"""
+
+def parse_pointer(path: str) -> List[str]:
+    """
+    Split a JSON Pointer (RFC 6901) into its reference tokens
+
+    Args:
+        path: Pointer such as "/experience/0/description"
+
+    Returns:
+        Unescaped tokens, e.g. ["experience", "0", "description"]
+    """
+    if not isinstance(path, str) or not path.startswith("/"):
+        raise PatchError(f"Invalid path: {path!r}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in path[1:].split("/")]
+
+def _resolve_parent(document: Any, tokens: List[str]) -> Any:
+    target = document
+    for token in tokens[:-1]:
+        if isinstance(target, dict) and token in target:
+            target = target[token]
+        elif isinstance(target, list) and token.isdigit() and int(token) < len(target):
+            target = target[int(token)]
+        else:
+            raise PatchError(f"Path does not exist: /{'/'.join(tokens)}")
+    return target
+
+def _list_index(container: list, token: str, allow_end: bool) -> int:
+    if token == "-" and allow_end:
+        return len(container)
+    if not token.isdigit():
+        raise PatchError(f"Invalid list index: {token!r}")
+    index = int(token)
+    limit = len(container) if allow_end else len(container) - 1
+    if index > limit:
+        raise PatchError(f"List index out of range: {index}")
+    return index
+
+def apply_patch(
+    document: Dict[str, Any],
+    operations: Iterable[Dict[str, Any]],
+    allowed_roots: Optional[Iterable[str]] = None
+) -> Dict[str, Any]:
+    """
+    Apply add / remove / replace operations (an RFC 6902 subset) to a copy
+    of document
+
+    Args:
+        document: JSON-compatible dict to patch
+        operations: Patch operations, each with "op", "path" and "value"
+        allowed_roots: If given, only paths under these top-level keys may
+            be touched
+
+    Returns:
+        Patched copy of document
+    """
+    result = copy.deepcopy(document)
+    allowed = set(allowed_roots) if allowed_roots is not None else None
+
+    for operation in operations:
+        if not isinstance(operation, dict):
+            raise PatchError(f"Invalid operation: {operation!r}")
+
+        op = operation.get("op")
+        tokens = parse_pointer(operation.get("path"))
+        if allowed is not None and tokens[0] not in allowed:
+            raise PatchError(f"Path outside the refined sections: {operation.get('path')}")
+        if op in ("add", "replace") and "value" not in operation:
+            raise PatchError(f"Missing value for {op} at {operation.get('path')}")
+
+        parent = _resolve_parent(result, tokens)
+        key = tokens[-1]
+
+        if isinstance(parent, dict):
+            if op == "add" or (op == "replace" and key in parent):
+                parent[key] = operation["value"]
+            elif op == "remove" and key in parent:
+                del parent[key]
+            else:
+                raise PatchError(f"Cannot {op} {operation.get('path')}")
+        elif isinstance(parent, list):
+            if op == "add":
+                parent.insert(_list_index(parent, key, allow_end=True), operation["value"])
+            elif op == "replace":
+                parent[_list_index(parent, key, allow_end=False)] = operation["value"]
+            elif op == "remove":
+                del parent[_list_index(parent, key, allow_end=False)]
+            else:
+                raise PatchError(f"Unsupported operation: {op!r}")
+        else:
+            raise PatchError(f"Path does not exist: {operation.get('path')}")
+
+    return result
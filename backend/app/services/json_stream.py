@@ -0,0 +1,112 @@
+from typing import Any, List, Optional, Tuple
+import json
+
+class IncrementalJSONParser:
+    """
+    Incremental parser for a streamed top-level JSON object
+
+    Text is fed in arbitrary pieces as it arrives from the model. Each time
+    a section is complete it is decoded and returned as a (path, value)
+    pair: top-level members as "personal_info", "skills", ... and the
+    object elements of top-level arrays as "experience[0]",
+    "experience[1]", ... as soon as each element closes. Arrays of scalars
+    are returned whole once the array closes.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.position = 0
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.done = False
+
+        self.expect = "key"
+        self.key: Optional[str] = None
+        self.key_start = 0
+        self.value_start: Optional[int] = None
+
+        self.in_array = False
+        self.element_start = 0
+        self.element_index = 0
+        self.elements_emitted = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Consume the next piece of the stream
+
+        Args:
+            chunk: Next piece of JSON text
+
+        Returns:
+            Sections completed by this chunk, in stream order
+        """
+        self.text += chunk
+        events: List[Tuple[str, Any]] = []
+
+        text = self.text
+        for i in range(self.position, len(text)):
+            c = text[i]
+
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif c == "\\":
+                    self.escape = True
+                elif c == '"':
+                    self.in_string = False
+                    if self.depth == 1 and self.expect == "key":
+                        self.key = json.loads(text[self.key_start:i + 1])
+                        self.expect = "colon"
+                continue
+
+            if c == '"':
+                self.in_string = True
+                if self.depth == 1 and self.expect == "key":
+                    self.key_start = i
+            elif c in "{[":
+                if self.depth == 1 and c == "[":
+                    self.in_array = True
+                    self.element_start = i + 1
+                    self.element_index = 0
+                    self.elements_emitted = False
+                self.depth += 1
+            elif c in "}]":
+                if self.depth == 2 and self.in_array:
+                    self._finish_element(text[self.element_start:i], events)
+                elif self.depth == 1:
+                    self._finish_member(text[self.value_start:i] if self.value_start else "", events)
+                    self.done = True
+                self.depth -= 1
+            elif c == ",":
+                if self.depth == 1:
+                    self._finish_member(text[self.value_start:i], events)
+                elif self.depth == 2 and self.in_array:
+                    self._finish_element(text[self.element_start:i], events)
+                    self.element_start = i + 1
+            elif c == ":" and self.depth == 1 and self.expect == "colon":
+                self.value_start = i + 1
+                self.expect = "value"
+
+        self.position = len(text)
+        return events
+
+    def _finish_element(self, raw: str, events: List[Tuple[str, Any]]) -> None:
+        raw = raw.strip()
+        if not raw:
+            return
+        value = json.loads(raw)
+        if isinstance(value, (dict, list)):
+            events.append((f"{self.key}[{self.element_index}]", value))
+            self.elements_emitted = True
+        self.element_index += 1
+
+    def _finish_member(self, raw: str, events: List[Tuple[str, Any]]) -> None:
+        raw = raw.strip()
+        if self.key is not None and raw and not (self.in_array and self.elements_emitted):
+            events.append((self.key, json.loads(raw)))
+
+        self.expect = "key"
+        self.key = None
+        self.value_start = None
+        self.in_array = False
@@ -0,0 +1,222 @@
+from app.services.usage_stats import get_usage_stats
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+import bisect
+import json
+import threading
+import time
+
+SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# (stage, seconds) pairs recorded while serving the current request
+_request_timings: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("request_timings", default=None)
+
+class MetricsRegistry:
+    """
+    Minimal thread-safe counter/histogram registry with Prometheus text output
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._meta: Dict[str, Tuple[str, str, Tuple[float, ...]]] = {}
+        self._counters: Dict[Tuple[str, Tuple], float] = {}
+        self._histograms: Dict[Tuple[str, Tuple], List] = {}
+        self._sync = None
+
+    def attach(self, sync) -> None:
+        """
+        Aggregate across worker processes through a shared store
+
+        Args:
+            sync: CounterSync for this registry; render() then reports the
+                totals of every worker
+        """
+        self._sync = sync
+
+    def flush(self) -> None:
+        """Push this process's changes to the shared store, if attached"""
+        if self._sync is not None:
+            self._sync.push(self._flatten(*self._local()))
+
+    def describe(self, name: str, kind: str, help_text: str, buckets: Tuple[float, ...] = ()) -> None:
+        """Register a metric's type ("counter" or "histogram"), help text and buckets"""
+        self._meta[name] = (kind, help_text, buckets)
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        buckets = self._meta[name][2]
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [[0] * len(buckets), 0.0, 0]
+            index = bisect.bisect_left(buckets, value)
+            if index < len(buckets):
+                histogram[0][index] += 1
+            histogram[1] += value
+            histogram[2] += 1
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format
+
+        Returns:
+            Exposition text, including LLM usage totals from UsageStats
+        """
+        lines: List[str] = []
+        counters, histograms = self._local()
+        if self._sync is not None:
+            self._sync.push(self._flatten(counters, histograms))
+            counters, histograms = self._unflatten(self._sync.pull())
+
+        for name, (kind, help_text, buckets) in sorted(self._meta.items()):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == "counter":
+                for (metric, labels), value in sorted(counters.items()):
+                    if metric == name:
+                        lines.append(f"{name}{_labels(labels)} {value:g}")
+            else:
+                for (metric, labels), (counts, total, count) in sorted(histograms.items()):
+                    if metric != name:
+                        continue
+                    cumulative = 0
+                    for bound, bucket_count in zip(buckets, counts):
+                        cumulative += bucket_count
+                        lines.append(f"{name}_bucket{_labels(labels + (('le', f'{bound:g}'),))} {cumulative}")
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {count}")
+                    lines.append(f"{name}_sum{_labels(labels)} {total:g}")
+                    lines.append(f"{name}_count{_labels(labels)} {count}")
+
+        usage = get_usage_stats().snapshot()
+        for field, help_text in (
+            ("calls", "LLM calls"),
+            ("prompt_tokens", "Prompt tokens sent to the LLM"),
+            ("completion_tokens", "Completion tokens received from the LLM"),
+            ("seconds", "Seconds spent waiting on the LLM"),
+        ):
+            name = f"portfogen_llm_{field}_total"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for operation, totals in sorted(usage.items()):
+                lines.append(f"{name}{_labels((('operation', operation),))} {totals[field]:g}")
+
+        return "\n".join(lines) + "\n"
+
+    def _local(self) -> Tuple[Dict, Dict]:
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: (list(h[0]), h[1], h[2]) for key, h in self._histograms.items()}
+        return counters, histograms
+
+    @staticmethod
+    def _flatten(counters: Dict, histograms: Dict) -> Dict[str, float]:
+        """One number per shared counter key: [metric, labels, field]"""
+        flat = {}
+        for (name, labels), value in counters.items():
+            flat[json.dumps([name, labels, "value"])] = value
+        for (name, labels), (counts, total, count) in histograms.items():
+            for index, bucket_count in enumerate(counts):
+                flat[json.dumps([name, labels, index])] = bucket_count
+            flat[json.dumps([name, labels, "sum"])] = total
+            flat[json.dumps([name, labels, "count"])] = count
+        return flat
+
+    def _unflatten(self, flat: Dict[str, float]) -> Tuple[Dict, Dict]:
+        counters: Dict[Tuple[str, Tuple], float] = {}
+        histograms: Dict[Tuple[str, Tuple], tuple] = {}
+        for key, value in flat.items():
+            name, labels, field = json.loads(key)
+            if name not in self._meta:
+                continue
+            labels = tuple(tuple(pair) for pair in labels)
+            if field == "value":
+                counters[(name, labels)] = value
+                continue
+            counts, total, count = histograms.get((name, labels)) or ([0] * len(self._meta[name][2]), 0.0, 0)
+            if field == "sum":
+                total = value
+            elif field == "count":
+                count = int(value)
+            elif field < len(counts):
+                counts[field] = int(value)
+            histograms[(name, labels)] = (counts, total, count)
+        return counters, histograms
+
+def _labels(labels: Tuple) -> str:
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in labels:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+metrics = MetricsRegistry()
+metrics.describe("portfogen_stage_seconds", "histogram", "Time spent per pipeline stage", SECONDS_BUCKETS)
+metrics.describe("portfogen_payload_bytes", "histogram", "Size of payloads moving through the pipeline", BYTES_BUCKETS)
+metrics.describe("portfogen_extraction_cache_total", "counter", "Extraction cache lookups by result")
+metrics.describe("portfogen_rule_extraction_total", "counter", "Resume extractions by path (rules, rules_plus_llm, llm)")
+metrics.describe("portfogen_llm_resilience_total", "counter", "LLM retries, timeouts, hedged requests and circuit breaker events")
+metrics.describe("portfogen_llm_routed_total", "counter", "LLM calls by routed model, routing reason and outcome")
+metrics.describe("portfogen_llm_coalesced_total", "counter", "LLM calls served by joining an identical in-flight call")
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """
+    Time a block as a pipeline stage
+
+    The duration goes into the portfogen_stage_seconds histogram and, when
+    inside a request, into that request's Server-Timing header.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        metrics.observe("portfogen_stage_seconds", elapsed, stage=stage)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.append((stage, elapsed))
+
+def observe_size(kind: str, size: int) -> None:
+    """Record the size of a payload (upload, resume_text, llm_response, html)"""
+    metrics.observe("portfogen_payload_bytes", size, kind=kind)
+
+class ServerTimingMiddleware:
+    """
+    ASGI middleware that collects timed() stages for each request and
+    reports them in a Server-Timing response header
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings: List[Tuple[str, float]] = []
+        token = _request_timings.set(timings)
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                entries = [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in timings]
+                entries.append(f"total;dur={(time.perf_counter() - start) * 1000:.1f}")
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", ", ".join(entries).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_timings.reset(token)
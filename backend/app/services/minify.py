@@ -0,0 +1,54 @@
+import re
+
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_CSS_SPACE = re.compile(r"\s+")
+_CSS_PUNCTUATION = re.compile(r"\s*([{};,>~])\s*")
+# Space before a colon can be a descendant combinator ("nav a :hover"), so
+# only the space after one is dropped ("color: red")
+_CSS_COLON = re.compile(r":\s+")
+_CSS_STRING = re.compile(r"""("(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')""")
+
+def minify_css(css: str) -> str:
+    """
+    Strip comments and insignificant whitespace from a stylesheet
+
+    Quoted strings are left untouched. Spaces inside selectors and values
+    (e.g. "section h2", "0 auto") are collapsed to one, never removed.
+
+    Args:
+        css: Stylesheet source
+
+    Returns:
+        Minified stylesheet
+    """
+    css = _CSS_COMMENT.sub("", css)
+    pieces = _CSS_STRING.split(css)
+    for index in range(0, len(pieces), 2):
+        text = _CSS_SPACE.sub(" ", pieces[index])
+        text = _CSS_PUNCTUATION.sub(r"\1", text)
+        text = _CSS_COLON.sub(":", text)
+        pieces[index] = text.replace(";}", "}")
+    return "".join(pieces).strip()
+
+_JS_BLOCK_COMMENT = re.compile(r"^\s*/\*.*?\*/\s*$", re.S | re.M)
+_JS_LINE_COMMENT = re.compile(r"^\s*//.*$", re.M)
+
+def minify_js(js: str) -> str:
+    """
+    Conservatively shrink a script
+
+    Only whole-line comments, indentation and blank lines are removed. Line
+    breaks are kept so automatic semicolon insertion is unaffected. Code is
+    not tokenized, so multi-line template literals should not contain lines
+    that look like comments.
+
+    Args:
+        js: Script source
+
+    Returns:
+        Minified script
+    """
+    js = _JS_BLOCK_COMMENT.sub("", js)
+    js = _JS_LINE_COMMENT.sub("", js)
+    lines = (line.strip() for line in js.splitlines())
+    return "\n".join(line for line in lines if line)
@@ -0,0 +1,285 @@
+from app.config import settings
+from app.services.metrics import metrics
+from app.services.resilience import LatencyTracker
+from collections import deque
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional
+import threading
+import time
+
+LATENCY_BUDGET_HEADER = "x-latency-budget-ms"
+
+# Latency budget (ms) the caller of the current request asked for, if any
+_latency_budget_ms: ContextVar[Optional[float]] = ContextVar("latency_budget_ms", default=None)
+
+def current_latency_budget() -> Optional[float]:
+    """Latency budget in milliseconds for the current request, or None"""
+    return _latency_budget_ms.get()
+
+class RoutingDecision:
+    """
+    Which model one LLM call goes to, and why
+
+    Attributes:
+        operation: Calling operation (e.g. "extract_prompt")
+        input_tokens: Estimated prompt tokens
+        budget_ms: Caller's latency budget, if any
+        model: Model chosen for the first try
+        reason: Rule that picked it ("default", "fast_operation",
+            "large_input" or "budget")
+        fallback: Model to retry on timeout, or None
+        deadline: Seconds the first model may take, or None for the
+            resilience policy's deadline
+        total_seconds: Seconds the call may take with the fallback
+            included: the caller's budget, else the router's deadline
+    """
+
+    def __init__(
+        self,
+        operation: str,
+        input_tokens: int,
+        budget_ms: Optional[float],
+        model: str,
+        reason: str,
+        fallback: Optional[str],
+        deadline: Optional[float],
+        total_seconds: Optional[float] = None
+    ):
+        self.operation = operation
+        self.input_tokens = input_tokens
+        self.budget_ms = budget_ms
+        self.model = model
+        self.reason = reason
+        self.fallback = fallback
+        self.deadline = deadline
+        self.total_seconds = total_seconds
+
+    def fallback_deadline(self, elapsed: float) -> Optional[float]:
+        """Seconds left for the fallback model after the first one used elapsed"""
+        if self.total_seconds is None:
+            return None
+        return max(self.total_seconds - elapsed, self.total_seconds * 0.25)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.__dict__)
+
+class ModelRouter:
+    """
+    Picks the model for each LLM call
+
+    Rules, in order:
+      1. inputs of at least large_min_tokens go to large_model
+      2. operations in fast_operations with at most fast_max_tokens of
+         input go to fast_model
+      3. if the caller set a latency budget and the chosen model's recent
+         p90 latency is over its share of it, fast_model is used instead
+      4. everything else goes to default_model
+
+    A model left unset falls back to default_model, so with only
+    OPENAI_MODEL configured every call goes to that model, as before.
+
+    Args:
+        default_model: Model for calls no rule applies to
+        fast_model: Lower-latency model for small inputs and tight budgets
+        large_model: Model for long inputs
+        fallback_model: Model retried once when the first one times out
+        fast_operations: Operations eligible for fast_model
+        fast_max_tokens: Largest input routed to fast_model by operation
+        large_min_tokens: Smallest input routed to large_model
+        fallback_share: Share of the latency budget (or of deadline) the
+            first model may use before the fallback gets the rest
+        deadline: Seconds a call may take in total, fallback included,
+            when the caller set no budget; None leaves each model the
+            resilience policy's full deadline
+        min_samples: Latencies needed per model before budgets apply
+    """
+
+    def __init__(
+        self,
+        default_model: str,
+        fast_model: Optional[str] = None,
+        large_model: Optional[str] = None,
+        fallback_model: Optional[str] = None,
+        fast_operations: Iterable[str] = (),
+        fast_max_tokens: int = 2000,
+        large_min_tokens: int = 4000,
+        fallback_share: float = 0.6,
+        min_samples: int = 5,
+        history: int = 200,
+        deadline: Optional[float] = None
+    ):
+        self.default_model = default_model
+        self.fast_model = fast_model or default_model
+        self.large_model = large_model or default_model
+        self.fallback_model = fallback_model
+        self.fast_operations = frozenset(fast_operations)
+        self.fast_max_tokens = fast_max_tokens
+        self.large_min_tokens = large_min_tokens
+        self.fallback_share = fallback_share
+        self.min_samples = min_samples
+        self.deadline = deadline
+        self._latencies: Dict[str, LatencyTracker] = {}
+        self._recent = deque(maxlen=history)
+        self._lock = threading.Lock()
+
+    def choose(self, operation: str, input_tokens: int, budget_ms: Optional[float] = None) -> RoutingDecision:
+        """
+        Pick the model for one call
+
+        Args:
+            operation: Calling operation
+            input_tokens: Estimated prompt tokens
+            budget_ms: Caller's latency budget in milliseconds, if any
+
+        Returns:
+            RoutingDecision for the call
+        """
+        if input_tokens >= self.large_min_tokens:
+            model, reason = self.large_model, "large_input"
+        elif operation in self.fast_operations and input_tokens <= self.fast_max_tokens:
+            model, reason = self.fast_model, "fast_operation"
+        else:
+            model, reason = self.default_model, "default"
+
+        if budget_ms is not None and model != self.fast_model:
+            # The model has to fit in its share of the budget, not all of it
+            share = self.fallback_share if self._fallback_for(model) else 1.0
+            expected = self.expected_seconds(model)
+            if expected is not None and expected * 1000 > budget_ms * share:
+                model, reason = self.fast_model, "budget"
+
+        fallback = self._fallback_for(model)
+        # The first model and the fallback share one deadline, so a timeout
+        # followed by a fallback never takes twice as long as a single call
+        total_seconds = budget_ms / 1000 if budget_ms is not None else self.deadline
+        deadline = None
+        if total_seconds is not None:
+            deadline = total_seconds * (self.fallback_share if fallback else 1.0)
+
+        return RoutingDecision(operation, input_tokens, budget_ms, model, reason, fallback, deadline, total_seconds)
+
+    def _fallback_for(self, model: str) -> Optional[str]:
+        return self.fallback_model if self.fallback_model != model else None
+
+    def expected_seconds(self, model: str) -> Optional[float]:
+        """Recent p90 latency of a model, or None until enough calls were seen"""
+        with self._lock:
+            latencies = self._latencies.get(model)
+            if latencies is None or len(latencies) < self.min_samples:
+                return None
+            return latencies.percentile(90)
+
+    def record(
+        self,
+        decision: RoutingDecision,
+        model: str,
+        outcome: str,
+        seconds: float,
+        track_latency: bool = True
+    ) -> None:
+        """
+        Record how a routed call went
+
+        Args:
+            decision: The decision the call was made with
+            model: Model that produced the outcome (the fallback, if used)
+            outcome: "ok", "fallback_ok", "timeout" or "error"
+            seconds: Wall time of the call, fallback included
+            track_latency: Use seconds as a latency sample of model (off
+                for streams, where it only covers opening the stream)
+        """
+        metrics.inc(
+            "portfogen_llm_routed_total",
+            operation=decision.operation,
+            model=model,
+            reason=decision.reason,
+            outcome=outcome
+        )
+        with self._lock:
+            if track_latency and outcome == "ok":
+                self._latencies.setdefault(model, LatencyTracker()).record(seconds)
+            self._recent.append({
+                **decision.to_dict(),
+                "used_model": model,
+                "outcome": outcome,
+                "seconds": round(seconds, 4),
+                "at": time.time(),
+            })
+
+    def record_timeout(self, model: str, seconds: float) -> None:
+        """Count a timed-out call as taking at least its deadline, so budgets avoid the model"""
+        with self._lock:
+            self._latencies.setdefault(model, LatencyTracker()).record(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Routing configuration, per-model latencies and recent decisions
+
+        Returns:
+            Dictionary for the routing stats endpoint
+        """
+        with self._lock:
+            latencies = {
+                model: {"samples": len(tracker), "p50": tracker.percentile(50), "p90": tracker.percentile(90)}
+                for model, tracker in self._latencies.items()
+                if len(tracker)
+            }
+            recent = list(self._recent)
+        return {
+            "models": {
+                "default": self.default_model,
+                "fast": self.fast_model,
+                "large": self.large_model,
+                "fallback": self.fallback_model,
+            },
+            "latency_seconds": latencies,
+            "recent": recent,
+        }
+
+@lru_cache()
+def get_model_router() -> ModelRouter:
+    """Process-wide router, so latency history is shared by every service"""
+    return ModelRouter(
+        default_model=settings.OPENAI_MODEL,
+        fast_model=settings.OPENAI_FAST_MODEL,
+        large_model=settings.OPENAI_LARGE_MODEL,
+        fallback_model=settings.OPENAI_FALLBACK_MODEL,
+        fast_operations=settings.OPENAI_FAST_OPERATIONS,
+        fast_max_tokens=settings.OPENAI_FAST_MAX_TOKENS,
+        large_min_tokens=settings.OPENAI_LARGE_MIN_TOKENS,
+        fallback_share=settings.OPENAI_FALLBACK_BUDGET_SHARE,
+        deadline=settings.OPENAI_DEADLINE_SECONDS
+    )
+
+class LatencyBudgetMiddleware:
+    """
+    ASGI middleware that reads the X-Latency-Budget-Ms request header into
+    a context variable for the model router
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        budget = None
+        for name, value in scope.get("headers", []):
+            if name == LATENCY_BUDGET_HEADER.encode():
+                try:
+                    budget = float(value)
+                except ValueError:
+                    pass
+                break
+        if budget is None or budget <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        token = _latency_budget_ms.set(budget)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _latency_budget_ms.reset(token)
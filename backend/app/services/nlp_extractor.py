@@ -1,56 +1,253 @@
 from app.services.resume_parser import ResumeParser
-from app.services.openai_service import OpenAIService
+from app.services.openai_service import OpenAIService, EXTRACTION_PROMPT_VERSION
+from app.services.rule_extractor import RuleBasedExtractor, RULE_EXTRACTOR_VERSION
+from app.services.chunked_extraction import estimate_tokens
+from app.services.extraction_cache import ExtractionCache
+from app.services.parse_pool import get_parse_pool
+from app.services.uploads import SpooledUpload
+from app.services.metrics import metrics, timed, observe_size
+from app.config import settings
 from app.models import PortfolioData
+from functools import lru_cache
+from typing import Any, AsyncIterator, Optional, Tuple, Union
+import json
+
+# Resume file content, or an upload spooled while it was received
+Resume = Union[bytes, SpooledUpload]
+
+def extraction_config() -> str:
+    """
+    Everything besides the file and the prompt that decides an
+    extraction's result, for the extraction cache key
+
+    Covers every model routing may pick and the thresholds that choose
+    between them, chunking, and the rule extractor's version and
+    settings, so changing any of them stops old results being served.
+    Which configured model a latency budget picks at runtime is not part
+    of it.
+    """
+    return json.dumps({
+        "model": settings.OPENAI_MODEL,
+        "fast_model": settings.OPENAI_FAST_MODEL or settings.OPENAI_MODEL,
+        "large_model": settings.OPENAI_LARGE_MODEL or settings.OPENAI_MODEL,
+        "fallback_model": settings.OPENAI_FALLBACK_MODEL or settings.OPENAI_MODEL,
+        "fast_operations": sorted(settings.OPENAI_FAST_OPERATIONS),
+        "fast_max_tokens": settings.OPENAI_FAST_MAX_TOKENS,
+        "large_min_tokens": settings.OPENAI_LARGE_MIN_TOKENS,
+        "chunk_threshold_tokens": settings.CHUNKED_EXTRACTION_THRESHOLD_TOKENS,
+        "chunk_target_tokens": settings.CHUNK_TARGET_TOKENS,
+        "rules": settings.RULE_EXTRACTION_ENABLED and [
+            RULE_EXTRACTOR_VERSION,
+            settings.RULE_EXTRACTION_MIN_CONFIDENCE,
+            settings.RULE_EXTRACTION_PARTIAL_CONFIDENCE
+        ],
+    }, sort_keys=True, separators=(",", ":"))
 
 class NLPExtractor:
     """
     High-level service that coordinates resume parsing and NLP extraction
     """
-    
+
     def __init__(self):
         self.resume_parser = ResumeParser()
         self.openai_service = OpenAIService()
-    
-    async def extract_from_resume(self, file_bytes: bytes, file_type: str) -> PortfolioData:
+        self.rule_extractor = RuleBasedExtractor()
+        self.parse_pool = get_parse_pool()
+        self.extraction_cache = ExtractionCache(
+            max_entries=settings.EXTRACTION_CACHE_SIZE,
+            ttl_seconds=settings.EXTRACTION_CACHE_TTL_SECONDS,
+            db_path=settings.EXTRACTION_CACHE_DB_PATH or settings.SHARED_STATE_PATH,
+            max_disk_entries=settings.EXTRACTION_CACHE_MAX_DISK_ENTRIES
+        )
+        self.cache_config = extraction_config()
+
+    def _cache_lookup(self, cache_key: str) -> Optional[PortfolioData]:
+        with timed("cache"):
+            cached = self.extraction_cache.get(cache_key)
+        metrics.inc("portfogen_extraction_cache_total", result="hit" if cached else "miss")
+        return cached
+
+    def _cache_key(self, resume: Resume) -> str:
+        if isinstance(resume, SpooledUpload):
+            # Hashed as it streamed in; no second pass over the file
+            return ExtractionCache.key_from_digest(
+                resume.digest(),
+                self.cache_config,
+                EXTRACTION_PROMPT_VERSION
+            )
+        return ExtractionCache.make_key(resume, self.cache_config, EXTRACTION_PROMPT_VERSION)
+
+    async def _parse(self, resume: Resume, file_type: str) -> str:
+        if isinstance(resume, SpooledUpload):
+            size, source = resume.size, resume.parse_source()
+        else:
+            size, source = len(resume), resume
+        observe_size("upload", size)
+        with timed("parse"):
+            resume_text = await self.parse_pool.parse(source, file_type)
+        observe_size("resume_text", len(resume_text))
+        return resume_text
+
+    def _extract_with_rules(self, resume_text: str) -> Tuple[Optional[PortfolioData], Optional[dict], list]:
+        """
+        Try the rule-based extractor
+
+        Returns:
+            (PortfolioData, None, []) when the rules are confident enough on
+            their own, (None, partial data, missing fields) when the LLM
+            should fill in some fields, or (None, None, []) to use the LLM
+            for everything
+        """
+        if not settings.RULE_EXTRACTION_ENABLED:
+            return None, None, []
+
+        with timed("rules"):
+            result = self.rule_extractor.extract(resume_text)
+
+        if result.confidence >= settings.RULE_EXTRACTION_MIN_CONFIDENCE and not result.missing:
+            try:
+                return PortfolioData(**result.data), None, []
+            except ValueError:
+                return None, None, []
+
+        if (
+            result.confidence >= settings.RULE_EXTRACTION_PARTIAL_CONFIDENCE
+            and estimate_tokens(resume_text) <= settings.CHUNKED_EXTRACTION_THRESHOLD_TOKENS
+        ):
+            return None, result.data, result.missing
+
+        return None, None, []
+
+    async def _structure(self, resume_text: str) -> PortfolioData:
+        """Resume text → PortfolioData, using the LLM only where the rules fall short"""
+        portfolio_data, partial, missing = self._extract_with_rules(resume_text)
+        if portfolio_data is not None:
+            metrics.inc("portfogen_rule_extraction_total", outcome="rules")
+            return portfolio_data
+
+        if partial is not None:
+            fields = await self.openai_service.extract_fields(resume_text, missing)
+            for field in missing:
+                value = fields.get(field)
+                if field == "personal_info" and isinstance(value, dict):
+                    value = {**partial["personal_info"], **{k: v for k, v in value.items() if v}}
+                if value is not None:
+                    partial[field] = value
+            try:
+                portfolio_data = PortfolioData(**partial)
+                metrics.inc("portfogen_rule_extraction_total", outcome="rules_plus_llm")
+                return portfolio_data
+            except ValueError:
+                pass
+
+        metrics.inc("portfogen_rule_extraction_total", outcome="llm")
+        return await self.openai_service.extract_portfolio_data(resume_text)
+
+    async def extract_from_resume(self, resume: Resume, file_type: str) -> PortfolioData:
         """
         Complete flow: File → Text → Structured Data
-        
+
         Args:
-            file_bytes: Resume file content as bytes
-            file_type: File extension (pdf, docx, doc)
-            
+            resume: Resume file content as bytes, or a SpooledUpload
+            file_type: File type (pdf, docx)
+
         Returns:
             Structured PortfolioData object
         """
-        # Step 1: Extract text from file
-        resume_text = self.resume_parser.parse_resume(file_bytes, file_type)
-        
-        # Step 2: Use AI to structure the data
-        portfolio_data = self.openai_service.extract_portfolio_data(resume_text)
-        
+        portfolio_data, _ = await self.extract_from_resume_cached(resume, file_type)
         return portfolio_data
-    
+
+    async def extract_from_resume_cached(self, resume: Resume, file_type: str) -> Tuple[PortfolioData, bool]:
+        """
+        Same as extract_from_resume, but also reports whether the result
+        came from the extraction cache
+
+        Args:
+            resume: Resume file content as bytes, or a SpooledUpload
+            file_type: File type (pdf, docx)
+
+        Returns:
+            Tuple of (PortfolioData, cache_hit)
+        """
+        cache_key = self._cache_key(resume)
+        cached = self._cache_lookup(cache_key)
+        if cached is not None:
+            return cached, True
+
+        # Step 1: Extract text from file (off the event loop)
+        resume_text = await self._parse(resume, file_type)
+
+        # Step 2: Structure the data (rules first, AI where they fall short)
+        portfolio_data = await self._structure(resume_text)
+
+        self.extraction_cache.set(cache_key, portfolio_data)
+        return portfolio_data, False
+
+    async def stream_from_resume(self, resume: Resume, file_type: str) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Streaming variant of extract_from_resume
+
+        Args:
+            resume: Resume file content as bytes, or a SpooledUpload
+            file_type: File type (pdf, docx)
+
+        Yields:
+            (path, value) section events, then ("complete", PortfolioData).
+            A cached result is replayed as a single "complete" event.
+        """
+        cache_key = self._cache_key(resume)
+        cached = self._cache_lookup(cache_key)
+        if cached is not None:
+            yield "complete", cached
+            return
+
+        resume_text = await self._parse(resume, file_type)
+
+        # Well-structured resumes need no streaming: the rules answer at once
+        portfolio_data, _, _ = self._extract_with_rules(resume_text)
+        if portfolio_data is not None:
+            metrics.inc("portfogen_rule_extraction_total", outcome="rules")
+            self.extraction_cache.set(cache_key, portfolio_data)
+            yield "complete", portfolio_data
+            return
+
+        async for path, value in self.openai_service.stream_portfolio_data(resume_text):
+            if path == "complete":
+                self.extraction_cache.set(cache_key, value)
+            yield path, value
+
     async def extract_from_prompt(self, prompt: str) -> PortfolioData:
         """
         Extract from user's text description
-        
+
         Args:
             prompt: User's description
-            
+
         Returns:
             Structured PortfolioData object
         """
-        return self.openai_service.extract_from_prompt(prompt)
-    
-    async def refine_data(self, current_data: PortfolioData, refinement: str) -> PortfolioData:
+        return await self.openai_service.extract_from_prompt(prompt)
+
+    async def refine_data(
+        self,
+        current_data: PortfolioData,
+        refinement: str,
+        mode: Optional[str] = None
+    ) -> PortfolioData:
         """
         Refine existing portfolio data
-        
+
         Args:
             current_data: Current portfolio data
             refinement: Refinement request
-            
+            mode: "patch" or "full" (defaults to Settings.REFINE_MODE)
+
         Returns:
             Updated PortfolioData object
         """
-        return self.openai_service.refine_portfolio(current_data, refinement)
\ No newline at end of file
+        return await self.openai_service.refine_portfolio(current_data, refinement, mode)
+
+@lru_cache()
+def get_nlp_extractor() -> NLPExtractor:
+    """Process-wide extractor, built on first use rather than at import"""
+    return NLPExtractor()
@@ -1,21 +1,28 @@
-from openai import OpenAI
 from app.config import settings
 from app.models import PortfolioData
+from app.services.json_stream import IncrementalJSONParser
+from app.services.json_patch import apply_patch, PatchError
+from app.services.usage_stats import get_usage_stats
+from app.services.chunked_extraction import estimate_tokens, split_resume, merge_partials
+from app.services.metrics import metrics, timed, observe_size
+from app.services.single_flight import SingleFlight
+from app.services.resilience import get_resilience_policy, LLMNotConfiguredError, LLMTimeoutError, LLM_UNAVAILABLE_ERRORS
+from app.services.model_router import RoutingDecision, current_latency_budget, get_model_router
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+import asyncio
+import hashlib
 import json
+import re
+import time
 
-class OpenAIService:
-    """
-    Handles all OpenAI API interactions for portfolio data extraction
-    """
-    
-    def __init__(self):
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
-        self.model = settings.OPENAI_MODEL
-    
-    def extract_portfolio_data(self, resume_text: str) -> PortfolioData:
-        """Extract structured data from resume text using AI"""
-        
-        system_prompt = """You are an expert resume parser. Extract information from the resume text and return it in the following JSON format:
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+# Bump whenever the extraction prompt changes so cached results are invalidated
+EXTRACTION_PROMPT_VERSION = "2"
+
+RESUME_SYSTEM_PROMPT = """You are an expert resume parser. Extract information from the resume text and return it in the following JSON format:
 
 {
   "personal_info": {
@@ -63,27 +70,345 @@ class OpenAIService:
 
 Extract as much information as possible. If information is missing, use null or empty arrays. Return ONLY valid JSON, no additional text."""
 
+REFINE_PATCH_SYSTEM_PROMPT = """You are refining a portfolio website. You are given only the sections of the portfolio that are relevant to the user's request. Do not return the portfolio. Return a JSON object of the form {"patch": [...]} where each item is a JSON Patch operation:
+
+{"op": "replace", "path": "/summary", "value": "New summary"}
+{"op": "add", "path": "/skills/-", "value": "Docker"}
+{"op": "remove", "path": "/experience/1/responsibilities/0"}
+
+Paths are JSON Pointers from the portfolio root and must start with one of: {sections}. Change only what the user asked for. Return {"patch": []} if nothing needs to change. Return ONLY valid JSON."""
+
+# Words in a refinement request that point at a portfolio section
+SECTION_KEYWORDS = {
+    "personal_info": re.compile(r"\b(name|e-?mail|phone|location|city|linkedin|github|website|contact)", re.I),
+    "summary": re.compile(r"\b(summary|about|bio|intro|objective|profile|headline)", re.I),
+    "experience": re.compile(r"\b(experience|job|role|position|work|company|employer|responsibilit)", re.I),
+    "education": re.compile(r"\b(education|degree|universit|school|college|gpa|stud)", re.I),
+    "skills": re.compile(r"\b(skill|tech stack|technolog)", re.I),
+    "projects": re.compile(r"\b(project|portfolio item|demo)", re.I),
+    "certifications": re.compile(r"\b(certif|license)", re.I),
+}
+
+@lru_cache()
+def get_async_client() -> "AsyncOpenAI":
+    """
+    Shared AsyncOpenAI client for the whole process.
+
+    A single client keeps one pooled HTTP connection set, so concurrent
+    requests reuse warm keep-alive connections instead of opening new ones.
+    The SDK (and httpx) are imported here rather than at module level, as
+    they are the slowest part of importing the app.
+
+    Raises:
+        LLMNotConfiguredError: OPENAI_API_KEY is not set
+    """
+    if not settings.OPENAI_API_KEY:
+        raise LLMNotConfiguredError("LLM features are unavailable: OPENAI_API_KEY is not set")
+
+    import httpx
+    from openai import AsyncOpenAI
+
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+        timeout=settings.OPENAI_TIMEOUT,
+    )
+    return AsyncOpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        base_url=settings.OPENAI_BASE_URL,
+        http_client=http_client,
+        # Retries are handled by the resilience policy
+        max_retries=0,
+    )
+
+@lru_cache()
+def get_llm_semaphore() -> asyncio.Semaphore:
+    """Process-wide cap on in-flight OpenAI requests"""
+    return asyncio.Semaphore(settings.OPENAI_MAX_CONCURRENCY)
+
+@lru_cache()
+def get_single_flight() -> SingleFlight:
+    """Process-wide registry of in-flight completions, shared by all services"""
+    return SingleFlight()
+
+def _coalesce_key(model: str, temperature: float, operation: str, messages: List[Dict[str, str]]) -> str:
+    """
+    Identity of a completion for coalescing
+
+    Message text is whitespace-normalized so trivially different copies of the
+    same resume or prompt (trailing newlines, re-wrapped lines) still match.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{model}\0{temperature!r}\0{operation}".encode())
+    for message in messages:
+        content = " ".join(message["content"].split())
+        digest.update(f"\0{message['role']}\0{content}".encode())
+    return digest.hexdigest()
+
+class OpenAIService:
+    """
+    Handles all OpenAI API interactions for portfolio data extraction
+    """
+    
+    def __init__(self):
+        self.model = settings.OPENAI_MODEL
+        self.semaphore = get_llm_semaphore()
+        self.usage_stats = get_usage_stats()
+        self.single_flight = get_single_flight()
+        self.resilience = get_resilience_policy()
+        self.router = get_model_router()
+    
+    @property
+    def client(self) -> "AsyncOpenAI":
+        # Created on the first LLM call, not with the service
+        return get_async_client()
+
+    def _route(self, operation: str, messages: List[Dict[str, str]]) -> RoutingDecision:
+        """Pick the model for a call from its operation, input size and the request's latency budget"""
+        input_tokens = sum(estimate_tokens(message["content"]) for message in messages)
+        return self.router.choose(operation, input_tokens, current_latency_budget())
+    
+    async def _call_routed(
+        self,
+        decision: RoutingDecision,
+        call: Callable[[str], Awaitable[Any]],
+        stream: bool = False
+    ) -> Any:
+        """
+        Run call(model) with the routed model, retrying once with the
+        fallback model if the first one runs out of time
+        
+        Args:
+            decision: Routing decision for the call
+            call: Makes one upstream request with the given model
+            stream: The call opens a stream (no hedging, no latency sample)
+            
+        Returns:
+            Result of call
+        """
+        start = time.perf_counter()
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"Resume text:\n\n{resume_text}"}
-                ],
-                temperature=0.3,
-                response_format={"type": "json_object"}
+            result = await self.resilience.call(
+                lambda: call(decision.model),
+                hedge=not stream,
+                deadline=decision.deadline
             )
+        except LLMTimeoutError:
+            elapsed = time.perf_counter() - start
+            self.router.record_timeout(decision.model, elapsed)
+            if decision.fallback is None:
+                self.router.record(decision, decision.model, "timeout", elapsed)
+                raise
+        except Exception:
+            self.router.record(decision, decision.model, "error", time.perf_counter() - start)
+            raise
+        else:
+            self.router.record(decision, decision.model, "ok", time.perf_counter() - start, track_latency=not stream)
+            return result
+        
+        try:
+            result = await self.resilience.call(
+                lambda: call(decision.fallback),
+                hedge=not stream,
+                deadline=decision.fallback_deadline(time.perf_counter() - start)
+            )
+        except LLMTimeoutError:
+            self.router.record(decision, decision.fallback, "timeout", time.perf_counter() - start)
+            raise
+        except Exception:
+            self.router.record(decision, decision.fallback, "error", time.perf_counter() - start)
+            raise
+        self.router.record(decision, decision.fallback, "fallback_ok", time.perf_counter() - start)
+        return result
+    
+    async def _complete_json(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        operation: str = "completion"
+    ) -> Dict[str, Any]:
+        """
+        Run one JSON-mode chat completion and decode the result
+        
+        The model is picked by the model router. Identical completions
+        (same model, temperature, operation and normalized messages) that
+        overlap in time share one API call.
+        
+        Args:
+            messages: Chat messages to send
+            temperature: Sampling temperature
+            operation: Name the call's token usage is recorded under
             
-            content = response.choices[0].message.content
-            data_dict = json.loads(content)
-            portfolio_data = PortfolioData(**data_dict)
+        Returns:
+            Decoded JSON object from the model response
+        """
+        decision = self._route(operation, messages)
+        
+        async def attempt(model: str):
+            async with self.semaphore:
+                return await self.client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    response_format={"type": "json_object"}
+                )
+        
+        async def complete() -> str:
+            start = time.perf_counter()
+            response = await self._call_routed(decision, attempt)
+            elapsed = time.perf_counter() - start
+            
+            usage = response.usage
+            self.usage_stats.record(
+                operation,
+                usage.prompt_tokens if usage else 0,
+                usage.completion_tokens if usage else 0,
+                elapsed
+            )
+            return response.choices[0].message.content
+        
+        with timed("llm"):
+            if settings.OPENAI_COALESCE_REQUESTS:
+                key = _coalesce_key(decision.model, temperature, operation, messages)
+                content, shared = await self.single_flight.do(key, complete)
+                if shared:
+                    metrics.inc("portfogen_llm_coalesced_total", operation=operation)
+            else:
+                content = await complete()
+        
+        observe_size("llm_response", len(content))
+        with timed("decode"):
+            return json.loads(content)
+    
+    @staticmethod
+    def _to_portfolio(data_dict: Dict[str, Any]) -> PortfolioData:
+        """Validate decoded model output into PortfolioData"""
+        with timed("validate"):
+            return PortfolioData(**data_dict)
+    
+    @staticmethod
+    def _resume_messages(resume_text: str) -> List[Dict[str, str]]:
+        return [
+            {"role": "system", "content": RESUME_SYSTEM_PROMPT},
+            {"role": "user", "content": f"Resume text:\n\n{resume_text}"}
+        ]
+
+    async def extract_portfolio_data(self, resume_text: str) -> PortfolioData:
+        """
+        Extract structured data from resume text using AI
+        
+        Resumes above CHUNKED_EXTRACTION_THRESHOLD_TOKENS are split into
+        chunks that are extracted concurrently and merged.
+        """
+
+        try:
+            if estimate_tokens(resume_text) > settings.CHUNKED_EXTRACTION_THRESHOLD_TOKENS:
+                data_dict = await self._extract_chunked(resume_text)
+            else:
+                data_dict = await self._complete_json(
+                    self._resume_messages(resume_text),
+                    temperature=0.3,
+                    operation="extract_resume"
+                )
+            portfolio_data = self._to_portfolio(data_dict)
             
             return portfolio_data
         
+        except LLM_UNAVAILABLE_ERRORS:
+            raise
         except Exception as e:
             raise Exception(f"Error extracting portfolio data: {str(e)}")
     
-    def extract_from_prompt(self, prompt: str) -> PortfolioData:
+    async def extract_fields(self, resume_text: str, fields: List[str]) -> Dict[str, Any]:
+        """
+        Extract only some top-level fields of the portfolio from resume text
+        
+        Args:
+            resume_text: Text extracted from the resume
+            fields: PortfolioData fields to return (e.g. ["experience"])
+            
+        Returns:
+            Decoded JSON object holding the requested fields
+        """
+        messages = self._resume_messages(resume_text)
+        messages[0]["content"] += (
+            f"\n\nOnly the following top-level keys are needed: {', '.join(fields)}. "
+            "Leave every other key out of the response."
+        )
+        try:
+            return await self._complete_json(messages, temperature=0.3, operation="extract_resume_fields")
+        except LLM_UNAVAILABLE_ERRORS:
+            raise
+        except Exception as e:
+            raise Exception(f"Error extracting portfolio data: {str(e)}")
+    
+    async def _extract_chunked(self, resume_text: str) -> Dict[str, Any]:
+        """Map-reduce extraction: one completion per chunk, merged in document order"""
+        chunks = split_resume(resume_text, settings.CHUNK_TARGET_TOKENS)
+        
+        async def extract_chunk(index: int, chunk: str) -> Dict[str, Any]:
+            messages = self._resume_messages(chunk)
+            messages[1]["content"] = (
+                f"This is part {index + 1} of {len(chunks)} of a longer resume. "
+                f"Extract only what appears in this part.\n\n{messages[1]['content']}"
+            )
+            return await self._complete_json(messages, temperature=0.3, operation="extract_resume_chunk")
+        
+        partials = await asyncio.gather(*(extract_chunk(i, chunk) for i, chunk in enumerate(chunks)))
+        return merge_partials(list(partials))
+    
+    async def stream_portfolio_data(self, resume_text: str) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Extract structured data from resume text, yielding each section as
+        soon as the model has finished writing it
+        
+        Args:
+            resume_text: Text extracted from the resume
+            
+        Yields:
+            (path, value) pairs such as ("personal_info", {...}) or
+            ("experience[0]", {...}), then ("complete", PortfolioData)
+        """
+        parser = IncrementalJSONParser()
+        messages = self._resume_messages(resume_text)
+        decision = self._route("extract_resume_stream", messages)
+        
+        try:
+            with timed("llm"):
+                async with self.semaphore:
+                    # Only opening the stream is retried; once tokens have been
+                    # yielded the call cannot be replayed
+                    stream = await self._call_routed(
+                        decision,
+                        lambda model: self.client.chat.completions.create(
+                            model=model,
+                            messages=messages,
+                            temperature=0.3,
+                            response_format={"type": "json_object"},
+                            stream=True
+                        ),
+                        stream=True
+                    )
+                    async for chunk in stream:
+                        if not chunk.choices:
+                            continue
+                        delta = chunk.choices[0].delta.content
+                        if delta:
+                            for event in parser.feed(delta):
+                                yield event
+            
+            with timed("decode"):
+                data_dict = json.loads(parser.text)
+            yield "complete", self._to_portfolio(data_dict)
+        
+        except LLM_UNAVAILABLE_ERRORS:
+            raise
+        except Exception as e:
+            raise Exception(f"Error extracting portfolio data: {str(e)}")
+    
+    async def extract_from_prompt(self, prompt: str) -> PortfolioData:
         """Extract portfolio data from user's text description"""
         
         system_prompt = """You are helping create a portfolio website. Based on the user's description, generate portfolio data in JSON format following this structure:
@@ -101,48 +426,114 @@ Extract as much information as possible. If information is missing, use null or
 Be creative and fill in reasonable details based on the description. Return ONLY valid JSON."""
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
+            data_dict = await self._complete_json(
+                [
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.7,
-                response_format={"type": "json_object"}
+                operation="extract_prompt"
             )
-            
-            content = response.choices[0].message.content
-            data_dict = json.loads(content)
-            portfolio_data = PortfolioData(**data_dict)
+            portfolio_data = self._to_portfolio(data_dict)
             
             return portfolio_data
         
+        except LLM_UNAVAILABLE_ERRORS:
+            raise
         except Exception as e:
             raise Exception(f"Error processing prompt: {str(e)}")
     
-    def refine_portfolio(self, current_data: PortfolioData, refinement_request: str) -> PortfolioData:
-        """Refine existing portfolio based on user feedback"""
+    async def refine_portfolio(
+        self,
+        current_data: PortfolioData,
+        refinement_request: str,
+        mode: Optional[str] = None
+    ) -> PortfolioData:
+        """
+        Refine existing portfolio based on user feedback
+        
+        Args:
+            current_data: Current portfolio data
+            refinement_request: What the user wants changed
+            mode: "patch" sends only the relevant sections and applies the
+                model's JSON Patch locally; "full" round-trips the whole
+                portfolio. Defaults to Settings.REFINE_MODE.
+            
+        Returns:
+            Updated PortfolioData object
+        """
+        mode = mode or settings.REFINE_MODE
+        
+        if mode == "patch":
+            try:
+                return await self._refine_with_patch(current_data, refinement_request)
+            except PatchError:
+                # The model's patch did not fit the data; redo the whole document
+                pass
+        
+        return await self._refine_full(current_data, refinement_request)
+    
+    @staticmethod
+    def _sections_for(refinement_request: str) -> List[str]:
+        """Portfolio sections a refinement request refers to (all if unclear)"""
+        sections = [
+            section for section, pattern in SECTION_KEYWORDS.items()
+            if pattern.search(refinement_request)
+        ]
+        return sections or list(SECTION_KEYWORDS)
+    
+    async def _refine_with_patch(self, current_data: PortfolioData, refinement_request: str) -> PortfolioData:
+        sections = self._sections_for(refinement_request)
+        current = current_data.model_dump(mode="json")
+        context = json.dumps({section: current[section] for section in sections})
+        system_prompt = REFINE_PATCH_SYSTEM_PROMPT.replace(
+            "{sections}",
+            ", ".join(f"/{section}" for section in sections)
+        )
+        
+        try:
+            data_dict = await self._complete_json(
+                [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": f"Relevant sections:\n{context}\n\nUser request: {refinement_request}"}
+                ],
+                temperature=0.5,
+                operation="refine_patch"
+            )
+        except LLM_UNAVAILABLE_ERRORS:
+            raise
+        except Exception as e:
+            raise Exception(f"Error refining portfolio: {str(e)}")
+        
+        operations = data_dict.get("patch")
+        if not isinstance(operations, list):
+            raise PatchError("Response has no patch list")
         
+        patched = apply_patch(current, operations, allowed_roots=sections)
+        try:
+            return self._to_portfolio(patched)
+        except ValueError as e:
+            raise PatchError(f"Patched portfolio is invalid: {str(e)}")
+    
+    async def _refine_full(self, current_data: PortfolioData, refinement_request: str) -> PortfolioData:
         system_prompt = """You are refining a portfolio website. The user has requested changes. Update the portfolio data accordingly and return the complete updated JSON."""
 
         try:
             current_json = current_data.model_dump_json()
             
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
+            data_dict = await self._complete_json(
+                [
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": f"Current data:\n{current_json}\n\nUser request: {refinement_request}"}
                 ],
                 temperature=0.5,
-                response_format={"type": "json_object"}
+                operation="refine_full"
             )
-            
-            content = response.choices[0].message.content
-            data_dict = json.loads(content)
-            portfolio_data = PortfolioData(**data_dict)
+            portfolio_data = self._to_portfolio(data_dict)
             
             return portfolio_data
         
+        except LLM_UNAVAILABLE_ERRORS:
+            raise
         except Exception as e:
             raise Exception(f"Error refining portfolio: {str(e)}")
\ No newline at end of file
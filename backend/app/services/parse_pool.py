@@ -0,0 +1,142 @@
+from app.services.resume_parser import ResumeParser, ResumeSource
+from app.config import settings
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Optional
+import asyncio
+import multiprocessing
+import os
+import threading
+
+def _ready() -> int:
+    # Load the parser libraries, which ResumeParser imports on first use
+    import PyPDF2  # noqa: F401
+    import docx  # noqa: F401
+    return os.getpid()
+
+class ParseTimeoutError(Exception):
+    """Raised when a document takes longer than the parse timeout"""
+
+class ParsePool:
+    """
+    Runs ResumeParser on a bounded process pool
+
+    PDF/DOCX parsing is CPU-bound, so it is kept off the event loop and out
+    of the server process. Workers are recycled after a number of jobs to
+    cap PyPDF2 memory growth, and a worker that blows the per-document
+    timeout is killed rather than left running.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        timeout_seconds: float = 20.0,
+        max_pages: Optional[int] = 50,
+        max_jobs_per_worker: int = 100
+    ):
+        self.max_workers = max_workers
+        self.timeout_seconds = timeout_seconds
+        self.max_pages = max_pages
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._jobs_on_executor = 0
+        self._lock = threading.Lock()
+
+    def _acquire_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            # Recycle the whole pool once every worker has served its share
+            # of jobs; in-flight jobs finish on the retired pool.
+            if (
+                self._executor is not None
+                and self._jobs_on_executor >= self.max_workers * self.max_jobs_per_worker
+            ):
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+                self._jobs_on_executor = 0
+
+            self._jobs_on_executor += 1
+            return self._executor
+
+    def _kill_executor(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        # ProcessPoolExecutor has no public way to stop a running task, so
+        # terminate the workers directly; shutdown() alone would wait on them.
+        for process in list((executor._processes or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def parse(self, file_bytes: ResumeSource, file_type: str) -> str:
+        """
+        Parse a resume on the process pool
+
+        Args:
+            file_bytes: File content as bytes, or the path of a file holding
+                it; a path is opened by the worker, so the content is not
+                pickled across the process boundary
+            file_type: File extension (pdf, docx, doc)
+
+        Returns:
+            Extracted text as string
+        """
+        for attempt in range(2):
+            executor = self._acquire_executor()
+            future = executor.submit(
+                ResumeParser.parse_resume,
+                file_bytes,
+                file_type,
+                self.max_pages
+            )
+            try:
+                return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout_seconds)
+            except asyncio.TimeoutError:
+                self._kill_executor(executor)
+                raise ParseTimeoutError(
+                    f"Parsing took longer than {self.timeout_seconds:g} seconds"
+                )
+            except BrokenProcessPool:
+                # A sibling job timed out and took this pool down; retry once
+                # on a fresh pool.
+                self._kill_executor(executor)
+                if attempt:
+                    raise
+
+    async def warm_up(self) -> int:
+        """
+        Start every worker process before the first upload needs one
+
+        Spawning a worker and importing the parser libraries in it would
+        otherwise land on the first uploads' latency.
+
+        Returns:
+            Number of distinct workers that answered
+        """
+        executor = self._acquire_executor()
+        futures = [executor.submit(_ready) for _ in range(self.max_workers)]
+        pids = await asyncio.gather(*(asyncio.wrap_future(future) for future in futures))
+        return len(set(pids))
+
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+@lru_cache()
+def get_parse_pool() -> ParsePool:
+    """Process-wide parse pool built from Settings"""
+    return ParsePool(
+        max_workers=settings.PARSE_POOL_WORKERS,
+        timeout_seconds=settings.PARSE_TIMEOUT_SECONDS,
+        max_pages=settings.PARSE_MAX_PAGES,
+        max_jobs_per_worker=settings.PARSE_WORKER_MAX_JOBS
+    )
@@ -1,7 +1,80 @@
-from app.models import PortfolioData
-from typing import Dict
-import os
+from app.config import settings
+from app.models import PortfolioData, PersonalInfo, Experience, Education, Project
+from app.services.template_engine import TemplateEngine
+from app.services.metrics import timed, observe_size
+from collections import OrderedDict
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from pathlib import Path
+import hashlib
+import html
+import multiprocessing
+import os
+import re
+import threading
+
+# Bump whenever the section renderers change their output (markup,
+# escaping), so cached renders made by older code stop matching
+RENDERER_VERSION = "3"
+
+# Template ids accepted by the generator
+TEMPLATES = ("template1", "template2", "template3")
+
+# Template slot -> PortfolioData field the slot's fragment is rendered from
+SECTION_FIELDS = {
+    "title": "personal_info",
+    "header": "personal_info",
+    "summary": "summary",
+    "experience": "experience",
+    "education": "education",
+    "skills": "skills",
+    "projects": "projects",
+    "footer": "personal_info",
+}
+
+# Schemes a link in a rendered page may use; anything else (javascript:,
+# data:, ...) is dropped
+LINK_SCHEMES = ("http://", "https://", "mailto:")
+# A bare host, optionally followed by a path ("github.com/x", "example.dev"),
+# as extraction often stores links; these are linked over https
+BARE_HOST = re.compile(r"^[a-z0-9-]+(?:\.[a-z0-9-]+)+(?:[/?#]|$)", re.I)
+
+def _text(value: Any) -> str:
+    """Escape a user-supplied value for HTML text or a quoted attribute"""
+    return html.escape(str(value))
+
+def _url(value: str) -> str:
+    """
+    An escaped href: URLs with one of LINK_SCHEMES as they are, bare hosts
+    with https:// added, and "#" for anything else
+    """
+    value = value.strip()
+    if BARE_HOST.match(value):
+        value = "https://" + value
+    elif not value.lower().startswith(LINK_SCHEMES):
+        return "#"
+    return html.escape(value)
+
+def section_digest(data: PortfolioData, field: str) -> str:
+    """Stable hash of one PortfolioData field, used to memoize its fragment"""
+    # Serialized in pydantic-core; field order is fixed by the model, so stable
+    return hashlib.sha256(data.model_dump_json(include={field}).encode()).hexdigest()
+
+# Per-process generator used by batch render workers
+_worker_generator: Optional["PortfolioGenerator"] = None
+
+def _render_chunk(
+    start: int,
+    records: List[PortfolioData],
+    template: str,
+    asset_base: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Render a slice of a batch inside a worker process"""
+    global _worker_generator
+    if _worker_generator is None:
+        _worker_generator = PortfolioGenerator()
+    return _worker_generator._render_results(start, records, template, asset_base)
 
 class PortfolioGenerator:
     """
@@ -11,429 +84,391 @@ class PortfolioGenerator:
     def __init__(self):
         # Path to template files
         self.templates_dir = Path(__file__).parent.parent / "templates"
+        self.engine = TemplateEngine(self.templates_dir)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        # (slot, digest) -> rendered fragment, least recently used first
+        self._fragments: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._fragments_lock = threading.Lock()
+        self._fragments_max = settings.FRAGMENT_CACHE_SIZE
+        self._section_renderers = {
+            "title": self._render_title,
+            "header": self._render_header,
+            "summary": self._render_summary,
+            "experience": self._render_experience,
+            "education": self._render_education,
+            "skills": self._render_skills,
+            "projects": self._render_projects,
+            "footer": self._render_footer,
+        }
     
-    def generate(self, data: PortfolioData, template: str = "template1") -> Dict[str, str]:
+    def generate(
+        self,
+        data: PortfolioData,
+        template: str = "template1",
+        asset_base: Optional[str] = None
+    ) -> Dict[str, str]:
         """
         Main generation method
         
         Args:
             data: Structured portfolio data
             template: Template name (template1, template2, template3)
+            asset_base: URL prefix of the shared asset bundles (see
+                asset_bundles); None inlines CSS and JS into the page
             
         Returns:
             Dictionary with html, css, and js content
         """
         
-        if template == "template1":
-            return self._generate_template1(data)
-        elif template == "template2":
-            return self._generate_template2(data)
-        elif template == "template3":
-            return self._generate_template3(data)
-        else:
-            raise ValueError(f"Unknown template: {template}")
+        files, _ = self.generate_with_sections(data, template, asset_base)
+        return files
     
-    def _generate_template1(self, data: PortfolioData) -> Dict[str, str]:
+    def generate_with_sections(
+        self,
+        data: PortfolioData,
+        template: str = "template1",
+        asset_base: Optional[str] = None
+    ) -> Tuple[Dict[str, str], Dict[str, str]]:
         """
-        Generate modern, minimal portfolio
+        Generate the site and report the digest of every section
+        
+        Args:
+            data: Structured portfolio data
+            template: Template name (template1, template2, template3)
+            asset_base: URL prefix of the shared asset bundles, if linked
+            
+        Returns:
+            (files, digests) where digests maps each template slot to the
+            hash of the data it was rendered from
         """
+        with timed("render"):
+            fragments = self.render_fragments(data, template)
+            context = {slot: html for slot, (_, html) in fragments.items()}
+            if template == "template1":
+                files = self._generate_template1(context, asset_base)
+            elif template == "template2":
+                files = self._generate_template2(context, asset_base)
+            elif template == "template3":
+                files = self._generate_template3(context, asset_base)
         
-        # Build experience section HTML
-        experience_html = ""
-        for exp in data.experience:
-            responsibilities = "".join([f"<li>{resp}</li>" for resp in exp.responsibilities])
-            experience_html += f"""
-            <div class="experience-item">
-                <h3>{exp.position} at {exp.company}</h3>
-                <p class="date">{exp.start_date} - {exp.end_date or 'Present'}</p>
-                {f'<p class="description">{exp.description}</p>' if exp.description else ''}
-                {f'<ul class="responsibilities">{responsibilities}</ul>' if exp.responsibilities else ''}
-            </div>
-            """
+        observe_size("html", len(files["html"]))
+        return files, {slot: digest for slot, (digest, _) in fragments.items()}
+    
+    def render_fragments(self, data: PortfolioData, template: str = "template1") -> Dict[str, Tuple[str, str]]:
+        """
+        Render each section of the page, reusing fragments whose data is unchanged
         
-        # Build education section HTML
-        education_html = ""
-        for edu in data.education:
-            education_html += f"""
-            <div class="education-item">
-                <h3>{edu.degree}{f' in {edu.field}' if edu.field else ''}</h3>
-                <p class="institution">{edu.institution}</p>
-                <p class="date">{edu.start_date} - {edu.end_date}</p>
-                {f'<p class="gpa">GPA: {edu.gpa}</p>' if edu.gpa else ''}
-            </div>
-            """
+        Args:
+            data: Structured portfolio data
+            template: Template name
+            
+        Returns:
+            {slot: (digest, html)} for every section slot
+        """
+        if template not in TEMPLATES:
+            raise ValueError(f"Unknown template: {template}")
         
-        # Build skills section HTML
-        skills_html = "".join([f'<span class="skill-tag">{skill}</span>' for skill in data.skills])
+        digests = {field: section_digest(data, field) for field in set(SECTION_FIELDS.values())}
+        return {
+            slot: (digests[field], self._render_fragment(data, slot, digests[field]))
+            for slot, field in SECTION_FIELDS.items()
+        }
+    
+    def _render_fragment(self, data: PortfolioData, slot: str, digest: str) -> str:
+        """Render one section slot, or reuse the memoized fragment for its digest"""
+        key = (slot, digest)
+        with self._fragments_lock:
+            html = self._fragments.get(key)
+            if html is not None:
+                self._fragments.move_to_end(key)
+        if html is None:
+            html = self._section_renderers[slot](getattr(data, SECTION_FIELDS[slot]))
+            with self._fragments_lock:
+                self._fragments[key] = html
+                while len(self._fragments) > self._fragments_max:
+                    self._fragments.popitem(last=False)
+        return html
+    
+    def iter_html(self, data: PortfolioData, template: str = "template1") -> Iterator[str]:
+        """
+        Render the page as a stream of text pieces
         
-        # Build projects section HTML
-        projects_html = ""
-        for proj in data.projects:
-            tech_tags = "".join([f'<span class="tech-tag">{tech}</span>' for tech in proj.technologies])
-            projects_html += f"""
-            <div class="project-card">
-                <h3>{proj.name}</h3>
-                <p>{proj.description}</p>
-                <div class="tech-stack">{tech_tags}</div>
-                <div class="project-links">
-                    {f'<a href="{proj.link}" target="_blank">Live Demo</a>' if proj.link else ''}
-                    {f'<a href="{proj.github}" target="_blank">GitHub</a>' if proj.github else ''}
-                </div>
-            </div>
-            """
+        The head (with the inlined stylesheet) comes first, and each
+        section is rendered when the stream reaches it.
         
-        # Complete HTML document
-        html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{data.personal_info.name} - Portfolio</title>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            background: #f5f5f5;
-        }}
-
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 0 20px;
-        }}
-
-        /* Header Styles */
-        .header {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 60px 0;
-            text-align: center;
-        }}
-
-        .header h1 {{
-            font-size: 3rem;
-            margin-bottom: 10px;
-        }}
-
-        .location {{
-            font-size: 1.1rem;
-            opacity: 0.9;
-            margin-bottom: 20px;
-        }}
-
-        .contact-info {{
-            margin: 20px 0;
-        }}
-
-        .contact-info a,
-        .contact-info span {{
-            color: white;
-            text-decoration: none;
-            margin: 0 15px;
-            font-size: 1rem;
-        }}
-
-        .contact-info a:hover {{
-            text-decoration: underline;
-        }}
-
-        .social-links {{
-            margin-top: 20px;
-        }}
-
-        .social-links a {{
-            color: white;
-            text-decoration: none;
-            margin: 0 10px;
-            padding: 8px 20px;
-            border: 2px solid white;
-            border-radius: 25px;
-            display: inline-block;
-            transition: all 0.3s;
-        }}
-
-        .social-links a:hover {{
-            background: white;
-            color: #667eea;
-        }}
-
-        /* Section Styles */
-        section {{
-            background: white;
-            margin: 40px 0;
-            padding: 60px 0;
-        }}
-
-        section h2 {{
-            font-size: 2.5rem;
-            margin-bottom: 30px;
-            color: #667eea;
-            text-align: center;
-        }}
-
-        /* Summary Section */
-        .summary p {{
-            font-size: 1.2rem;
-            text-align: center;
-            max-width: 800px;
-            margin: 0 auto;
-            color: #666;
-        }}
-
-        /* Experience Section */
-        .experience-item {{
-            margin-bottom: 40px;
-            padding: 20px;
-            border-left: 4px solid #667eea;
-            background: #f9f9f9;
-        }}
-
-        .experience-item h3 {{
-            font-size: 1.5rem;
-            color: #333;
-            margin-bottom: 10px;
-        }}
-
-        .date {{
-            color: #667eea;
-            font-weight: 600;
-            margin-bottom: 15px;
-        }}
-
-        .description {{
-            margin-bottom: 15px;
-            color: #666;
-        }}
-
-        .responsibilities {{
-            list-style-position: inside;
-            color: #666;
-        }}
-
-        .responsibilities li {{
-            margin-bottom: 8px;
-        }}
-
-        /* Education Section */
-        .education-item {{
-            margin-bottom: 30px;
-            padding: 20px;
-            background: #f9f9f9;
-            border-radius: 8px;
-        }}
-
-        .education-item h3 {{
-            font-size: 1.4rem;
-            color: #333;
-            margin-bottom: 8px;
-        }}
-
-        .institution {{
-            font-size: 1.1rem;
-            color: #667eea;
-            font-weight: 600;
-            margin-bottom: 5px;
-        }}
-
-        .gpa {{
-            color: #666;
-            margin-top: 5px;
-        }}
-
-        /* Skills Section */
-        .skills-container {{
-            display: flex;
-            flex-wrap: wrap;
-            justify-content: center;
-            gap: 15px;
-        }}
-
-        .skill-tag {{
-            background: #667eea;
-            color: white;
-            padding: 10px 20px;
-            border-radius: 25px;
-            font-size: 0.95rem;
-            font-weight: 500;
-        }}
-
-        /* Projects Section */
-        .projects-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-            gap: 30px;
-            margin-top: 30px;
-        }}
-
-        .project-card {{
-            background: #f9f9f9;
-            padding: 30px;
-            border-radius: 10px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-            transition: transform 0.3s;
-        }}
-
-        .project-card:hover {{
-            transform: translateY(-5px);
-            box-shadow: 0 5px 20px rgba(0,0,0,0.15);
-        }}
-
-        .project-card h3 {{
-            font-size: 1.3rem;
-            color: #333;
-            margin-bottom: 15px;
-        }}
-
-        .project-card p {{
-            color: #666;
-            margin-bottom: 20px;
-        }}
-
-        .tech-stack {{
-            display: flex;
-            flex-wrap: wrap;
-            gap: 8px;
-            margin-bottom: 20px;
-        }}
-
-        .tech-tag {{
-            background: #e0e7ff;
-            color: #667eea;
-            padding: 5px 12px;
-            border-radius: 15px;
-            font-size: 0.85rem;
-        }}
-
-        .project-links a {{
-            display: inline-block;
-            margin-right: 15px;
-            color: #667eea;
-            text-decoration: none;
-            font-weight: 600;
-        }}
-
-        .project-links a:hover {{
-            text-decoration: underline;
-        }}
-
-        /* Footer */
-        footer {{
-            background: #333;
-            color: white;
-            text-align: center;
-            padding: 30px 0;
-        }}
-
-        /* Responsive Design */
-        @media (max-width: 768px) {{
-            .header h1 {{
-                font-size: 2rem;
-            }}
+        Args:
+            data: Structured portfolio data
+            template: Template name
             
-            section h2 {{
-                font-size: 2rem;
-            }}
+        Returns:
+            Iterator over pieces of the HTML page
+        """
+        if template not in TEMPLATES:
+            raise ValueError(f"Unknown template: {template}")
+        
+        # template2 and template3 currently render as template1
+        compiled = self.engine.get("template1")
+        return compiled.iter_render(
+            lambda slot: self._render_fragment(data, slot, section_digest(data, SECTION_FIELDS[slot]))
+        )
+    
+    def generate_many(
+        self,
+        records: Iterable[PortfolioData],
+        template: str = "template1",
+        workers: int = 0,
+        chunk_size: int = 64,
+        asset_base: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Render many portfolios, spreading the work across processes
+        
+        Args:
+            records: Portfolio data to render
+            template: Template name used for every record
+            workers: Worker processes (0 for one per CPU, 1 to render inline)
+            chunk_size: Records sent to a worker at a time
+            asset_base: URL prefix of the shared asset bundles, if linked
             
-            .projects-grid {{
-                grid-template-columns: 1fr;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <!-- Header Section -->
-    <header class="header">
+        Yields:
+            One result per record, in input order:
+            {"index": i, "success": True, "files": {...}} or
+            {"index": i, "success": False, "error": "..."}
+        """
+        records = list(records)
+        workers = workers or os.cpu_count() or 1
+        
+        # Small batches are cheaper to render than to ship to another process
+        if workers == 1 or len(records) <= chunk_size:
+            yield from self._render_results(0, records, template, asset_base)
+            return
+        
+        executor = self._get_executor(workers)
+        starts = range(0, len(records), chunk_size)
+        futures = [
+            executor.submit(_render_chunk, start, records[start:start + chunk_size], template, asset_base)
+            for start in starts
+        ]
+        for future in futures:
+            yield from future.result()
+    
+    def _render_results(
+        self,
+        start: int,
+        records: List[PortfolioData],
+        template: str,
+        asset_base: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        results = []
+        for offset, data in enumerate(records):
+            try:
+                files = self.generate(data, template, asset_base)
+                results.append({"index": start + offset, "success": True, "files": files})
+            except Exception as e:
+                results.append({"index": start + offset, "success": False, "error": str(e)})
+        return results
+    
+    def _get_executor(self, workers: int) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+    
+    def shutdown(self) -> None:
+        """Stop batch render workers, if any were started"""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def render_version(self, template: str = "template1") -> str:
+        """
+        Identifies the code and files a render of template comes from:
+        RENDERER_VERSION plus the digest of the template's files
+
+        Raises:
+            ValueError: Unknown template
+        """
+        if template not in TEMPLATES:
+            raise ValueError(f"Unknown template: {template}")
+        # template2 and template3 render with template1 for now
+        return f"{RENDERER_VERSION}.{self.engine.digest('template1')}"
+    
+    def asset_bundles(self, template: str = "template1") -> Dict[str, Tuple[str, str]]:
+        """
+        Shared CSS/JS bundles that pages link to when rendered with asset_base
+        
+        Returns:
+            {"css": (filename, text), ...} as from TemplateEngine.bundle
+        """
+        if template not in TEMPLATES:
+            raise ValueError(f"Unknown template: {template}")
+        # template2 and template3 render with template1 for now
+        return self.engine.bundle("template1")
+    
+    def _generate_template1(self, sections: Dict[str, str], asset_base: Optional[str] = None) -> Dict[str, str]:
+        """
+        Generate modern, minimal portfolio
+        """
+        html = self.engine.get("template1", asset_base).render(sections)
+
+        return {
+            "html": html,
+            "css": "",  # CSS is embedded in HTML
+            "js": ""
+        }
+    
+    @staticmethod
+    def _render_title(info: PersonalInfo) -> str:
+        return f"{_text(info.name)} - Portfolio"
+    
+    @staticmethod
+    def _render_header(info: PersonalInfo) -> str:
+        return f"""<header class="header">
         <div class="container">
-            <h1>{data.personal_info.name}</h1>
-            {f'<p class="location">{data.personal_info.location}</p>' if data.personal_info.location else ''}
+            <h1>{_text(info.name)}</h1>
+            {f'<p class="location">{_text(info.location)}</p>' if info.location else ''}
             <div class="contact-info">
-                {f'<a href="mailto:{data.personal_info.email}">{data.personal_info.email}</a>' if data.personal_info.email else ''}
-                {f'<span>{data.personal_info.phone}</span>' if data.personal_info.phone else ''}
+                {f'<a href="{_url("mailto:" + info.email)}">{_text(info.email)}</a>' if info.email else ''}
+                {f'<span>{_text(info.phone)}</span>' if info.phone else ''}
             </div>
             <div class="social-links">
-                {f'<a href="{data.personal_info.linkedin}" target="_blank">LinkedIn</a>' if data.personal_info.linkedin else ''}
-                {f'<a href="{data.personal_info.github}" target="_blank">GitHub</a>' if data.personal_info.github else ''}
-                {f'<a href="{data.personal_info.website}" target="_blank">Website</a>' if data.personal_info.website else ''}
+                {f'<a href="{_url(info.linkedin)}" target="_blank">LinkedIn</a>' if info.linkedin else ''}
+                {f'<a href="{_url(info.github)}" target="_blank">GitHub</a>' if info.github else ''}
+                {f'<a href="{_url(info.website)}" target="_blank">Website</a>' if info.website else ''}
             </div>
         </div>
-    </header>
-
-    <!-- Summary Section -->
-    {f'''<section class="summary">
+    </header>"""
+    
+    @staticmethod
+    def _render_summary(summary: Optional[str]) -> str:
+        if not summary:
+            return ""
+        return f"""<section class="summary">
         <div class="container">
             <h2>About Me</h2>
-            <p>{data.summary}</p>
+            <p>{_text(summary)}</p>
         </div>
-    </section>''' if data.summary else ''}
-
-    <!-- Experience Section -->
-    {f'''<section class="experience">
+    </section>"""
+    
+    @staticmethod
+    def _render_experience(experience: List[Experience]) -> str:
+        if not experience:
+            return ""
+        
+        parts = ["""<section class="experience">
         <div class="container">
             <h2>Experience</h2>
-            {experience_html}
+            """]
+        for exp in experience:
+            responsibilities = "".join([f"<li>{_text(resp)}</li>" for resp in exp.responsibilities])
+            parts.append(f"""
+            <div class="experience-item">
+                <h3>{_text(exp.position)} at {_text(exp.company)}</h3>
+                <p class="date">{_text(exp.start_date)} - {_text(exp.end_date or 'Present')}</p>
+                {f'<p class="description">{_text(exp.description)}</p>' if exp.description else ''}
+                {f'<ul class="responsibilities">{responsibilities}</ul>' if exp.responsibilities else ''}
+            </div>
+            """)
+        parts.append("""
         </div>
-    </section>''' if data.experience else ''}
-
-    <!-- Education Section -->
-    {f'''<section class="education">
+    </section>""")
+        return "".join(parts)
+    
+    @staticmethod
+    def _render_education(education: List[Education]) -> str:
+        if not education:
+            return ""
+        
+        parts = ["""<section class="education">
         <div class="container">
             <h2>Education</h2>
-            {education_html}
+            """]
+        for edu in education:
+            parts.append(f"""
+            <div class="education-item">
+                <h3>{_text(edu.degree)}{f' in {_text(edu.field)}' if edu.field else ''}</h3>
+                <p class="institution">{_text(edu.institution)}</p>
+                <p class="date">{_text(edu.start_date)} - {_text(edu.end_date)}</p>
+                {f'<p class="gpa">GPA: {_text(edu.gpa)}</p>' if edu.gpa else ''}
+            </div>
+            """)
+        parts.append("""
         </div>
-    </section>''' if data.education else ''}
-
-    <!-- Skills Section -->
-    {f'''<section class="skills">
+    </section>""")
+        return "".join(parts)
+    
+    @staticmethod
+    def _render_skills(skills: List[str]) -> str:
+        if not skills:
+            return ""
+        
+        skills_html = "".join([f'<span class="skill-tag">{_text(skill)}</span>' for skill in skills])
+        return f"""<section class="skills">
         <div class="container">
             <h2>Skills</h2>
             <div class="skills-container">
                 {skills_html}
             </div>
         </div>
-    </section>''' if data.skills else ''}
-
-    <!-- Projects Section -->
-    {f'''<section class="projects">
+    </section>"""
+    
+    @staticmethod
+    def _render_projects(projects: List[Project]) -> str:
+        if not projects:
+            return ""
+        
+        parts = ["""<section class="projects">
         <div class="container">
             <h2>Projects</h2>
             <div class="projects-grid">
-                {projects_html}
+                """]
+        for proj in projects:
+            tech_tags = "".join([f'<span class="tech-tag">{_text(tech)}</span>' for tech in proj.technologies])
+            parts.append(f"""
+            <div class="project-card">
+                <h3>{_text(proj.name)}</h3>
+                <p>{_text(proj.description)}</p>
+                <div class="tech-stack">{tech_tags}</div>
+                <div class="project-links">
+                    {f'<a href="{_url(proj.link)}" target="_blank">Live Demo</a>' if proj.link else ''}
+                    {f'<a href="{_url(proj.github)}" target="_blank">GitHub</a>' if proj.github else ''}
+                </div>
+            </div>
+            """)
+        parts.append("""
             </div>
         </div>
-    </section>''' if data.projects else ''}
-
-    <!-- Footer -->
-    <footer>
+    </section>""")
+        return "".join(parts)
+    
+    @staticmethod
+    def _render_footer(info: PersonalInfo) -> str:
+        return f"""<footer>
         <div class="container">
-            <p>&copy; 2024 {data.personal_info.name}. All rights reserved.</p>
+            <p>&copy; 2024 {_text(info.name)}. All rights reserved.</p>
         </div>
-    </footer>
-</body>
-</html>"""
-
-        return {
-            "html": html,
-            "css": "",  # CSS is embedded in HTML
-            "js": ""
-        }
+    </footer>"""
     
-    def _generate_template2(self, data: PortfolioData) -> Dict[str, str]:
+    def _generate_template2(self, sections: Dict[str, str], asset_base: Optional[str] = None) -> Dict[str, str]:
         """
         Generate a different template style (you can customize this)
         """
         # For now, use template1
-        return self._generate_template1(data)
+        return self._generate_template1(sections, asset_base)
     
-    def _generate_template3(self, data: PortfolioData) -> Dict[str, str]:
+    def _generate_template3(self, sections: Dict[str, str], asset_base: Optional[str] = None) -> Dict[str, str]:
         """
         Generate another template style (you can customize this)
         """
         # For now, use template1
-        return self._generate_template1(data)
\ No newline at end of file
+        return self._generate_template1(sections, asset_base)
+
+@lru_cache()
+def get_portfolio_generator() -> PortfolioGenerator:
+    """Process-wide generator, built on first use rather than at import"""
+    return PortfolioGenerator()
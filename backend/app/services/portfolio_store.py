@@ -0,0 +1,283 @@
+from app.config import settings
+from app.models import PortfolioData
+from app.services.shared_state import connect_sqlite
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Optional
+import threading
+import time
+import uuid
+
+class VersionConflictError(Exception):
+    """Raised when a portfolio changed since the version the caller based its edit on"""
+
+    def __init__(self, current_version: int):
+        super().__init__(f"Portfolio is at version {current_version}")
+        self.current_version = current_version
+
+class PortfolioVersion:
+    """
+    One stored version of a portfolio
+
+    The data is kept as the JSON it was stored with, so reads can send it
+    as is; data() validates it only when the server needs the model.
+
+    Attributes:
+        id: Portfolio id
+        version: Version number, starting at 1
+        data_json: PortfolioData as JSON
+        created_at: When this version was stored
+    """
+
+    __slots__ = ("id", "version", "data_json", "created_at")
+
+    def __init__(self, id: str, version: int, data_json: str, created_at: float):
+        self.id = id
+        self.version = version
+        self.data_json = data_json
+        self.created_at = created_at
+
+    @property
+    def etag(self) -> str:
+        return version_etag(self.id, self.version)
+
+    def data(self) -> PortfolioData:
+        return PortfolioData.model_validate_json(self.data_json)
+
+def version_etag(portfolio_id: str, version: int) -> str:
+    """Strong entity tag of a portfolio version"""
+    return f'"{portfolio_id}.{version}"'
+
+class PortfolioStore:
+    """
+    Interface for versioned portfolio storage
+
+    Every change is a new version; the last max_versions versions of each
+    portfolio are kept.
+    """
+
+    def create(self, data: PortfolioData) -> PortfolioVersion:
+        """Store a new portfolio as version 1"""
+        raise NotImplementedError
+
+    def get(self, portfolio_id: str, version: Optional[int] = None) -> Optional[PortfolioVersion]:
+        """Return a version (the latest by default), or None if unknown or pruned"""
+        raise NotImplementedError
+
+    def current_version(self, portfolio_id: str) -> Optional[int]:
+        """Latest version number without loading the data, or None if unknown"""
+        raise NotImplementedError
+
+    def add_version(
+        self,
+        portfolio_id: str,
+        data: PortfolioData,
+        expected_version: Optional[int] = None
+    ) -> Optional[PortfolioVersion]:
+        """
+        Store data as the next version of a portfolio
+
+        Args:
+            portfolio_id: Portfolio id
+            data: New content
+            expected_version: Version the change was based on; if the
+                portfolio has moved past it, nothing is stored
+
+        Returns:
+            The new version, or None if the portfolio does not exist
+
+        Raises:
+            VersionConflictError: The latest version is not expected_version
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def new_id() -> str:
+        return uuid.uuid4().hex
+
+class InMemoryPortfolioStore(PortfolioStore):
+    """
+    Keeps portfolios in process memory, dropping the least recently
+    changed beyond max_portfolios
+    """
+
+    def __init__(self, max_portfolios: int = 10000, max_versions: int = 20):
+        self.max_portfolios = max_portfolios
+        self.max_versions = max_versions
+        self._portfolios: "OrderedDict[str, List[PortfolioVersion]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, data: PortfolioData) -> PortfolioVersion:
+        stored = PortfolioVersion(self.new_id(), 1, data.model_dump_json(), time.time())
+        with self._lock:
+            self._portfolios[stored.id] = [stored]
+            while len(self._portfolios) > self.max_portfolios:
+                self._portfolios.popitem(last=False)
+        return stored
+
+    def get(self, portfolio_id: str, version: Optional[int] = None) -> Optional[PortfolioVersion]:
+        with self._lock:
+            versions = self._portfolios.get(portfolio_id)
+        if not versions:
+            return None
+        if version is None:
+            return versions[-1]
+        for stored in versions:
+            if stored.version == version:
+                return stored
+        return None
+
+    def current_version(self, portfolio_id: str) -> Optional[int]:
+        with self._lock:
+            versions = self._portfolios.get(portfolio_id)
+            return versions[-1].version if versions else None
+
+    def add_version(
+        self,
+        portfolio_id: str,
+        data: PortfolioData,
+        expected_version: Optional[int] = None
+    ) -> Optional[PortfolioVersion]:
+        data_json = data.model_dump_json()
+        with self._lock:
+            versions = self._portfolios.get(portfolio_id)
+            if versions is None:
+                return None
+            current = versions[-1].version
+            if expected_version is not None and expected_version != current:
+                raise VersionConflictError(current)
+            stored = PortfolioVersion(portfolio_id, current + 1, data_json, time.time())
+            versions.append(stored)
+            del versions[:-self.max_versions]
+            self._portfolios.move_to_end(portfolio_id)
+        return stored
+
+class SQLitePortfolioStore(PortfolioStore):
+    """
+    Keeps portfolios in a SQLite database, shared by all worker processes
+
+    The portfolios table holds the latest version number of each
+    portfolio, so conditional reads never touch the data. Versions are
+    claimed with a compare-and-set on that number, so concurrent edits
+    from different workers cannot both become the same version. Beyond
+    max_portfolios, the least recently changed portfolios are deleted.
+    """
+
+    def __init__(self, db_path: str, max_portfolios: int = 10000, max_versions: int = 20):
+        self.max_portfolios = max_portfolios
+        self.max_versions = max_versions
+        self._db = connect_sqlite(db_path)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS portfolios ("
+                "id TEXT PRIMARY KEY, version INTEGER NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS portfolio_versions ("
+                "id TEXT NOT NULL, version INTEGER NOT NULL, data TEXT NOT NULL, created_at REAL NOT NULL, "
+                "PRIMARY KEY (id, version))"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS portfolios_updated_at ON portfolios (updated_at)")
+            self._db.commit()
+
+    def create(self, data: PortfolioData) -> PortfolioVersion:
+        stored = PortfolioVersion(self.new_id(), 1, data.model_dump_json(), time.time())
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO portfolios (id, version, updated_at) VALUES (?, ?, ?)",
+                (stored.id, stored.version, stored.created_at)
+            )
+            self._insert_version(stored)
+            self._prune()
+            self._db.commit()
+        return stored
+
+    def _prune(self) -> None:
+        """Delete the least recently changed portfolios beyond max_portfolios"""
+        count = self._db.execute("SELECT COUNT(*) FROM portfolios").fetchone()[0]
+        if count <= self.max_portfolios:
+            return
+        stale = [
+            row[0] for row in self._db.execute(
+                "SELECT id FROM portfolios ORDER BY updated_at LIMIT ?",
+                (count - self.max_portfolios,)
+            )
+        ]
+        self._db.executemany("DELETE FROM portfolio_versions WHERE id = ?", [(id,) for id in stale])
+        self._db.executemany("DELETE FROM portfolios WHERE id = ?", [(id,) for id in stale])
+
+    def _insert_version(self, stored: PortfolioVersion) -> None:
+        self._db.execute(
+            "INSERT INTO portfolio_versions (id, version, data, created_at) VALUES (?, ?, ?, ?)",
+            (stored.id, stored.version, stored.data_json, stored.created_at)
+        )
+
+    def get(self, portfolio_id: str, version: Optional[int] = None) -> Optional[PortfolioVersion]:
+        with self._lock:
+            if version is None:
+                row = self._db.execute(
+                    "SELECT v.version, v.data, v.created_at FROM portfolios p "
+                    "JOIN portfolio_versions v ON v.id = p.id AND v.version = p.version "
+                    "WHERE p.id = ?",
+                    (portfolio_id,)
+                ).fetchone()
+            else:
+                row = self._db.execute(
+                    "SELECT version, data, created_at FROM portfolio_versions WHERE id = ? AND version = ?",
+                    (portfolio_id, version)
+                ).fetchone()
+        return PortfolioVersion(portfolio_id, row[0], row[1], row[2]) if row else None
+
+    def current_version(self, portfolio_id: str) -> Optional[int]:
+        with self._lock:
+            row = self._db.execute("SELECT version FROM portfolios WHERE id = ?", (portfolio_id,)).fetchone()
+        return row[0] if row else None
+
+    def add_version(
+        self,
+        portfolio_id: str,
+        data: PortfolioData,
+        expected_version: Optional[int] = None
+    ) -> Optional[PortfolioVersion]:
+        data_json = data.model_dump_json()
+        while True:
+            base = expected_version if expected_version is not None else self.current_version(portfolio_id)
+            if base is None:
+                return None
+            stored = PortfolioVersion(portfolio_id, base + 1, data_json, time.time())
+            with self._lock:
+                claimed = self._db.execute(
+                    "UPDATE portfolios SET version = ?, updated_at = ? WHERE id = ? AND version = ?",
+                    (stored.version, stored.created_at, portfolio_id, base)
+                ).rowcount
+                if claimed:
+                    self._insert_version(stored)
+                    self._db.execute(
+                        "DELETE FROM portfolio_versions WHERE id = ? AND version <= ?",
+                        (portfolio_id, stored.version - self.max_versions)
+                    )
+                self._db.commit()
+            if claimed:
+                return stored
+
+            current = self.current_version(portfolio_id)
+            if current is None:
+                return None
+            if expected_version is not None:
+                raise VersionConflictError(current)
+            # Another worker stored a version in between; build on that one
+
+@lru_cache()
+def get_portfolio_store() -> PortfolioStore:
+    """Process-wide portfolio store built from Settings"""
+    if settings.PORTFOLIO_STORE == "memory":
+        return InMemoryPortfolioStore(
+            max_portfolios=settings.PORTFOLIO_MAX_STORED,
+            max_versions=settings.PORTFOLIO_MAX_VERSIONS
+        )
+    return SQLitePortfolioStore(
+        settings.PORTFOLIO_STORE_PATH,
+        max_portfolios=settings.PORTFOLIO_MAX_STORED,
+        max_versions=settings.PORTFOLIO_MAX_VERSIONS
+    )
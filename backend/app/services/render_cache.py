@@ -0,0 +1,227 @@
+from app.config import settings
+from app.models import PortfolioData
+from app.services.portfolio_generator import RENDERER_VERSION
+from app.services.shared_state import get_shared_state
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Optional
+import gzip
+import hashlib
+import json
+import threading
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Content codings a cached body can be sent in
+CODINGS = ("identity", "gzip", "br") if brotli is not None else ("identity", "gzip")
+
+class RenderedPortfolio:
+    """
+    One cached render with its response bodies
+
+    Each body is compressed the first time a client asks for it in a
+    given coding, and the result is kept with the entry; most clients only
+    ever take one representation in one coding.
+
+    Attributes:
+        key: Cache key of the render, from RenderCache.make_key
+        files: Generated files as returned by PortfolioGenerator.generate
+    """
+
+    __slots__ = ("key", "files", "_bodies")
+
+    def __init__(self, key: str, files: Dict[str, str], bodies: Dict[str, bytes]):
+        self.key = key
+        self.files = files
+        self._bodies = {representation: {"identity": body} for representation, body in bodies.items()}
+
+    def etag(self, representation: str, coding: str = "identity") -> str:
+        """Strong entity tag of one body (see representation_etag)"""
+        return representation_etag(self.key, representation, coding)
+
+    def body(self, representation: str, coding: str) -> bytes:
+        """
+        Response body for a representation ("json", "html") in a content
+        coding from CODINGS
+        """
+        encoded = self._bodies[representation]
+        body = encoded.get(coding)
+        if body is None:
+            # Two requests racing here both compress; either result is valid
+            body = _encode(encoded["identity"], coding)
+            encoded[coding] = body
+        return body
+
+def representation_etag(key: str, representation: str, coding: str = "identity") -> str:
+    """
+    Strong entity tag of one body of a render
+
+    The JSON and HTML bodies, and each content coding of them, differ byte
+    for byte, so each gets its own tag: "<key>-html" or "<key>-html-br".
+    """
+    if coding == "identity":
+        return f'"{key}-{representation}"'
+    return f'"{key}-{representation}-{coding}"'
+
+def _store_key(key: str) -> str:
+    # Entries written by an older renderer live under another namespace
+    return f"render:{RENDERER_VERSION}:{key}"
+
+def _encode(body: bytes, coding: str) -> bytes:
+    if coding == "gzip":
+        return gzip.compress(body, compresslevel=9, mtime=0)
+    if coding == "br":
+        return brotli.compress(body, quality=9)
+    return body
+
+def negotiate_encoding(accept_encoding: str, available) -> str:
+    """
+    Pick the content coding to send for an Accept-Encoding header
+
+    Prefers br over gzip and ignores codings the client refuses with q=0.
+
+    Returns:
+        "br", "gzip" or "identity"
+    """
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(coding.strip())
+    for coding in ("br", "gzip"):
+        if coding in available and (coding in accepted or "*" in accepted):
+            return coding
+    return "identity"
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header matches etag (weak comparison, per RFC 9110)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+class RenderCache:
+    """
+    Memory LRU of rendered portfolios keyed by content
+
+    The key is a hash of the canonical JSON of the PortfolioData, the
+    template id and the render version (renderer code and template files),
+    so the same data always maps to the same entry and ETags, and a deploy
+    that changes either stops serving the old renders.
+    Bodies are compressed on demand, at most once per coding.
+
+    With a shared store, entries are also written there (uncompressed) so
+    any worker process can answer for an ETag another worker issued; a
+    local miss found in the store is kept locally from then on.
+    """
+
+    def __init__(self, max_entries: int = 512, store=None, store_ttl_seconds: Optional[float] = None):
+        self.max_entries = max_entries
+        self.store = store
+        self.store_ttl_seconds = store_ttl_seconds
+        self._entries: "OrderedDict[str, RenderedPortfolio]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(data: PortfolioData, template: str, render_version: str) -> str:
+        """
+        Build the cache key for a render
+
+        Args:
+            data: Portfolio data
+            template: Template id
+            render_version: PortfolioGenerator.render_version of the template
+
+        Returns:
+            Hex digest identifying the render
+        """
+        canonical = json.dumps(
+            data.model_dump(mode="json"),
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False
+        )
+        digest = hashlib.sha256(canonical.encode())
+        digest.update(b"\0" + template.encode())
+        digest.update(b"\0" + render_version.encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def etag_for(key: str, representation: str, coding: str = "identity") -> str:
+        return representation_etag(key, representation, coding)
+
+    def get(self, key: str) -> Optional[RenderedPortfolio]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        if self.store is None:
+            return None
+        stored = self.store.get(_store_key(key))
+        if stored is None:
+            return None
+        stored = json.loads(stored)
+        return self._put(key, stored["files"], stored["json"].encode())
+
+    def get_by_etag(self, etag: str) -> Optional[RenderedPortfolio]:
+        """Look up an entry by any of its ETags (with or without quotes)"""
+        return self.get(etag.strip().removeprefix("W/").strip('"').split("-", 1)[0])
+
+    def set(self, key: str, files: Dict[str, str], json_body: bytes) -> RenderedPortfolio:
+        """
+        Store a render and pre-encode its JSON and HTML bodies
+
+        Args:
+            key: Key from make_key
+            files: Generated files
+            json_body: Serialized /generate response for these files
+
+        Returns:
+            The stored entry
+        """
+        if self.store is not None:
+            self.store.set(
+                _store_key(key),
+                json.dumps({"files": files, "json": json_body.decode()}).encode(),
+                self.store_ttl_seconds
+            )
+        return self._put(key, files, json_body)
+
+    def _put(self, key: str, files: Dict[str, str], json_body: bytes) -> RenderedPortfolio:
+        entry = RenderedPortfolio(
+            key=key,
+            files=files,
+            bodies={"json": json_body, "html": files["html"].encode()}
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+@lru_cache()
+def get_render_cache() -> RenderCache:
+    """Process-wide render cache, shared across workers if SHARED_STATE_PATH is set"""
+    return RenderCache(
+        max_entries=settings.RENDER_CACHE_SIZE,
+        store=get_shared_state(),
+        store_ttl_seconds=settings.SHARED_RENDER_TTL_SECONDS
+    )
@@ -0,0 +1,295 @@
+from app.config import settings
+from app.services.metrics import metrics
+from collections import deque
+from functools import lru_cache
+from typing import Awaitable, Callable, Optional, TypeVar
+import asyncio
+import random
+import threading
+import time
+
+T = TypeVar("T")
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the LLM while the circuit breaker is open"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"LLM upstream is unavailable. Retry in {retry_after:.0f}s.")
+        self.retry_after = retry_after
+
+class LLMTimeoutError(asyncio.TimeoutError):
+    """Raised when an LLM call runs past its deadline, retries included"""
+
+class LLMNotConfiguredError(Exception):
+    """Raised for LLM calls when no OPENAI_API_KEY is configured"""
+
+# Errors that callers should surface as-is (503 / 504) instead of wrapping
+LLM_UNAVAILABLE_ERRORS = (CircuitOpenError, LLMTimeoutError, LLMNotConfiguredError)
+
+def _is_timeout(error: BaseException) -> bool:
+    # The SDK is imported on first use (see get_async_client); by the time
+    # an upstream error exists, it has been
+    import openai
+    return isinstance(error, (asyncio.TimeoutError, openai.APITimeoutError))
+
+def is_retryable(error: BaseException) -> bool:
+    """True for failures worth retrying: timeouts, connection errors, 408/409/429/5xx"""
+    import openai
+    if isinstance(error, (asyncio.TimeoutError, openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in (408, 409, 429) or error.status_code >= 500
+    return False
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    """Seconds from a Retry-After header on a rate-limit or 503 response, if any"""
+    response = getattr(error, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker
+
+    After failure_threshold retryable failures in a row the circuit opens
+    and calls fail immediately for reset_seconds. Then a single probe call
+    is let through (half-open): success closes the circuit, failure opens
+    it again, and a call that says nothing about the upstream's health
+    (cancelled, or refused as a bad request) frees the probe slot for the
+    next caller.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_seconds:
+                return "half_open"
+            return "open"
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may go ahead now"""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            remaining = self.reset_seconds - (time.monotonic() - self._opened_at)
+            if remaining > 0 or self._probing:
+                metrics.inc("portfogen_llm_resilience_total", event="rejected")
+                raise CircuitOpenError(max(remaining, 1.0))
+            self._probing = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_neutral(self) -> None:
+        """End a call without counting it either way"""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._probing:
+                    metrics.inc("portfogen_llm_resilience_total", event="breaker_open")
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+class LatencyTracker:
+    """Rolling window of successful call latencies"""
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, percentile: float) -> float:
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(len(ordered) * percentile / 100))
+        return ordered[index]
+
+class ResiliencePolicy:
+    """
+    Retries, deadlines, hedging and circuit breaking around one LLM call
+
+    Args:
+        max_retries: Extra attempts after the first, for retryable errors
+        base_delay: Backoff base in seconds; attempt n waits a random time
+            up to base_delay * 2**n ("full jitter"), capped at max_delay
+        max_delay: Longest single backoff
+        attempt_timeout: Seconds one attempt may take
+        deadline: Seconds the call may take in total, backoff included
+        hedge_percentile: When set (e.g. 95), an attempt still running after
+            that percentile of recent latencies gets a second identical
+            request, and whichever finishes first wins
+        hedge_min_samples: Latencies needed before hedging starts
+        breaker: Circuit breaker shared by every call
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        attempt_timeout: float = 60.0,
+        deadline: float = 120.0,
+        hedge_percentile: Optional[float] = None,
+        hedge_min_samples: int = 20,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.attempt_timeout = attempt_timeout
+        self.deadline = deadline
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.breaker = breaker or CircuitBreaker()
+        self.latencies = LatencyTracker()
+
+    async def call(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        hedge: bool = True,
+        deadline: Optional[float] = None
+    ) -> T:
+        """
+        Run fn under the policy
+
+        Args:
+            fn: Zero-argument coroutine function making one upstream request
+            hedge: Allow hedged requests (off for streams)
+            deadline: Seconds for this call, instead of the policy deadline
+
+        Returns:
+            fn's result
+
+        Raises:
+            CircuitOpenError: The breaker is open
+            LLMTimeoutError: The last attempt timed out and no time or
+                retries are left
+            The last error once retries or the deadline run out
+        """
+        give_up_at = time.monotonic() + (self.deadline if deadline is None else deadline)
+        attempt = 0
+        while True:
+            self.breaker.before_call()
+            remaining = give_up_at - time.monotonic()
+            try:
+                result = await self._attempt(fn, min(self.attempt_timeout, remaining), hedge)
+            except Exception as e:
+                if not is_retryable(e):
+                    # A 4xx is the request's fault, not the upstream's
+                    self.breaker.record_neutral()
+                    raise
+                timed_out = _is_timeout(e)
+                # Running out of a caller's short deadline says nothing about
+                # the upstream's health, so only full-length timeouts count
+                if timed_out and remaining < self.attempt_timeout:
+                    self.breaker.record_neutral()
+                else:
+                    self.breaker.record_failure()
+                if timed_out:
+                    metrics.inc("portfogen_llm_resilience_total", event="timeout")
+
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+                delay = max(delay, _retry_after(e) or 0)
+                attempt += 1
+                if attempt > self.max_retries or time.monotonic() + delay >= give_up_at:
+                    if timed_out:
+                        raise LLMTimeoutError(
+                            f"LLM call timed out after {attempt} attempt(s)"
+                        ) from e
+                    raise
+                metrics.inc("portfogen_llm_resilience_total", event="retry")
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                # Cancelled (client gone, stream aborted, lost hedge): a probe
+                # must not keep the circuit open for everyone else
+                self.breaker.record_neutral()
+                raise
+
+            self.breaker.record_success()
+            return result
+
+    async def _attempt(self, fn: Callable[[], Awaitable[T]], timeout: float, hedge: bool) -> T:
+        if timeout <= 0:
+            raise asyncio.TimeoutError()
+
+        start = time.monotonic()
+        hedge_after = None
+        if hedge and self.hedge_percentile and len(self.latencies) >= self.hedge_min_samples:
+            hedge_after = self.latencies.percentile(self.hedge_percentile)
+
+        if hedge_after is None or hedge_after >= timeout:
+            result = await asyncio.wait_for(fn(), timeout)
+            self.latencies.record(time.monotonic() - start)
+            return result
+
+        primary = asyncio.ensure_future(fn())
+        pending = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=hedge_after)
+            if not done:
+                metrics.inc("portfogen_llm_resilience_total", event="hedge")
+                pending.add(asyncio.ensure_future(fn()))
+
+            error: Optional[BaseException] = None
+            while True:
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            metrics.inc("portfogen_llm_resilience_total", event="hedge_won")
+                        self.latencies.record(time.monotonic() - start)
+                        return task.result()
+                    error = task.exception()
+                if not pending:
+                    raise error
+                remaining = timeout - (time.monotonic() - start)
+                if remaining <= 0:
+                    raise asyncio.TimeoutError()
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    raise asyncio.TimeoutError()
+        finally:
+            for task in pending:
+                task.cancel()
+
+@lru_cache()
+def get_resilience_policy() -> ResiliencePolicy:
+    """Process-wide policy, so every LLM call shares one circuit breaker"""
+    return ResiliencePolicy(
+        max_retries=settings.OPENAI_MAX_RETRIES,
+        base_delay=settings.OPENAI_RETRY_BASE_DELAY,
+        max_delay=settings.OPENAI_RETRY_MAX_DELAY,
+        attempt_timeout=settings.OPENAI_TIMEOUT,
+        deadline=settings.OPENAI_DEADLINE_SECONDS,
+        hedge_percentile=settings.OPENAI_HEDGE_PERCENTILE,
+        hedge_min_samples=settings.OPENAI_HEDGE_MIN_SAMPLES,
+        breaker=CircuitBreaker(
+            failure_threshold=settings.OPENAI_BREAKER_FAILURES,
+            reset_seconds=settings.OPENAI_BREAKER_RESET_SECONDS
+        )
+    )
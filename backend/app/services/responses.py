@@ -0,0 +1,77 @@
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+from typing import Any, Dict, Optional
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the standard library encoder is the fallback
+    orjson = None
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode plain JSON data (dicts, lists, strings, numbers) to UTF-8 bytes
+
+    Uses orjson when it is installed, which is several times faster on
+    large strings such as rendered HTML.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+def envelope_body(key: str, value_json: bytes, extra: Optional[Dict[str, Any]] = None) -> bytes:
+    """
+    Encode {"success": true, **extra, "<key>": <value>} around a value
+    that is already JSON, without decoding it
+
+    Args:
+        key: Envelope key ("data", "job", ...)
+        value_json: Encoded JSON value
+        extra: Further top-level fields, encoded with dumps()
+    """
+    fields = dumps(extra)[1:-1] + b"," if extra else b""
+    return b'{"success":true,' + fields + b'"' + key.encode() + b'":' + value_json + b"}"
+
+def success_body(key: str, model: BaseModel, extra: Optional[Dict[str, Any]] = None) -> bytes:
+    """
+    Encode {"success": true, "<key>": <model>} in one pass
+
+    The model is serialized by pydantic-core straight to JSON, instead of
+    model_dump() to a dict that FastAPI's jsonable_encoder then walks and
+    JSONResponse encodes a second time.
+    """
+    return envelope_body(key, model.model_dump_json().encode(), extra)
+
+def success_response(
+    model: BaseModel,
+    key: str = "data",
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None,
+    extra: Optional[Dict[str, Any]] = None
+) -> Response:
+    """
+    JSON response with the {"success": true, "data": ...} envelope
+
+    Args:
+        model: Model to return under key
+        key: Envelope key ("data", "job", ...)
+        status_code: HTTP status
+        headers: Extra response headers (headers set on an injected
+            Response are not applied when a route returns its own)
+        extra: Further top-level fields (e.g. a stored portfolio's id)
+
+    Returns:
+        Response with the pre-encoded body
+    """
+    return Response(
+        content=success_body(key, model, extra),
+        status_code=status_code,
+        media_type="application/json",
+        headers=headers
+    )
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoding with dumps(); the app's default response class"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
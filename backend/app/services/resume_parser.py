@@ -1,84 +1,173 @@
-import PyPDF2
-import docx
-from typing import Optional
+from contextlib import contextmanager
+from typing import IO, Iterator, Optional, Union
 import io
 
+# Text boxes are stored twice (modern drawing + VML fallback); only the
+# modern copy is read.
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+# PyPDF2 and python-docx are imported by the functions that use them: they
+# are slow to import and only needed in parse pool workers
+
+# File content, or the path of a file holding it
+ResumeSource = Union[bytes, str]
+
+@contextmanager
+def open_source(source: ResumeSource) -> Iterator[IO[bytes]]:
+    """
+    Open resume content as a seekable binary file
+
+    Bytes are wrapped in a BytesIO; a path is opened directly, so large
+    uploads spooled to disk are read in place rather than loaded whole.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        yield io.BytesIO(source)
+        return
+    with open(source, "rb") as handle:
+        yield handle
+
 class ResumeParser:
     """
     Extracts text content from resume files (PDF and DOCX)
     """
-    
+
     @staticmethod
-    def parse_pdf(file_bytes: bytes) -> str:
+    def iter_pages(file_bytes: ResumeSource, max_pages: Optional[int] = None) -> Iterator[str]:
+        """
+        Lazily yield the text of each PDF page
+
+        Args:
+            file_bytes: PDF file content as bytes, or its path
+            max_pages: Only read the first max_pages pages (None for all)
+
+        Yields:
+            Text of one page at a time
+        """
+        import PyPDF2
+
+        with open_source(file_bytes) as stream:
+            pdf_reader = PyPDF2.PdfReader(stream)
+
+            page_count = len(pdf_reader.pages)
+            if max_pages is not None:
+                page_count = min(page_count, max_pages)
+
+            for page_num in range(page_count):
+                yield pdf_reader.pages[page_num].extract_text()
+
+    @staticmethod
+    def iter_blocks(file_bytes: ResumeSource) -> Iterator[str]:
+        """
+        Lazily yield text blocks of a DOCX file
+
+        Headers come first, then the body in document order (paragraphs,
+        table rows and text boxes), then footers.
+
+        Args:
+            file_bytes: DOCX file content as bytes, or its path
+
+        Yields:
+            Text of one paragraph or table row at a time
+        """
+        import docx
+
+        with open_source(file_bytes) as stream:
+            doc = docx.Document(stream)
+
+        # Linked sections share one header/footer part; read each part once
+        headers, footers = [], []
+        for section in doc.sections:
+            for part, seen in ((section.header, headers), (section.footer, footers)):
+                if not part.is_linked_to_previous and part._element not in seen:
+                    seen.append(part._element)
+
+        for element in headers:
+            yield from ResumeParser._iter_container(element, doc)
+        yield from ResumeParser._iter_container(doc.element.body, doc)
+        for element in footers:
+            yield from ResumeParser._iter_container(element, doc)
+
+    @staticmethod
+    def _iter_container(element, parent) -> Iterator[str]:
+        """Yield text of block-level children (w:p, w:tbl) in document order"""
+        from docx.oxml.ns import qn
+        from docx.table import Table
+        from docx.text.paragraph import Paragraph
+
+        for child in element.iterchildren():
+            if child.tag == qn("w:p"):
+                yield Paragraph(child, parent).text
+                yield from ResumeParser._iter_text_boxes(child)
+            elif child.tag == qn("w:tbl"):
+                for row in Table(child, parent).rows:
+                    cells = []
+                    for cell in row.cells:
+                        # Merged cells are repeated once per grid column
+                        if not cells or cell._tc is not cells[-1]._tc:
+                            cells.append(cell)
+                    yield " | ".join(cell.text for cell in cells)
+
+    @staticmethod
+    def _iter_text_boxes(paragraph_element) -> Iterator[str]:
+        from docx.oxml.ns import qn
+
+        for text_box in paragraph_element.iter(qn("w:txbxContent")):
+            if any(ancestor.tag == MC_FALLBACK for ancestor in text_box.iterancestors()):
+                continue
+            for p in text_box.iter(qn("w:p")):
+                yield p.text
+
+    @staticmethod
+    def parse_pdf(file_bytes: ResumeSource, max_pages: Optional[int] = None) -> str:
         """
         Extract text from PDF file
-        
+
         Args:
-            file_bytes: PDF file content as bytes
-            
+            file_bytes: PDF file content as bytes, or its path
+            max_pages: Only read the first max_pages pages (None for all)
+
         Returns:
             Extracted text as string
         """
         try:
-            # Create a file-like object from bytes
-            pdf_file = io.BytesIO(file_bytes)
-            
-            # Create PDF reader
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            
-            # Extract text from all pages
-            text = ""
-            for page_num in range(len(pdf_reader.pages)):
-                page = pdf_reader.pages[page_num]
-                text += page.extract_text()
-            
-            return text.strip()
-        
+            return "\n".join(ResumeParser.iter_pages(file_bytes, max_pages)).strip()
+
         except Exception as e:
             raise Exception(f"Error parsing PDF: {str(e)}")
-    
+
     @staticmethod
-    def parse_docx(file_bytes: bytes) -> str:
+    def parse_docx(file_bytes: ResumeSource) -> str:
         """
         Extract text from DOCX file
-        
+
         Args:
-            file_bytes: DOCX file content as bytes
-            
+            file_bytes: DOCX file content as bytes, or its path
+
         Returns:
             Extracted text as string
         """
         try:
-            # Create a file-like object from bytes
-            docx_file = io.BytesIO(file_bytes)
-            
-            # Open document
-            doc = docx.Document(docx_file)
-            
-            # Extract text from all paragraphs
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            
-            return text.strip()
-        
+            return "\n".join(ResumeParser.iter_blocks(file_bytes)).strip()
+
         except Exception as e:
             raise Exception(f"Error parsing DOCX: {str(e)}")
-    
+
     @staticmethod
-    def parse_resume(file_bytes: bytes, file_type: str) -> str:
+    def parse_resume(file_bytes: ResumeSource, file_type: str, max_pages: Optional[int] = None) -> str:
         """
         Main method - routes to appropriate parser based on file type
-        
+
         Args:
-            file_bytes: File content as bytes
+            file_bytes: File content as bytes, or the path of a file
+                holding it (opened in place)
             file_type: File extension (pdf, docx, doc)
-            
+            max_pages: Page cap for paginated formats (None for all)
+
         Returns:
             Extracted text as string
         """
         if file_type.lower() == "pdf":
-            return ResumeParser.parse_pdf(file_bytes)
+            return ResumeParser.parse_pdf(file_bytes, max_pages)
         elif file_type.lower() in ["docx", "doc"]:
             return ResumeParser.parse_docx(file_bytes)
         else:
@@ -0,0 +1,437 @@
+from typing import Any, Dict, List, Optional, Tuple
+import re
+
+# Bump whenever the rules change so cached extractions are invalidated
+RULE_EXTRACTOR_VERSION = "1"
+
+MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+DATE = rf"(?:{MONTH}\s+\d{{4}}|\d{{1,2}}/\d{{4}}|\d{{4}})"
+DATE_RANGE = re.compile(
+    rf"(?P<start>{DATE})\s*(?:-|–|—|to|until)\s*(?P<end>{DATE}|present|current|now|today)",
+    re.I
+)
+SINGLE_DATE = re.compile(rf"(?P<start>{MONTH}\s+\d{{4}}|\b(?:19|20)\d{{2}}\b)", re.I)
+
+EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+PHONE = re.compile(r"(?<![\w/])(\+?\(?\d[\d\s().-]{7,}\d)(?![\w/])")
+LINKEDIN = re.compile(r"(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/in/[\w\-%.]+/?", re.I)
+GITHUB = re.compile(r"(?:https?://)?(?:www\.)?github\.com/[\w\-.]+(?:/[\w\-.]+)?/?", re.I)
+URL = re.compile(r"(?:https?://)?(?:www\.)?[a-z0-9-]+(?:\.[a-z0-9-]+)*\.[a-z]{2,}(?:/[^\s|,]*)?", re.I)
+GPA = re.compile(r"\bGPA[:\s]*(\d(?:\.\d+)?(?:\s*/\s*\d(?:\.\d+)?)?)", re.I)
+LOCATION = re.compile(r"^[A-Z][A-Za-z .'-]+,\s*[A-Z][A-Za-z .'-]+$")
+
+BULLET = re.compile(r"^\s*(?:[•▪●◦‣∙·*-]|\d+[.)])\s+")
+LABEL = re.compile(r"^[A-Za-z &/]{2,30}:\s*")
+
+DEGREE = re.compile(
+    r"\b(?:bachelor|master|doctor|ph\.?\s?d|mba|associate|diploma|b\.?\s?sc?|m\.?\s?sc?|"
+    r"b\.?\s?a|m\.?\s?a|b\.?\s?eng|m\.?\s?eng|b\.?\s?tech|m\.?\s?tech)\b\.?",
+    re.I
+)
+INSTITUTION = re.compile(r"\b(?:university|college|institute|school|academy|polytechnic)\b", re.I)
+
+# Heading text (lowercased, trailing colon removed) -> PortfolioData field
+HEADINGS = {
+    "summary": "summary", "profile": "summary", "professional summary": "summary",
+    "about": "summary", "about me": "summary", "objective": "summary",
+    "experience": "experience", "work experience": "experience",
+    "professional experience": "experience", "employment": "experience",
+    "employment history": "experience", "work history": "experience",
+    "education": "education", "academic background": "education",
+    "skills": "skills", "technical skills": "skills", "core skills": "skills",
+    "technologies": "skills", "tools": "skills",
+    "projects": "projects", "personal projects": "projects", "selected projects": "projects",
+    "certifications": "certifications", "certificates": "certifications",
+    "licenses & certifications": "certifications", "certification": "certifications",
+}
+# Headings that end a section without being extracted
+OTHER_HEADINGS = {
+    "publications", "awards", "honors", "honours", "languages", "interests",
+    "references", "volunteering", "volunteer experience", "activities", "hobbies",
+}
+
+# Share of the confidence score carried by each part of the result
+WEIGHTS = {
+    "personal_info": 0.2,
+    "experience": 0.3,
+    "education": 0.15,
+    "skills": 0.15,
+    "projects": 0.1,
+    "summary": 0.05,
+    "certifications": 0.05,
+}
+
+class RuleExtraction:
+    """
+    Result of rule-based extraction
+
+    Attributes:
+        data: Portfolio dict (PortfolioData shape) with everything found
+        confidence: 0..1, the weighted share of fields extracted cleanly,
+            scaled by the share of lines that were accounted for
+        missing: Fields the rules could not extract with confidence
+    """
+
+    __slots__ = ("data", "confidence", "missing")
+
+    def __init__(self, data: Dict[str, Any], confidence: float, missing: List[str]):
+        self.data = data
+        self.confidence = confidence
+        self.missing = missing
+
+class RuleBasedExtractor:
+    """
+    Deterministic extractor for resumes with conventional layouts
+
+    Splits the text on standard section headings and pulls contact details,
+    date ranges and entries out with compiled regexes. Each field is scored;
+    fields present in the text but not cleanly parsed are reported as
+    missing so the caller can ask the LLM for just those.
+    """
+
+    def extract(self, text: str) -> RuleExtraction:
+        """
+        Extract portfolio data from resume text
+
+        Args:
+            text: Text from ResumeParser
+
+        Returns:
+            RuleExtraction with data, confidence and missing fields
+        """
+        lines = [line.strip() for line in text.splitlines()]
+        lines = [line for line in lines if line]
+        header, sections = self._split_sections(lines)
+
+        scores: Dict[str, float] = {}
+        data: Dict[str, Any] = {}
+
+        data["personal_info"], scores["personal_info"], header_used = self._personal_info(header, text)
+        data["summary"] = " ".join(sections["summary"]) or None
+        data["experience"], scores["experience"] = self._experience(sections["experience"])
+        data["education"], scores["education"] = self._education(sections["education"])
+        data["skills"] = self._skills(sections["skills"])
+        data["projects"], scores["projects"] = self._projects(sections["projects"])
+        data["certifications"] = [BULLET.sub("", line) for line in sections["certifications"]]
+
+        scores["summary"] = 1.0
+        scores["skills"] = 1.0 if data["skills"] or not sections["skills"] else 0.0
+        scores["certifications"] = 1.0
+        # A resume without an experience section is unusual enough to check
+        if "experience" not in sections.found:
+            scores["experience"] = 0.0
+
+        # Text outside any recognized section (other than contact lines) is
+        # content the rules did not understand
+        unexplained = len(header) - header_used
+        coverage = 1 - unexplained / len(lines) if lines else 0.0
+
+        confidence = coverage * sum(WEIGHTS[field] * scores[field] for field in WEIGHTS)
+        missing = [field for field in WEIGHTS if scores[field] < 0.75]
+        if coverage < 0.9:
+            missing = list(WEIGHTS)
+        return RuleExtraction(data, round(confidence, 3), missing)
+
+    @staticmethod
+    def _split_sections(lines: List[str]) -> Tuple[List[str], "_Sections"]:
+        """Split lines into the header block and lines per recognized section"""
+        sections = _Sections()
+        header: List[str] = []
+        current: Optional[str] = None
+        for line in lines:
+            heading = line.rstrip(":").strip().lower()
+            if len(heading) <= 40 and (heading in HEADINGS or heading in OTHER_HEADINGS):
+                current = HEADINGS.get(heading, "other")
+                sections.found.add(current)
+                continue
+            if current is None:
+                header.append(line)
+            else:
+                sections[current].append(line)
+        return header, sections
+
+    @staticmethod
+    def _personal_info(header: List[str], text: str) -> Tuple[Dict[str, Any], float, int]:
+        """Contact details from the header block, its score and the header lines used"""
+        info: Dict[str, Any] = {}
+        email = EMAIL.search(text)
+        linkedin = LINKEDIN.search(text)
+        github = GITHUB.search(text)
+        info["email"] = email.group(0) if email else None
+        info["linkedin"] = linkedin.group(0) if linkedin else None
+        info["github"] = github.group(0) if github else None
+
+        info["phone"] = None
+        info["website"] = None
+        info["location"] = None
+        name = None
+        used = 0
+        for line in header[:8]:
+            parts = [part for part in re.split(r"\s*[|•·]\s*", line) if part]
+            recognized = 0
+            for part in parts:
+                recognized += 1
+                if info["phone"] is None and not DATE_RANGE.search(part):
+                    phone = PHONE.search(part)
+                    if phone and sum(ch.isdigit() for ch in phone.group(1)) >= 8:
+                        info["phone"] = phone.group(1).strip()
+                        continue
+                if EMAIL.search(part) or LINKEDIN.search(part) or GITHUB.search(part):
+                    continue
+                if info["website"] is None and URL.fullmatch(part):
+                    info["website"] = part
+                    continue
+                if info["location"] is None and LOCATION.match(part) and name is not None:
+                    info["location"] = part
+                    continue
+                words = part.split()
+                if (
+                    name is None
+                    and 2 <= len(words) <= 4
+                    and all(word[:1].isupper() for word in words)
+                    and not any(ch.isdigit() for ch in part)
+                ):
+                    name = part.title() if part.isupper() else part
+                    continue
+                recognized -= 1
+            if parts and recognized == len(parts):
+                used += 1
+
+        info["name"] = name
+        score = 0.0
+        if name:
+            score += 0.6
+        if info["email"] or info["phone"]:
+            score += 0.4
+        return info, score, used
+
+    @staticmethod
+    def _entries(lines: List[str]) -> List[List[str]]:
+        """Group section lines into entries, each starting near a date range"""
+        date_lines = [i for i, line in enumerate(lines) if DATE_RANGE.search(line)]
+        if not date_lines:
+            return []
+
+        starts = []
+        for index in date_lines:
+            # "Company" / "Title | Jan 2020 - Present": a non-bullet line with
+            # no date right above the date line belongs to the same entry
+            start = index
+            if index > 0 and not BULLET.match(lines[index - 1]) and (index - 1) not in date_lines:
+                if not starts or index - 1 > starts[-1]:
+                    start = index - 1
+            starts.append(start)
+        starts[0] = 0 if starts[0] <= 1 else starts[0]
+        bounds = starts + [len(lines)]
+        return [lines[a:b] for a, b in zip(bounds, bounds[1:])]
+
+    @staticmethod
+    def _split_title(text: str) -> Tuple[Optional[str], Optional[str]]:
+        """Split "Position at Company" / "Position, Company" / "Position | Company" """
+        text = text.strip(" ,|-–—")
+        match = re.match(r"(?P<a>.+?)\s+(?:at|@)\s+(?P<b>.+)$", text)
+        if match:
+            return match.group("a").strip(), match.group("b").strip(" ,|")
+        parts = [part.strip() for part in re.split(r"\s*(?:\||,|\s[-–—]\s)\s*", text) if part.strip()]
+        if len(parts) >= 2:
+            return parts[0], parts[1]
+        return (parts[0], None) if parts else (None, None)
+
+    def _experience(self, lines: List[str]) -> Tuple[List[Dict[str, Any]], float]:
+        if not lines:
+            return [], 1.0
+
+        entries = []
+        clean = 0
+        for entry in self._entries(lines):
+            date_index = next(i for i, line in enumerate(entry) if DATE_RANGE.search(line))
+            dates = DATE_RANGE.search(entry[date_index])
+            title = DATE_RANGE.sub("", entry[date_index]).strip(" ,|-–—()")
+            heading_lines = [line for line in entry[:date_index] if not BULLET.match(line)]
+            if title:
+                heading_lines.append(title)
+
+            position, company = None, None
+            if len(heading_lines) == 1:
+                position, company = self._split_title(heading_lines[0])
+            elif len(heading_lines) >= 2:
+                position, company = self._split_title(heading_lines[-1])
+                if company is None:
+                    # Two lines: company above, position on the date line (or reverse)
+                    company = heading_lines[-2]
+
+            responsibilities = []
+            description = []
+            for line in entry[date_index + 1:]:
+                if BULLET.match(line):
+                    responsibilities.append(BULLET.sub("", line))
+                elif responsibilities and line[:1].islower():
+                    responsibilities[-1] += " " + line
+                else:
+                    description.append(line)
+
+            if position and company:
+                clean += 1
+            entries.append({
+                "company": company or "",
+                "position": position or "",
+                "start_date": dates.group("start"),
+                "end_date": dates.group("end"),
+                "description": " ".join(description) or None,
+                "responsibilities": responsibilities,
+            })
+
+        if not entries:
+            return [], 0.0
+        return entries, clean / len(entries)
+
+    def _education(self, lines: List[str]) -> Tuple[List[Dict[str, Any]], float]:
+        if not lines:
+            return [], 1.0
+
+        # Entries start at each line naming a degree or an institution that
+        # does not directly follow the previous entry's start
+        starts: List[int] = []
+        for i, line in enumerate(lines):
+            if BULLET.match(line):
+                continue
+            if DEGREE.search(line) or INSTITUTION.search(line):
+                if starts and i - starts[-1] == 1 and not (
+                    DEGREE.search(lines[starts[-1]]) and DEGREE.search(line)
+                ):
+                    continue
+                starts.append(i)
+        if not starts:
+            return [], 0.0
+
+        bounds = starts + [len(lines)]
+        entries = []
+        clean = 0
+        for a, b in zip(bounds, bounds[1:]):
+            block = lines[a:b]
+            joined = " | ".join(block)
+            institution = next((line for line in block if INSTITUTION.search(line)), None)
+            degree_line = next((line for line in block if DEGREE.search(line)), None)
+
+            dates = DATE_RANGE.search(joined)
+            start_date = dates.group("start") if dates else None
+            end_date = dates.group("end") if dates else None
+            if not dates:
+                single = SINGLE_DATE.findall(joined)
+                end_date = single[-1] if single else None
+            gpa = GPA.search(joined)
+
+            degree, field = None, None
+            if degree_line:
+                text = DATE_RANGE.sub("", degree_line)
+                text = GPA.sub("", text)
+                if institution == degree_line:
+                    # Degree and institution on one line
+                    text = re.split(r"\s*(?:,|\||\s[-–—]\s)\s*", text)[0]
+                text = text.strip(" ,|-–—()")
+                match = re.match(r"(?P<degree>.+)\s+in\s+(?P<field>[A-Z].+)$", text)
+                if match:
+                    degree, field = match.group("degree"), match.group("field")
+                elif re.match(r"(?i)(bachelor|master|doctor)", text):
+                    degree = text
+                else:
+                    abbreviation = DEGREE.match(text)
+                    if abbreviation and abbreviation.end() < len(text):
+                        degree = abbreviation.group(0).strip()
+                        field = text[abbreviation.end():].strip(" ,") or None
+                    else:
+                        degree = text
+            if institution:
+                institution = DATE_RANGE.sub("", institution)
+                if degree_line == institution or DEGREE.search(institution):
+                    parts = re.split(r"\s*(?:,|\||\s[-–—]\s)\s*", institution)
+                    institution = next((p for p in parts if INSTITUTION.search(p)), parts[-1])
+                institution = institution.strip(" ,|-–—()")
+
+            if degree and institution:
+                clean += 1
+            entries.append({
+                "institution": institution or "",
+                "degree": degree or "",
+                "field": field,
+                "start_date": start_date,
+                "end_date": end_date,
+                "gpa": gpa.group(1) if gpa else None,
+            })
+        return entries, clean / len(entries)
+
+    @staticmethod
+    def _skills(lines: List[str]) -> List[str]:
+        skills: List[str] = []
+        seen = set()
+        for line in lines:
+            line = LABEL.sub("", BULLET.sub("", line))
+            for skill in re.split(r"\s*(?:,|;|\||•|·|/\s)\s*", line):
+                skill = skill.strip(" .")
+                if skill and len(skill) <= 40 and skill.lower() not in seen:
+                    seen.add(skill.lower())
+                    skills.append(skill)
+        return skills
+
+    @staticmethod
+    def _projects(lines: List[str]) -> Tuple[List[Dict[str, Any]], float]:
+        if not lines:
+            return [], 1.0
+
+        projects: List[Dict[str, Any]] = []
+        for line in lines:
+            label = LABEL.match(line)
+            if label and label.group(0).lower().startswith(("tech", "stack", "built with", "tools")):
+                if projects:
+                    projects[-1]["technologies"] = [
+                        tech.strip(" .") for tech in re.split(r"\s*[,;|]\s*", line[label.end():]) if tech.strip(" .")
+                    ]
+                continue
+
+            github = GITHUB.search(line)
+            if github and projects and not BULLET.match(line) and len(line) - len(github.group(0)) < 12:
+                projects[-1]["github"] = github.group(0)
+                continue
+
+            if BULLET.match(line) or not projects or projects[-1]["_closed"]:
+                if BULLET.match(line) and projects:
+                    text = BULLET.sub("", line)
+                    projects[-1]["description"] = " ".join(filter(None, [projects[-1]["description"], text]))
+                    continue
+                match = re.match(r"(?P<name>[^:–—-]{2,60}?)\s*(?::|\s[-–—]\s)\s*(?P<rest>.+)$", line)
+                name, rest = (match.group("name"), match.group("rest")) if match else (line, "")
+                technologies = []
+                tech = re.search(r"\(([^)]+)\)\s*$", name)
+                if tech:
+                    technologies = [t.strip() for t in tech.group(1).split(",") if t.strip()]
+                    name = name[:tech.start()].strip()
+                projects.append({
+                    "name": name.strip(),
+                    "description": rest.strip(),
+                    "technologies": technologies,
+                    "link": None,
+                    "github": github.group(0) if github else None,
+                    "_closed": bool(rest),
+                })
+            else:
+                projects[-1]["description"] = " ".join(filter(None, [projects[-1]["description"], line]))
+                projects[-1]["_closed"] = True
+
+        clean = 0
+        for project in projects:
+            project.pop("_closed")
+            if project["name"] and project["description"]:
+                clean += 1
+        return projects, clean / len(projects) if projects else 0.0
+
+class _Sections(dict):
+    """Lines per section; unknown sections read as empty"""
+
+    def __init__(self):
+        super().__init__()
+        self.found = set()
+
+    def __missing__(self, key: str) -> List[str]:
+        value: List[str] = []
+        self[key] = value
+        return value
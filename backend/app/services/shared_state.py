@@ -0,0 +1,147 @@
+from app.config import settings
+from functools import lru_cache
+from typing import Dict, Optional
+import sqlite3
+import threading
+import time
+
+def connect_sqlite(db_path: str) -> sqlite3.Connection:
+    """
+    Open a SQLite database for use by several worker processes at once
+
+    WAL mode lets readers run alongside a writer, and the busy timeout
+    makes a writer wait for a concurrent one instead of failing.
+    """
+    db = sqlite3.connect(db_path, check_same_thread=False, timeout=10.0)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    return db
+
+class SharedStateStore:
+    """
+    Cache entries and counters in one SQLite (WAL) file shared by every
+    worker process
+
+    Entries are blobs with an optional expiry. Counters only ever move by
+    deltas, so workers can add to them concurrently without coordinating.
+    """
+
+    # Expired entries are swept once every this many writes
+    SWEEP_EVERY = 200
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._db = connect_sqlite(db_path)
+        self._lock = threading.Lock()
+        self._writes = 0
+        with self._lock:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS shared_entries ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS shared_counters ("
+                "key TEXT PRIMARY KEY, value REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the entry stored under key, or None if missing or expired"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, expires_at FROM shared_entries WHERE key = ?",
+                (key,)
+            ).fetchone()
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            return None
+        return row[0]
+
+    def set(self, key: str, value: bytes, ttl_seconds: Optional[float] = None) -> None:
+        """
+        Store an entry
+
+        Args:
+            key: Entry key (callers prefix it with their own namespace)
+            value: Entry content
+            ttl_seconds: Lifetime, or None to keep it until overwritten
+        """
+        expires_at = time.time() + ttl_seconds if ttl_seconds else None
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO shared_entries (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at)
+            )
+            self._writes += 1
+            if self._writes % self.SWEEP_EVERY == 0:
+                self._db.execute(
+                    "DELETE FROM shared_entries WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                    (time.time(),)
+                )
+            self._db.commit()
+
+    def add(self, deltas: Dict[str, float]) -> None:
+        """Add each delta to its counter, in one transaction"""
+        if not deltas:
+            return
+        with self._lock:
+            self._db.executemany(
+                "INSERT INTO shared_counters (key, value) VALUES (?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = value + excluded.value",
+                list(deltas.items())
+            )
+            self._db.commit()
+
+    def counters(self, prefix: str = "") -> Dict[str, float]:
+        """Current value of every counter whose key starts with prefix"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key, value FROM shared_counters WHERE substr(key, 1, ?) = ?",
+                (len(prefix), prefix)
+            ).fetchall()
+        return dict(rows)
+
+class CounterSync:
+    """
+    Mirrors one process's cumulative counters into a SharedStateStore
+
+    push() sends only what changed since the last push, so the shared
+    totals are the sum over all workers. pull() reads those totals back.
+
+    Args:
+        store: Shared store
+        namespace: Prefix for this owner's counter keys
+    """
+
+    def __init__(self, store: SharedStateStore, namespace: str):
+        self.store = store
+        self.namespace = namespace
+        self._pushed: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def push(self, totals: Dict[str, float]) -> None:
+        """
+        Send changes in this process's totals to the store
+
+        Args:
+            totals: Cumulative local value per key (without the namespace)
+        """
+        with self._lock:
+            deltas = {}
+            for key, value in totals.items():
+                delta = value - self._pushed.get(key, 0)
+                if delta:
+                    deltas[self.namespace + key] = delta
+            self.store.add(deltas)
+            self._pushed = dict(totals)
+
+    def pull(self) -> Dict[str, float]:
+        """Totals across all workers, keyed without the namespace"""
+        offset = len(self.namespace)
+        return {key[offset:]: value for key, value in self.store.counters(self.namespace).items()}
+
+@lru_cache()
+def get_shared_state() -> Optional[SharedStateStore]:
+    """Process-wide shared store, or None when SHARED_STATE_PATH is unset"""
+    if not settings.SHARED_STATE_PATH:
+        return None
+    return SharedStateStore(settings.SHARED_STATE_PATH)
@@ -0,0 +1,48 @@
+from typing import Any, Awaitable, Callable, Dict, Tuple
+import asyncio
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls that share a key
+
+    The first caller for a key starts the work; callers that arrive while it
+    is still running wait on the same task and receive the same result (or
+    exception). Nothing is remembered once the task finishes, so this only
+    merges calls that actually overlap in time.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Run fn, or join an identical call already in flight
+
+        Args:
+            key: Identity of the call
+            fn: Zero-argument coroutine function doing the work
+
+        Returns:
+            (result, shared) where shared is True if another caller's
+            in-flight call was joined
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            return await asyncio.shield(task), True
+
+        task = asyncio.ensure_future(fn())
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._forget(key, done))
+        # Shielded so one caller disconnecting does not cancel the call for
+        # everyone else waiting on it
+        return await asyncio.shield(task), False
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception retrieved in case every caller went away
+            task.exception()
+
+    def __len__(self) -> int:
+        return len(self._inflight)
@@ -0,0 +1,122 @@
+from app.services.batch_output import slugify
+from pathlib import Path
+from typing import Any, Dict, IO, Iterable, Iterator, Tuple
+import json
+import zipfile
+
+ASSET_DIR = "assets"
+# Pages live one folder deep, next to the shared asset folder
+PAGE_ASSET_BASE = f"../{ASSET_DIR}/"
+
+# Netlify / Cloudflare Pages style header rules: hashed bundles never change,
+# pages are revalidated on every visit
+HEADERS_FILE = f"""/{ASSET_DIR}/*
+  Cache-Control: public, max-age=31536000, immutable
+/*
+  Cache-Control: public, max-age=0, must-revalidate
+"""
+
+def iter_site_files(
+    results: Iterable[Dict[str, Any]],
+    names: Dict[int, str],
+    bundles: Dict[str, Tuple[str, str]],
+    template: str
+) -> Iterator[Tuple[str, bytes]]:
+    """
+    Lay out an exported site
+
+    Every portfolio becomes <index>-<slug>/index.html linking to the shared
+    bundles in assets/. A manifest.json at the root lists the pages, asset
+    filenames and failures; a _headers file carries the caching rules for
+    hosts that read it.
+
+    Args:
+        results: Results from PortfolioGenerator.generate_many rendered with
+            asset_base=PAGE_ASSET_BASE
+        names: Portfolio owner name for each record index
+        bundles: Bundles from PortfolioGenerator.asset_bundles
+        template: Template the pages were rendered with
+
+    Yields:
+        (relative path, file content) pairs
+    """
+    assets = {}
+    for kind, (filename, text) in bundles.items():
+        path = f"{ASSET_DIR}/{filename}"
+        assets[kind] = path
+        yield path, text.encode()
+
+    pages = []
+    errors = []
+    for result in results:
+        index = result["index"]
+        if not result["success"]:
+            errors.append({"index": index, "error": result["error"]})
+            continue
+        path = f"{index:05d}-{slugify(names.get(index, ''))}/index.html"
+        html = result["files"]["html"].encode()
+        pages.append({"index": index, "name": names.get(index, ""), "path": path, "bytes": len(html)})
+        yield path, html
+
+    manifest = {"template": template, "assets": assets, "pages": pages, "errors": errors}
+    yield "manifest.json", json.dumps(manifest, indent=2).encode()
+    yield "_headers", HEADERS_FILE.encode()
+
+def write_site_zip(files: Iterable[Tuple[str, bytes]], fileobj: IO[bytes]) -> None:
+    """Write site files (from iter_site_files) into a ZIP archive"""
+    with zipfile.ZipFile(fileobj, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for path, content in files:
+            archive.writestr(path, content)
+
+def write_site_directory(files: Iterable[Tuple[str, bytes]], out_dir: Path) -> None:
+    """Write site files (from iter_site_files) under out_dir"""
+    out_dir = Path(out_dir)
+    for path, content in files:
+        target = out_dir / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(content)
+
+def main() -> None:
+    """
+    Export an NDJSON file of PortfolioData records as a static site
+
+        python -m app.services.static_export portfolios.ndjson site/
+        python -m app.services.static_export portfolios.ndjson site.zip
+    """
+    import argparse
+    from app.models import PortfolioData
+    from app.services.portfolio_generator import PortfolioGenerator
+
+    parser = argparse.ArgumentParser(description="Export portfolios as a static site")
+    parser.add_argument("records", help="NDJSON file with one PortfolioData per line")
+    parser.add_argument("output", help="Output directory, or a path ending in .zip")
+    parser.add_argument("--template", default="template1")
+    parser.add_argument("--workers", type=int, default=0, help="Render processes (0 = one per CPU)")
+    args = parser.parse_args()
+
+    with open(args.records, "rb") as handle:
+        records = [PortfolioData.model_validate_json(line) for line in handle if line.strip()]
+
+    generator = PortfolioGenerator()
+    try:
+        results = generator.generate_many(
+            records,
+            args.template,
+            workers=args.workers,
+            asset_base=PAGE_ASSET_BASE
+        )
+        names = {i: record.personal_info.name for i, record in enumerate(records)}
+        files = iter_site_files(results, names, generator.asset_bundles(args.template), args.template)
+
+        if args.output.endswith(".zip"):
+            with open(args.output, "wb") as handle:
+                write_site_zip(files, handle)
+        else:
+            write_site_directory(files, Path(args.output))
+    finally:
+        generator.shutdown()
+
+    print(f"Exported {len(records)} portfolios to {args.output}")
+
+if __name__ == "__main__":
+    main()
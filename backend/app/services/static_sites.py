@@ -0,0 +1,317 @@
+from app.config import settings
+from app.services.render_cache import CODINGS, negotiate_encoding
+from fastapi.responses import Response
+from functools import lru_cache
+from mimetypes import guess_type
+from pathlib import Path
+from starlette.types import Receive, Scope, Send
+from typing import Dict, IO, Optional, Tuple
+import anyio
+import gzip
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# URL path the sites router is mounted at
+SITES_URL = "/sites"
+ASSET_DIR = "assets"
+# Published pages link to the shared, content-hashed bundles by absolute path,
+# so a page reads the same at /sites/{id}/ and in its version directory
+SITE_ASSET_BASE = f"{SITES_URL}/{ASSET_DIR}/"
+
+# Precompressed sibling of a file for each content coding
+SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "public, max-age=0, must-revalidate"
+
+# Sites are served from the API's own origin, so a page gets only its shared
+# bundles, runs sandboxed (an opaque origin: no API cookies or storage) and
+# cannot be re-typed by sniffing
+SITE_SECURITY_HEADERS = {
+    "Content-Security-Policy": (
+        "default-src 'none'; script-src 'self'; style-src 'self'; "
+        "img-src 'self' data: https:; font-src 'self' data:; "
+        "base-uri 'none'; form-action 'none'; frame-ancestors 'none'; "
+        "sandbox allow-scripts allow-popups allow-popups-to-escape-sandbox"
+    ),
+    "X-Content-Type-Options": "nosniff",
+}
+
+_SITE_ID = re.compile(r"^[A-Za-z0-9_-]+$")
+_VERSION_DIR = re.compile(r"^v(\d+)(?:-[0-9a-f]+)?$")
+_BYTE_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$", re.IGNORECASE)
+
+class SiteFile:
+    """
+    An open file chosen to answer a request for a published site
+
+    Attributes:
+        file: Open binary file; the response closes it
+        stat: os.fstat of the open file, so the size cannot change under it
+        coding: Content coding of the file ("identity", "gzip" or "br")
+        media_type: Media type of the uncompressed content
+        cache_control: Cache-Control value for the path
+    """
+
+    __slots__ = ("file", "stat", "coding", "media_type", "cache_control")
+
+    def __init__(self, file: IO[bytes], stat: os.stat_result, coding: str, media_type: str, cache_control: str):
+        self.file = file
+        self.stat = stat
+        self.coding = coding
+        self.media_type = media_type
+        self.cache_control = cache_control
+
+    @property
+    def etag(self) -> str:
+        # Every coding is its own file, so each gets its own strong tag
+        return f'"{self.stat.st_mtime_ns:x}-{self.stat.st_size:x}"'
+
+def _compress(body: bytes, coding: str) -> bytes:
+    if coding == "gzip":
+        return gzip.compress(body, compresslevel=9, mtime=0)
+    return brotli.compress(body, quality=11)
+
+def _write_atomic(target: Path, content: bytes) -> None:
+    """Write a file under a temporary name and rename it into place"""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=target.parent, prefix=".publish-")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(content)
+        os.replace(temp_path, target)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+class SitePublisher:
+    """
+    Publishes rendered portfolios as static files and finds them again
+    for requests
+
+    Layout under root:
+
+        assets/<bundle>             content-hashed CSS/JS shared by all sites
+        <id>/index.html             latest published page, the only
+                                    file that is ever rewritten
+        <id>/v<N>-<hash>/index.html version N as rendered then; the hash
+                                    is of the page, so publishing N again
+                                    with other output (another template,
+                                    a newer renderer) gets a new directory
+
+    Every file is written with .gz and .br siblings (when they are
+    smaller), so requests are answered from disk without rendering or
+    compressing anything.
+    """
+
+    def __init__(self, root: str, max_versions: int = 20):
+        self.root = Path(root).resolve()
+        self.max_versions = max_versions
+        self.codings = tuple(coding for coding in ("br", "gzip") if coding in CODINGS)
+
+    def _write(self, target: Path, content: bytes) -> None:
+        """Write a file and its precompressed siblings"""
+        _write_atomic(target, content)
+        for coding, suffix in SUFFIXES.items():
+            sibling = target.with_name(target.name + suffix)
+            encoded = _compress(content, coding) if coding in self.codings else None
+            if encoded is not None and len(encoded) < len(content):
+                _write_atomic(sibling, encoded)
+            elif sibling.exists():
+                sibling.unlink()
+
+    def publish(
+        self,
+        site_id: str,
+        version: int,
+        html: str,
+        bundles: Dict[str, Tuple[str, str]]
+    ) -> Dict[str, str]:
+        """
+        Write a rendered page as the latest and as a numbered version
+
+        Args:
+            site_id: Site id (the portfolio id)
+            version: Portfolio version the page was rendered from
+            html: Page rendered with asset_base=SITE_ASSET_BASE
+            bundles: Bundles from PortfolioGenerator.asset_bundles
+
+        Returns:
+            URL paths of the latest page ("url") and of this rendering of
+            the version ("version_url")
+        """
+        if not _SITE_ID.match(site_id):
+            raise ValueError(f"Invalid site id: {site_id}")
+
+        for filename, text in bundles.values():
+            target = self.root / ASSET_DIR / filename
+            # Bundle names carry a hash of their content
+            if not target.exists():
+                self._write(target, text.encode())
+
+        site_dir = self.root / site_id
+        body = html.encode()
+        # Version directories are served as immutable, so one is written
+        # once and never touched again; only index.html is replaced
+        version_dir = f"v{version}-{hashlib.sha256(body).hexdigest()[:12]}"
+        if not (site_dir / version_dir / "index.html").exists():
+            self._write(site_dir / version_dir / "index.html", body)
+        self._write(site_dir / "index.html", body)
+
+        for child in site_dir.iterdir():
+            match = _VERSION_DIR.match(child.name)
+            if match and int(match.group(1)) <= version - self.max_versions:
+                shutil.rmtree(child, ignore_errors=True)
+
+        return {
+            "url": f"{SITES_URL}/{site_id}/",
+            "version_url": f"{SITES_URL}/{site_id}/{version_dir}/"
+        }
+
+    def resolve(self, site_id: str, path: str) -> Optional[Path]:
+        """
+        Map a request path to a file (or directory) inside a site
+
+        Returns:
+            The path, or None if it would leave the site or names a hidden file
+        """
+        if not _SITE_ID.match(site_id):
+            return None
+        parts = [part for part in path.split("/") if part]
+        if any(part.startswith(".") for part in parts):
+            return None
+        site_dir = self.root / site_id
+        target = site_dir.joinpath(*parts)
+        if path == "" or path.endswith("/"):
+            target = target / "index.html"
+        try:
+            target.resolve().relative_to(site_dir.resolve())
+        except ValueError:
+            return None
+        return target
+
+    def open(self, target: Path, accept_encoding: str) -> Optional[SiteFile]:
+        """
+        Open the best stored coding of a file for an Accept-Encoding header
+
+        Returns:
+            The open file, or None if there is no such file
+        """
+        available = ["identity"]
+        available.extend(coding for coding in self.codings if target.with_name(target.name + SUFFIXES[coding]).is_file())
+        coding = negotiate_encoding(accept_encoding, available)
+        path = target if coding == "identity" else target.with_name(target.name + SUFFIXES[coding])
+        try:
+            file = open(path, "rb")
+        except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+            return None
+        stat = os.fstat(file.fileno())
+
+        relative = target.relative_to(self.root).parts
+        immutable = relative[0] == ASSET_DIR or (len(relative) > 2 and _VERSION_DIR.match(relative[1]))
+        return SiteFile(
+            file=file,
+            stat=stat,
+            coding=coding,
+            media_type=guess_type(target.name)[0] or "application/octet-stream",
+            cache_control=IMMUTABLE if immutable else REVALIDATE
+        )
+
+def parse_byte_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range Range header ("bytes=0-99", "bytes=100-",
+    "bytes=-100")
+
+    Multiple ranges and malformed headers are not supported; the whole
+    file is sent for them, which RFC 9110 allows.
+
+    Returns:
+        (first, last) byte positions, inclusive, or None to send the whole file
+
+    Raises:
+        ValueError: The range lies outside the file (answer 416)
+    """
+    match = _BYTE_RANGE.match(header.strip())
+    if match is None or match.group(1) == match.group(2) == "":
+        return None
+    first, last = match.groups()
+    if first == "":
+        # Suffix range: the last N bytes
+        if int(last) == 0 or size == 0:
+            raise ValueError("Unsatisfiable range")
+        return max(size - int(last), 0), size - 1
+    if last != "" and int(last) < int(first):
+        return None
+    if int(first) >= size:
+        raise ValueError("Unsatisfiable range")
+    return int(first), min(int(last), size - 1) if last != "" else size - 1
+
+class SiteFileResponse(Response):
+    """
+    Sends (part of) an already open file
+
+    Unlike FileResponse, this serves byte ranges and works from an open
+    file, so a file replaced by a republish mid-request is still sent
+    whole. When the server offers the ASGI zero-copy extension, the file
+    is handed to it (sendfile); otherwise it is read in chunks with
+    os.pread, which takes the bytes straight from the page cache.
+    """
+
+    chunk_size = 256 * 1024
+
+    def __init__(
+        self,
+        site_file: SiteFile,
+        offset: int = 0,
+        count: Optional[int] = None,
+        status_code: int = 200,
+        headers: Optional[Dict[str, str]] = None,
+        method: Optional[str] = None
+    ):
+        super().__init__(status_code=status_code, headers=headers, media_type=site_file.media_type)
+        self.file = site_file.file
+        self.offset = offset
+        self.count = site_file.stat.st_size - offset if count is None else count
+        self.send_header_only = method is not None and method.upper() == "HEAD"
+        self.headers["content-length"] = str(self.count)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+            if self.send_header_only or self.count == 0:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+            elif "http.response.zerocopy" in scope.get("extensions", {}):
+                await send({
+                    "type": "http.response.zerocopy",
+                    "file": self.file,
+                    "offset": self.offset,
+                    "count": self.count,
+                    "more_body": False
+                })
+            else:
+                fd = self.file.fileno()
+                position, remaining = self.offset, self.count
+                while remaining > 0:
+                    chunk = await anyio.to_thread.run_sync(os.pread, fd, min(self.chunk_size, remaining), position)
+                    if not chunk:
+                        break
+                    position += len(chunk)
+                    remaining -= len(chunk)
+                    await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+                if remaining > 0:
+                    await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            self.file.close()
+
+@lru_cache()
+def get_site_publisher() -> SitePublisher:
+    """Process-wide site publisher built from Settings"""
+    return SitePublisher(settings.SITES_DIR, max_versions=settings.PORTFOLIO_MAX_VERSIONS)
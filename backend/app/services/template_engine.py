@@ -0,0 +1,189 @@
+from app.services.minify import minify_css, minify_js
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import hashlib
+import re
+import sys
+import threading
+
+SLOT_PATTERN = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+class CompiledTemplate:
+    """
+    A template split once into static text and named dynamic slots
+
+    Static slot values (such as the stylesheet) are folded into the
+    neighbouring text at compile time, so rendering is a single join over
+    pre-built strings.
+    """
+
+    def __init__(self, source: str, static: Optional[Dict[str, str]] = None):
+        static = static or {}
+        self.parts: List[Optional[str]] = []
+        self.slots: List[tuple] = []
+
+        buffer = []
+        position = 0
+        for match in SLOT_PATTERN.finditer(source):
+            buffer.append(source[position:match.start()])
+            name = match.group(1)
+            if name in static:
+                buffer.append(static[name])
+            else:
+                self.parts.append(sys.intern("".join(buffer)))
+                self.slots.append((len(self.parts), name))
+                self.parts.append(None)
+                buffer = []
+            position = match.end()
+        buffer.append(source[position:])
+        self.parts.append(sys.intern("".join(buffer)))
+
+    @property
+    def slot_names(self) -> List[str]:
+        return [name for _, name in self.slots]
+
+    def render(self, context: Dict[str, str]) -> str:
+        """
+        Fill the dynamic slots and join the document
+
+        Args:
+            context: Value for every dynamic slot
+
+        Returns:
+            Rendered document
+        """
+        pieces = list(self.parts)
+        for index, name in self.slots:
+            pieces[index] = context[name]
+        return "".join(pieces)
+
+    def iter_render(self, render_slot: Callable[[str], str]) -> Iterator[str]:
+        """
+        Yield the document piece by piece, for streaming
+
+        Static text is yielded as is; each slot is rendered only when the
+        output reaches it, so the head of the page can be sent first.
+
+        Args:
+            render_slot: Returns the value of a slot given its name
+        """
+        slots = dict(self.slots)
+        for index, part in enumerate(self.parts):
+            yield render_slot(slots[index]) if part is None else part
+
+class TemplateEngine:
+    """
+    Loads and compiles templates from a directory, once per template
+
+    Each template lives in <templates_dir>/<name>/ with an index.html page,
+    an optional style.css and an optional script.js. By default the assets
+    are inlined into the {{ styles }} and {{ scripts }} slots; for static
+    export they are minified into content-hashed bundles that the page links
+    to instead.
+    """
+
+    def __init__(self, templates_dir: Path):
+        self.templates_dir = Path(templates_dir)
+        self._compiled: Dict[Tuple[str, Optional[str]], CompiledTemplate] = {}
+        self._bundles: Dict[str, Dict[str, Tuple[str, str]]] = {}
+        self._digests: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def read_asset(self, template: str, filename: str) -> str:
+        """Return the text of a template file, or "" if it does not exist"""
+        path = self.templates_dir / template / filename
+        if not path.is_file():
+            return ""
+        return path.read_text(encoding="utf-8")
+
+    def digest(self, template: str) -> str:
+        """
+        Hash of a template's page, stylesheet and script, read once
+
+        Renders (and their ETags) are keyed on it, so editing a template
+        invalidates every cached render made with the old files.
+
+        Raises:
+            ValueError: The template does not exist
+        """
+        digest = self._digests.get(template)
+        if digest is not None:
+            return digest
+
+        source = self.read_asset(template, "index.html")
+        if not source:
+            raise ValueError(f"Unknown template: {template}")
+        hasher = hashlib.sha256(source.encode())
+        for filename in ("style.css", "script.js"):
+            hasher.update(b"\0" + self.read_asset(template, filename).encode())
+        digest = hasher.hexdigest()[:16]
+        self._digests[template] = digest
+        return digest
+
+    def bundle(self, template: str) -> Dict[str, Tuple[str, str]]:
+        """
+        Minified, content-hashed asset bundles of a template
+
+        Args:
+            template: Template directory name
+
+        Returns:
+            {"css": (filename, text), "js": (filename, text)} for the
+            assets the template has, e.g. "template1.3f2a9c01be4d.css"
+        """
+        bundles = self._bundles.get(template)
+        if bundles is not None:
+            return bundles
+
+        bundles = {}
+        for kind, filename, minify in (("css", "style.css", minify_css), ("js", "script.js", minify_js)):
+            source = self.read_asset(template, filename)
+            if not source:
+                continue
+            text = minify(source)
+            digest = hashlib.sha256(text.encode()).hexdigest()[:12]
+            bundles[kind] = (f"{template}.{digest}.{kind}", text)
+        self._bundles[template] = bundles
+        return bundles
+
+    def get(self, template: str, asset_base: Optional[str] = None) -> CompiledTemplate:
+        """
+        Return the compiled template, loading it on first use
+
+        Args:
+            template: Template directory name
+            asset_base: URL prefix of the exported bundles; None inlines
+                the assets into the page
+
+        Returns:
+            CompiledTemplate ready to render
+        """
+        key = (template, asset_base)
+        compiled = self._compiled.get(key)
+        if compiled is not None:
+            return compiled
+
+        with self._lock:
+            compiled = self._compiled.get(key)
+            if compiled is None:
+                source = self.read_asset(template, "index.html")
+                if not source:
+                    raise ValueError(f"Unknown template: {template}")
+                compiled = CompiledTemplate(source, static=self._asset_tags(template, asset_base))
+                self._compiled[key] = compiled
+            return compiled
+
+    def _asset_tags(self, template: str, asset_base: Optional[str]) -> Dict[str, str]:
+        if asset_base is None:
+            css = self.read_asset(template, "style.css")
+            js = self.read_asset(template, "script.js")
+            return {
+                "styles": f"<style>\n{css}    </style>" if css else "",
+                "scripts": f"<script>\n{js}</script>" if js else "",
+            }
+
+        bundles = self.bundle(template)
+        return {
+            "styles": f'<link rel="stylesheet" href="{asset_base}{bundles["css"][0]}">' if "css" in bundles else "",
+            "scripts": f'<script src="{asset_base}{bundles["js"][0]}" defer></script>' if "js" in bundles else "",
+        }
@@ -0,0 +1,396 @@
+from app.config import settings
+from fastapi import HTTPException, Request
+from multipart import MultipartParser
+from multipart.multipart import parse_options_header
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+import hashlib
+import io
+import json
+import os
+import tempfile
+import zipfile
+
+PDF_MAGIC = b"%PDF-"
+ZIP_MAGIC = b"PK\x03\x04"
+# Compound File Binary: legacy Word .doc (and other pre-2007 Office files)
+OLE_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+# The PDF header may follow some junk bytes; readers look this far
+PDF_HEADER_WINDOW = 1024
+
+class UnsupportedFileError(ValueError):
+    """Raised when an upload is not a PDF or DOCX, whatever its filename says"""
+
+class SpooledUpload:
+    """
+    An uploaded file held in memory up to a threshold and on disk beyond it
+
+    Unlike tempfile.SpooledTemporaryFile the disk copy is a named file, so
+    a parse worker in another process can open (and mmap) it by path
+    instead of receiving the content through a pipe.
+
+    Attributes:
+        size: Bytes written so far
+        file_type: Sniffed type ("pdf" or "docx") once finish() has run
+    """
+
+    def __init__(self, max_memory: int = 1024 * 1024, tmp_dir: Optional[str] = None):
+        self.max_memory = max_memory
+        self.tmp_dir = tmp_dir
+        self.size = 0
+        self.file_type: Optional[str] = None
+        self._file = io.BytesIO()
+        self._path: Optional[str] = None
+        self._digest = hashlib.sha256()
+
+    @property
+    def path(self) -> Optional[str]:
+        """Path of the disk copy, or None while the upload fits in memory"""
+        return self._path
+
+    def write(self, chunk: bytes) -> None:
+        """Append a chunk, hashing it and moving to disk past max_memory"""
+        self._digest.update(chunk)
+        self.size += len(chunk)
+        if self._path is None and self.size > self.max_memory:
+            disk = tempfile.NamedTemporaryFile(prefix="upload-", dir=self.tmp_dir, delete=False)
+            disk.write(self._file.getbuffer())
+            self._file = disk
+            self._path = disk.name
+        self._file.write(chunk)
+
+    def finish(self) -> str:
+        """
+        Flush the upload and sniff its type from the content
+
+        Returns:
+            "pdf" or "docx"
+
+        Raises:
+            UnsupportedFileError: Empty file, legacy .doc or anything else
+        """
+        self._file.flush()
+        self._file.seek(0)
+        head = self._file.read(PDF_HEADER_WINDOW)
+        self._file.seek(0)
+        self.file_type = sniff_file_type(head, self._file)
+        return self.file_type
+
+    def digest(self) -> "hashlib._Hash":
+        """Copy of the running sha256 of the content"""
+        return self._digest.copy()
+
+    def parse_source(self) -> Union[bytes, str]:
+        """What to hand the parser: the path on disk, or the bytes if small"""
+        if self._path is not None:
+            return self._path
+        return self._file.getvalue()
+
+    def read_bytes(self) -> bytes:
+        self._file.seek(0)
+        return self._file.read()
+
+    def close(self) -> None:
+        """Release the memory buffer or delete the disk copy"""
+        self._file.close()
+        if self._path is not None:
+            try:
+                os.unlink(self._path)
+            except FileNotFoundError:
+                pass
+            self._path = None
+
+    def __enter__(self) -> "SpooledUpload":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+def sniff_file_type(head: bytes, fileobj) -> str:
+    """
+    Identify a resume file from its content
+
+    Args:
+        head: First bytes of the file (PDF_HEADER_WINDOW is enough)
+        fileobj: Seekable file, used to look inside ZIP containers
+
+    Returns:
+        "pdf" or "docx"
+
+    Raises:
+        UnsupportedFileError: The content is not a PDF or DOCX
+    """
+    if not head:
+        raise UnsupportedFileError("The uploaded file is empty.")
+    if PDF_MAGIC in head[:PDF_HEADER_WINDOW]:
+        return "pdf"
+    if head.startswith(OLE_MAGIC):
+        raise UnsupportedFileError(
+            "Legacy .doc files are not supported. Save the resume as DOCX or PDF."
+        )
+    if head.startswith(ZIP_MAGIC):
+        try:
+            with zipfile.ZipFile(fileobj) as archive:
+                if "word/document.xml" in archive.namelist():
+                    return "docx"
+        except zipfile.BadZipFile:
+            pass
+        finally:
+            fileobj.seek(0)
+    raise UnsupportedFileError("Invalid file type. Only PDF and DOCX are supported.")
+
+class _MultipartReader:
+    """
+    python-multipart callbacks that write one file field into a SpooledUpload
+
+    The other text fields are kept as strings; other files are skipped.
+    Chunks of the file are written as the parser produces them, so the
+    body is buffered exactly once.
+    """
+
+    # Text fields (webhook_url, ...) are short; this bounds what they may hold
+    MAX_FIELD_BYTES = 64 * 1024
+
+    def __init__(self, upload: SpooledUpload, field: str, max_bytes: int):
+        self.upload = upload
+        self.field = field
+        self.max_bytes = max_bytes
+        self.fields: Dict[str, str] = {}
+        self.found = False
+        self._header_name = b""
+        self._header_value = b""
+        self._disposition = b""
+        self._name: Optional[str] = None
+        # "file" (the upload), "text" (a form field) or "skip"
+        self._kind = "skip"
+        self._data = bytearray()
+
+    def callbacks(self) -> Dict[str, Callable]:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+        }
+
+    def on_part_begin(self) -> None:
+        self._disposition = b""
+        self._name = None
+        self._kind = "skip"
+        self._data = bytearray()
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        if self._header_name.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_name = b""
+        self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._disposition)
+        name = options.get(b"name")
+        if name is None:
+            raise HTTPException(status_code=400, detail="Malformed multipart body: a part has no name")
+        self._name = name.decode("utf-8", "replace")
+        if b"filename" not in options:
+            self._kind = "text"
+        elif self._name == self.field and not self.found:
+            self._kind = "file"
+            self.found = True
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._kind == "file":
+            if self.upload.size + end - start > self.max_bytes:
+                raise _too_large(self.max_bytes)
+            self.upload.write(data[start:end])
+        elif self._kind == "text":
+            self._data += data[start:end]
+            if len(self._data) > self.MAX_FIELD_BYTES:
+                raise HTTPException(status_code=413, detail=f"Form field {self._name} is too large.")
+
+    def on_part_end(self) -> None:
+        if self._kind == "text":
+            self.fields[self._name] = self._data.decode("utf-8", "replace")
+
+async def receive_upload(
+    request: Request,
+    field: str = "file",
+    max_bytes: Optional[int] = None
+) -> Tuple[SpooledUpload, Dict[str, str]]:
+    """
+    Stream a multipart/form-data request into a SpooledUpload
+
+    The body is parsed as it arrives and the file's chunks go straight into
+    the spool, so the upload is held once (in memory up to
+    UPLOAD_SPOOL_MAX_MEMORY, in one named temp file beyond), instead of
+    being spooled by the form parser and copied again. The size limit is
+    checked as chunks arrive, and the file type comes from the content
+    rather than the filename.
+
+    Args:
+        request: Request with a multipart/form-data body
+        field: Name of the file field
+        max_bytes: Largest accepted file (defaults to Settings.UPLOAD_MAX_BYTES)
+
+    Returns:
+        (upload, fields): the spooled upload, which the caller closes, and
+        the other form fields as text
+
+    Raises:
+        HTTPException: 400 for a malformed body, 422 when the file field
+            is missing, 413 when the file is too large, 415 when it is not
+            a PDF or DOCX
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data body")
+
+    max_bytes = max_bytes or settings.UPLOAD_MAX_BYTES
+    upload = SpooledUpload(
+        max_memory=settings.UPLOAD_SPOOL_MAX_MEMORY,
+        tmp_dir=settings.UPLOAD_TMP_DIR
+    )
+    reader = _MultipartReader(upload, field, max_bytes)
+    parser = MultipartParser(params[b"boundary"], reader.callbacks())
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+        parser.finalize()
+        if not reader.found:
+            raise HTTPException(status_code=422, detail=f"Missing file field: {field}")
+        upload.finish()
+    except UnsupportedFileError as e:
+        upload.close()
+        raise HTTPException(status_code=415, detail=str(e))
+    except BaseException:
+        upload.close()
+        raise
+    return upload, reader.fields
+
+def upload_openapi(field: str = "file", **text_fields: str) -> Dict[str, Any]:
+    """
+    OpenAPI request body for a route that reads its upload with
+    receive_upload (FastAPI cannot see the form it parses)
+
+    Args:
+        field: Name of the file field
+        text_fields: Optional text fields, name -> description
+    """
+    properties = {field: {"type": "string", "format": "binary"}}
+    properties.update({name: {"type": "string", "description": text} for name, text in text_fields.items()})
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {"type": "object", "properties": properties, "required": [field]}
+                }
+            },
+        }
+    }
+
+async def read_body(request: Request, max_bytes: int) -> bytes:
+    """
+    Read a whole request body, refusing it past max_bytes
+
+    A Content-Length over the limit is rejected before anything is read;
+    otherwise the body is counted as it streams in, so an oversized one is
+    never held in memory in full.
+
+    Raises:
+        HTTPException: 413 when the body is too large
+    """
+    content_length = request.headers.get("content-length")
+    if content_length is not None and content_length.isdigit() and int(content_length) > max_bytes:
+        raise _body_too_large(max_bytes)
+
+    chunks = []
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > max_bytes:
+            raise _body_too_large(max_bytes)
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+def _body_too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"Request body too large. The limit is {max_bytes // (1024 * 1024)} MB."
+    )
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"File too large. The limit is {max_bytes // (1024 * 1024)} MB."
+    )
+
+class UploadLimitMiddleware:
+    """
+    ASGI middleware that caps the body size of multipart requests
+
+    A Content-Length over the limit is answered with 413 before any of the
+    body is read; bodies without one are counted as they stream in and
+    cut off with 413 once they pass the limit, before the multipart body
+    is spooled any further.
+
+    Args:
+        app: ASGI application
+        max_bytes: Largest accepted file; multipart framing gets a small
+            allowance on top
+    """
+
+    FRAMING_ALLOWANCE = 64 * 1024
+
+    def __init__(self, app, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.max_body = max_bytes + self.FRAMING_ALLOWANCE
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers", []))
+        if not headers.get(b"content-type", b"").startswith(b"multipart/"):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_body:
+            await self._reject(send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body:
+                    raise _too_large(self.max_bytes)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    async def _reject(self, send) -> None:
+        body = json.dumps({"detail": _too_large(self.max_bytes).detail}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
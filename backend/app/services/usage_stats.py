@@ -0,0 +1,85 @@
+from functools import lru_cache
+from typing import Dict
+import threading
+
+class UsageStats:
+    """
+    In-process totals of LLM calls, tokens and latency per operation
+    """
+
+    FIELDS = ("calls", "prompt_tokens", "completion_tokens", "seconds")
+
+    def __init__(self):
+        self._totals: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        self._sync = None
+
+    def attach(self, sync) -> None:
+        """Report totals across worker processes through a shared store (a CounterSync)"""
+        self._sync = sync
+
+    def flush(self) -> None:
+        """Push this process's changes to the shared store, if attached"""
+        if self._sync is not None:
+            self._sync.push(self._flatten())
+
+    def _flatten(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                f"{operation}\0{field}": totals[field]
+                for operation, totals in self._totals.items()
+                for field in self.FIELDS
+            }
+
+    def record(self, operation: str, prompt_tokens: int, completion_tokens: int, seconds: float) -> None:
+        """
+        Add one completed LLM call to the totals
+
+        Args:
+            operation: Name of the calling operation (e.g. "refine_patch")
+            prompt_tokens: Tokens sent to the model
+            completion_tokens: Tokens generated by the model
+            seconds: Wall time of the call
+        """
+        with self._lock:
+            totals = self._totals.setdefault(
+                operation,
+                {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "seconds": 0.0}
+            )
+            totals["calls"] += 1
+            totals["prompt_tokens"] += prompt_tokens
+            totals["completion_tokens"] += completion_tokens
+            totals["seconds"] += seconds
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Totals and per-call averages for every operation seen so far
+
+        Returns:
+            Mapping of operation name to its statistics
+        """
+        if self._sync is not None:
+            self._sync.push(self._flatten())
+            all_totals: Dict[str, Dict[str, float]] = {}
+            for key, value in self._sync.pull().items():
+                operation, _, field = key.partition("\0")
+                all_totals.setdefault(operation, dict.fromkeys(self.FIELDS, 0))[field] = value
+        else:
+            with self._lock:
+                all_totals = {operation: dict(totals) for operation, totals in self._totals.items()}
+
+        result = {}
+        for operation, totals in all_totals.items():
+            calls = totals["calls"] or 1
+            result[operation] = {
+                **totals,
+                "avg_prompt_tokens": totals["prompt_tokens"] / calls,
+                "avg_completion_tokens": totals["completion_tokens"] / calls,
+                "avg_seconds": totals["seconds"] / calls,
+            }
+        return result
+
+@lru_cache()
+def get_usage_stats() -> UsageStats:
+    """Process-wide usage statistics"""
+    return UsageStats()
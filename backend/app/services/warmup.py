@@ -0,0 +1,58 @@
+from app.models import PersonalInfo, PortfolioData
+from app.services.openai_service import get_async_client
+from app.services.parse_pool import get_parse_pool
+from typing import Dict
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES = ("template1", "template2", "template3")
+
+async def warm_up(portfolio_generator) -> Dict[str, float]:
+    """
+    Pay one-time startup costs before a worker takes traffic
+
+    Opens a keep-alive connection to the LLM API, starts the parse pool's
+    worker processes and renders every template once (loading template
+    files and the fragment code paths). Failures are logged, not raised:
+    a cold worker is still a working one.
+
+    Args:
+        portfolio_generator: The generator the routes render with
+
+    Returns:
+        Seconds spent per step
+    """
+    timings = {}
+
+    start = time.perf_counter()
+    try:
+        client = get_async_client().with_options(timeout=5.0)
+        await client.models.list()
+    except Exception as e:
+        logger.warning("LLM connection warm-up failed: %s", e)
+    timings["llm_connection"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    try:
+        await get_parse_pool().warm_up()
+    except Exception as e:
+        logger.warning("Parse pool warm-up failed: %s", e)
+    timings["parse_pool"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    data = PortfolioData(personal_info=PersonalInfo(name="Warm Up"), summary="Warm up")
+    for template in TEMPLATES:
+        try:
+            portfolio_generator.generate(data, template)
+        except Exception as e:
+            logger.warning("Template %s warm-up failed: %s", template, e)
+    timings["templates"] = time.perf_counter() - start
+
+    logger.info(
+        "Warm-up finished in %.2fs (%s)",
+        sum(timings.values()),
+        ", ".join(f"{step} {seconds:.2f}s" for step, seconds in timings.items())
+    )
+    return timings
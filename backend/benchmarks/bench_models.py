@@ -0,0 +1,66 @@
+"""
+Validation benchmark for PortfolioData.
+
+Times the model operations every request goes through, at several entry
+counts (experience, education and project entries each):
+
+  validate       PortfolioData(**dict), as after json.loads of LLM output
+  validate_json  PortfolioData.model_validate_json on the raw JSON text
+  dump           model_dump(), as in every JSON response
+  dump_json      model_dump_json()
+
+    python -m benchmarks.bench_models --entries 1 10 50
+"""
+import argparse
+import json
+import time
+
+from benchmarks.documents import make_portfolio
+from benchmarks.results import add_json_argument, case, save_if_requested
+
+
+def per_call(fn, iterations: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+
+def run(entry_counts: list, iterations: int) -> list:
+    from app.models import PortfolioData
+
+    rows = []
+    print(f"{'entries':>8} {'json bytes':>11} {'validate':>10} {'val_json':>10} {'dump':>10} {'dump_json':>10}  (us)")
+    for entries in entry_counts:
+        data = make_portfolio(entries)
+        as_dict = json.loads(data.model_dump_json())
+        as_json = data.model_dump_json()
+
+        timings = {
+            "validate_us": per_call(lambda: PortfolioData(**as_dict), iterations),
+            "validate_json_us": per_call(lambda: PortfolioData.model_validate_json(as_json), iterations),
+            "dump_us": per_call(data.model_dump, iterations),
+            "dump_json_us": per_call(data.model_dump_json, iterations),
+        }
+        timings = {key: seconds * 1e6 for key, seconds in timings.items()}
+        print(
+            f"{entries:>8} {len(as_json):>11} "
+            + " ".join(f"{value:>10.1f}" for value in timings.values())
+        )
+        rows.append(case(f"entries={entries}", **timings))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--iterations", type=int, default=2000)
+    add_json_argument(parser)
+    args = parser.parse_args()
+
+    save_if_requested(args, {"models": run(args.entries, args.iterations)})
+
+
+if __name__ == "__main__":
+    main()
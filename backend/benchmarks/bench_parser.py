@@ -0,0 +1,82 @@
+"""
+Scaling benchmark for ResumeParser on synthetic 1-500 page documents.
+
+Reports time per page for the full-string path (parse_pdf / parse_docx)
+and the peak memory of consuming the lazy iter_pages / iter_blocks API.
+Flat ms/page across sizes means extraction is linear.
+
+    python -m benchmarks.bench_parser --sizes 1 10 50 100 250 500
+"""
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.documents import make_docx, make_pdf
+from benchmarks.results import add_json_argument, case, save_if_requested
+from app.services.resume_parser import ResumeParser
+
+
+def best_of(repeat: int, fn, *args) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def peak_memory(fn, *args) -> int:
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def consume(iterator) -> None:
+    for _ in iterator:
+        pass
+
+
+def run(kind: str, sizes: list, repeat: int) -> list:
+    make = make_pdf if kind == "pdf" else make_docx
+    parse = ResumeParser.parse_pdf if kind == "pdf" else ResumeParser.parse_docx
+    iterate = ResumeParser.iter_pages if kind == "pdf" else ResumeParser.iter_blocks
+
+    rows = []
+    print(f"\n{kind.upper()}")
+    print(f"{'pages':>6} {'bytes':>10} {'total ms':>10} {'ms/page':>8} {'stream peak KiB':>16}")
+    for pages in sizes:
+        document = make(pages)
+        elapsed = best_of(repeat, parse, document)
+        peak = peak_memory(lambda: consume(iterate(document)))
+        print(
+            f"{pages:>6} {len(document):>10} {elapsed * 1000:>10.1f} "
+            f"{elapsed * 1000 / pages:>8.2f} {peak / 1024:>16.0f}"
+        )
+        rows.append(case(
+            f"{kind} pages={pages}",
+            ms=elapsed * 1000,
+            ms_per_page=elapsed * 1000 / pages,
+            stream_peak_kib=peak / 1024
+        ))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 50, 100, 250, 500])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--kind", choices=["pdf", "docx", "all"], default="all")
+    add_json_argument(parser)
+    args = parser.parse_args()
+
+    rows = []
+    for kind in ("pdf", "docx"):
+        if args.kind in (kind, "all"):
+            rows.extend(run(kind, args.sizes, args.repeat))
+    save_if_requested(args, {"parser": rows})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Render benchmark for PortfolioGenerator.
+
+Reports time and peak memory allocated per rendered portfolio at several
+entry counts (experience, education and project entries each).
+
+    python -m benchmarks.bench_render --entries 1 10 50
+"""
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.documents import make_portfolio
+from benchmarks.results import add_json_argument, case, save_if_requested
+from app.services.portfolio_generator import PortfolioGenerator
+
+
+def measure(generator: PortfolioGenerator, data, iterations: int) -> tuple:
+    generator.generate(data)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        generator.generate(data)
+    per_render = (time.perf_counter() - start) / iterations
+
+    tracemalloc.start()
+    generator.generate(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return per_render, peak
+
+
+def run(entry_counts: list, iterations: int) -> list:
+    generator = PortfolioGenerator()
+    rows = []
+    print(f"{'entries':>8} {'html bytes':>11} {'us/render':>10} {'peak KiB':>9}")
+    for entries in entry_counts:
+        data = make_portfolio(entries)
+        html = generator.generate(data)["html"]
+        per_render, peak = measure(generator, data, iterations)
+        print(f"{entries:>8} {len(html):>11} {per_render * 1e6:>10.1f} {peak / 1024:>9.1f}")
+        rows.append(case(f"entries={entries}", us=per_render * 1e6, peak_kib=peak / 1024))
+    generator.shutdown()
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--iterations", type=int, default=500)
+    add_json_argument(parser)
+    args = parser.parse_args()
+
+    save_if_requested(args, {"render": run(args.entries, args.iterations)})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Resilience benchmark for OpenAIService against a fault-injecting mock.
+
+Three scenarios, each run with and without the relevant part of the policy:
+
+  errors  - a share of requests fail with 503; success rate with and
+            without retries
+  tail    - a share of requests are slow; p50/p99 with and without hedging
+  outage  - every request fails; how long callers wait, and how many
+            upstream calls are made, with and without the circuit breaker
+
+    python -m benchmarks.bench_resilience --requests 100 --delay 0.05
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from benchmarks.mock_openai import MockOpenAIServer
+
+
+async def fire(service, requests: int, tag: str) -> tuple:
+    """Run requests distinct extractions at once; return (ok, latencies)"""
+    async def one(i: int):
+        start = time.perf_counter()
+        try:
+            await service.extract_portfolio_data(f"{tag} {i}\nSenior Engineer at Acme Corp")
+            ok = True
+        except Exception:
+            ok = False
+        return ok, time.perf_counter() - start
+
+    results = await asyncio.gather(*(one(i) for i in range(requests)))
+    return sum(ok for ok, _ in results), sorted(latency for _, latency in results)
+
+
+def percentile(latencies: list, p: float) -> float:
+    return latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))]
+
+
+def report(label: str, requests: int, ok: int, latencies: list, calls: int) -> None:
+    print(
+        f"  {label:<18} success {ok:>4}/{requests:<4} "
+        f"p50 {statistics.median(latencies) * 1000:>6.0f} ms  "
+        f"p99 {percentile(latencies, 99) * 1000:>6.0f} ms  "
+        f"upstream calls {calls}"
+    )
+
+
+async def run(server: MockOpenAIServer, args) -> None:
+    from app.services.openai_service import OpenAIService
+    from app.services.resilience import CircuitBreaker, ResiliencePolicy
+
+    service = OpenAIService()
+    state = server.app.state
+
+    async def scenario(label: str, policy: ResiliencePolicy, tag: str, **faults) -> None:
+        for field, value in faults.items():
+            setattr(state, field, value)
+        service.resilience = policy
+        calls = state.calls
+        ok, latencies = await fire(service, args.requests, tag)
+        report(label, args.requests, ok, latencies, state.calls - calls)
+
+    def policy(**overrides) -> ResiliencePolicy:
+        options = dict(
+            max_retries=3,
+            base_delay=0.05,
+            max_delay=0.5,
+            attempt_timeout=10.0,
+            deadline=20.0,
+            breaker=CircuitBreaker(failure_threshold=10_000)
+        )
+        options.update(overrides)
+        return ResiliencePolicy(**options)
+
+    print(f"errors: {args.failure_rate:.0%} of requests fail with 503")
+    await scenario("no retries", policy(max_retries=0), "e0", failure_rate=args.failure_rate, slow_rate=0.0)
+    await scenario("3 retries", policy(), "e1")
+
+    print(f"tail: {args.slow_rate:.0%} of requests take {args.slow_delay * 1000:.0f} ms")
+    hedged = policy(hedge_percentile=90, hedge_min_samples=20)
+    # Seed the latency window so hedging is active from the first request
+    for _ in range(hedged.hedge_min_samples):
+        hedged.latencies.record(args.delay * 1.5)
+    await scenario("no hedging", policy(), "t0", failure_rate=0.0, slow_rate=args.slow_rate)
+    await scenario("hedge at p90", hedged, "t1")
+
+    print("outage: every request fails with 503")
+    outage = dict(base_delay=0.1, max_delay=1.0)
+    await scenario("no breaker", policy(**outage), "o0", failure_rate=1.0, slow_rate=0.0)
+    await scenario(
+        "breaker (5)",
+        policy(**outage, breaker=CircuitBreaker(failure_threshold=5, reset_seconds=60)),
+        "o1"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--delay", type=float, default=0.05)
+    parser.add_argument("--failure-rate", type=float, default=0.2)
+    parser.add_argument("--slow-rate", type=float, default=0.05)
+    parser.add_argument("--slow-delay", type=float, default=1.0)
+    parser.add_argument("--port", type=int, default=8100)
+    args = parser.parse_args()
+
+    with MockOpenAIServer(port=args.port, delay=args.delay, slow_delay=args.slow_delay, seed=1) as server:
+        os.environ.setdefault("OPENAI_API_KEY", "mock-key")
+        os.environ["OPENAI_BASE_URL"] = server.base_url
+        asyncio.run(run(server, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Response serialization benchmark: bytes and CPU per response.
+
+  envelope   {"success": true, "data": PortfolioData} as the routes used to
+             build it (model_dump() -> jsonable_encoder -> JSONResponse)
+             vs success_response (model_dump_json, one pass)
+  generate   the /generate body: json.dumps of files and section digests
+             (before) vs responses.dumps (orjson when installed) vs the
+             bare HTML page that ?format=html sends
+  endpoint   POST /generate through the ASGI app in-process, per format,
+             with a different portfolio each time (no render cache hits);
+             CPU time covers the app and the in-process client
+
+    python -m benchmarks.bench_responses --entries 1 10 50
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import time
+
+from benchmarks.documents import make_portfolio
+from benchmarks.results import add_json_argument, case, save_if_requested
+
+
+def cpu_per_call(fn, iterations: int) -> float:
+    fn()
+    start = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return (time.process_time() - start) / iterations
+
+
+def run_serialization(entry_counts: list, iterations: int) -> list:
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+
+    from app.services.portfolio_generator import PortfolioGenerator
+    from app.services.responses import dumps, orjson, success_response
+
+    generator = PortfolioGenerator()
+    rows = []
+    print(f"orjson: {'yes' if orjson is not None else 'no (standard library fallback)'}")
+    print(f"{'case':<28} {'bytes':>9} {'gzip':>8} {'CPU us':>9}")
+    for entries in entry_counts:
+        data = make_portfolio(entries)
+        files, sections = generator.generate_with_sections(data, "template1")
+        html = files["html"]
+        generate_body = {"success": True, "files": files, "sections": sections}
+
+        variants = {
+            "envelope dict": lambda: JSONResponse(jsonable_encoder({"success": True, "data": data.model_dump()})).body,
+            "envelope model_dump_json": lambda: success_response(data).body,
+            "generate json.dumps": lambda: json.dumps(generate_body).encode(),
+            "generate dumps": lambda: dumps(generate_body),
+            "generate html": lambda: html.encode(),
+        }
+        for name, fn in variants.items():
+            body = fn()
+            cpu = cpu_per_call(fn, iterations)
+            label = f"{name} entries={entries}"
+            print(f"{label:<28} {len(body):>9} {len(gzip.compress(body, 6)):>8} {cpu * 1e6:>9.1f}")
+            rows.append(case(label, bytes=len(body), gzip_bytes=len(gzip.compress(body, 6)), cpu_us=cpu * 1e6))
+    return rows
+
+
+async def _measure_endpoint(entries: int, requests: int) -> list:
+    import httpx
+
+    from app.main import app
+
+    base = make_portfolio(entries).model_dump(mode="json")
+    formats = {
+        "json": "/api/v1/portfolio/generate",
+        "html": "/api/v1/portfolio/generate?format=html",
+        "html stream": "/api/v1/portfolio/generate?format=html&stream=true",
+    }
+    rows = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, path in formats.items():
+            sizes = []
+            start = time.process_time()
+            for i in range(requests):
+                data = dict(base, summary=f"{base['summary']} ({name} {i})")
+                response = await client.post(path, json={"data": data, "template": "template1"})
+                response.raise_for_status()
+                sizes.append(len(response.content))
+            cpu = (time.process_time() - start) / requests
+            label = f"POST /generate {name} entries={entries}"
+            print(f"{label:<40} {sum(sizes) / len(sizes):>9.0f} {cpu * 1e6:>9.1f}")
+            rows.append(case(label, bytes=sum(sizes) / len(sizes), cpu_us=cpu * 1e6))
+    return rows
+
+
+def run_endpoint(entry_counts: list, requests: int) -> list:
+    os.environ.setdefault("OPENAI_API_KEY", "mock-key")
+    print(f"\n{'endpoint':<40} {'bytes':>9} {'CPU us':>9}")
+    rows = []
+    for entries in entry_counts:
+        rows.extend(asyncio.run(_measure_endpoint(entries, requests)))
+    return rows
+
+
+def run(entry_counts: list, iterations: int, requests: int) -> list:
+    return run_serialization(entry_counts, iterations) + run_endpoint(entry_counts, requests)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=100)
+    add_json_argument(parser)
+    args = parser.parse_args()
+
+    save_if_requested(args, {"responses": run(args.entries, args.iterations, args.requests)})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Model routing benchmark for OpenAIService against the mock OpenAI server.
+
+The mock serves a slow "large" model and a quick "small" one. Three runs:
+
+  single   - every call on the large model (OPENAI_MODEL only, as before)
+  routed   - prompts and patch refines routed to the small model
+  budget   - resume extractions sent with a latency budget below the large
+             model's latency, with and without a fallback model
+
+    python -m benchmarks.bench_routing --requests 20
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from benchmarks.mock_openai import MockOpenAIServer, SAMPLE_PORTFOLIO
+
+LARGE_MODEL = "large-model"
+SMALL_MODEL = "small-model"
+
+
+async def timed_calls(make_call, requests: int) -> list:
+    async def one(i: int) -> float:
+        start = time.perf_counter()
+        await make_call(i)
+        return time.perf_counter() - start
+
+    return sorted(await asyncio.gather(*(one(i) for i in range(requests))))
+
+
+def report(label: str, latencies: list) -> None:
+    print(
+        f"  {label:<28} p50 {statistics.median(latencies) * 1000:>6.0f} ms  "
+        f"max {latencies[-1] * 1000:>6.0f} ms"
+    )
+
+
+async def run(args) -> None:
+    from app.models import PortfolioData
+    from app.services.openai_service import OpenAIService
+    from app.services.model_router import ModelRouter, _latency_budget_ms
+
+    service = OpenAIService()
+    current = PortfolioData(**SAMPLE_PORTFOLIO)
+
+    def mix(tag: str):
+        return {
+            "extract_prompt": lambda i: service.extract_from_prompt(f"{tag} {i}: a backend engineer in Berlin"),
+            "refine_patch": lambda i: service.refine_portfolio(current, f"{tag} {i}: shorten the summary", "patch"),
+            "extract_resume": lambda i: service.extract_portfolio_data(f"{tag} {i}\nSenior Engineer at Acme Corp"),
+        }
+
+    for label, router in (
+        ("single", ModelRouter(default_model=LARGE_MODEL)),
+        ("routed", ModelRouter(
+            default_model=LARGE_MODEL,
+            fast_model=SMALL_MODEL,
+            fast_operations=["extract_prompt", "refine_patch"]
+        )),
+    ):
+        service.router = router
+        print(f"{label}:")
+        for operation, make_call in mix(label).items():
+            report(operation, await timed_calls(make_call, args.requests))
+
+    budget_ms = args.budget_ms
+    print(f"budget: extract_resume with X-Latency-Budget-Ms {budget_ms:.0f}")
+    token = _latency_budget_ms.set(budget_ms)
+    try:
+        for label, router in (
+            ("no fallback", ModelRouter(default_model=LARGE_MODEL, fast_model=SMALL_MODEL)),
+            ("fallback to small", ModelRouter(
+                default_model=LARGE_MODEL,
+                fast_model=SMALL_MODEL,
+                fallback_model=SMALL_MODEL
+            )),
+        ):
+            service.router = router
+            make_call = mix(label)["extract_resume"]
+            failures = 0
+
+            async def guarded(i: int) -> None:
+                nonlocal failures
+                try:
+                    await make_call(i)
+                except Exception:
+                    failures += 1
+
+            # The first calls time out on the large model; once its latency
+            # history is over the budget the router picks the small model
+            latencies = []
+            for round_number in range(3):
+                latencies.extend(await timed_calls(lambda i: guarded(round_number * 1000 + i), args.requests))
+            latencies.sort()
+            report(f"{label} ({failures} failed)", latencies)
+            decisions = router.snapshot()["recent"]
+            reasons = {}
+            for decision in decisions:
+                key = f"{decision['used_model']}/{decision['reason']}/{decision['outcome']}"
+                reasons[key] = reasons.get(key, 0) + 1
+            print(f"    decisions: {reasons}")
+    finally:
+        _latency_budget_ms.reset(token)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--large-delay", type=float, default=1.2)
+    parser.add_argument("--small-delay", type=float, default=0.15)
+    parser.add_argument("--budget-ms", type=float, default=900)
+    parser.add_argument("--port", type=int, default=8100)
+    args = parser.parse_args()
+
+    delays = {LARGE_MODEL: args.large_delay, SMALL_MODEL: args.small_delay}
+    with MockOpenAIServer(port=args.port, delay=args.large_delay, model_delays=delays) as server:
+        os.environ.setdefault("OPENAI_API_KEY", "mock-key")
+        os.environ["OPENAI_BASE_URL"] = server.base_url
+        os.environ["OPENAI_MAX_RETRIES"] = "0"
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark for the rule-based extraction fast path.
+
+Structures each sample resume with the rules enabled and disabled against
+the mock OpenAI server, and reports which path was taken, the LLM calls
+made and the latency.
+
+    python -m benchmarks.bench_rules --delay 0.8
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from benchmarks.documents import SAMPLE_RESUMES
+from benchmarks.mock_openai import MockOpenAIServer
+
+
+async def run(rules: bool, repeats: int, server) -> dict:
+    from app.config import settings
+    from app.services.nlp_extractor import NLPExtractor
+
+    settings.RULE_EXTRACTION_ENABLED = rules
+    extractor = NLPExtractor()
+    rows = {}
+    for name, text in SAMPLE_RESUMES.items():
+        calls_before = server.app.state.calls
+        latencies = []
+        for i in range(repeats):
+            start = time.perf_counter()
+            # Distinct text per repeat so single-flight and caches stay out of it
+            await extractor._structure(f"{text}\n{' ' * i}")
+            latencies.append(time.perf_counter() - start)
+        confidence = extractor.rule_extractor.extract(text)
+        rows[name] = (
+            confidence.confidence,
+            ",".join(confidence.missing) or "-",
+            (server.app.state.calls - calls_before) / repeats,
+            statistics.median(latencies),
+        )
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--delay", type=float, default=0.8, help="Mock LLM latency in seconds")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8109)
+    args = parser.parse_args()
+
+    with MockOpenAIServer(port=args.port, delay=args.delay) as server:
+        os.environ.setdefault("OPENAI_API_KEY", "mock-key")
+        os.environ["OPENAI_BASE_URL"] = server.base_url
+
+        async def both():
+            # One event loop for both runs, since the OpenAI client is shared
+            return await run(False, args.repeats, server), await run(True, args.repeats, server)
+
+        baseline, fast = asyncio.run(both())
+
+    print(f"{'resume':>10} {'confidence':>10} {'missing':>28} {'llm calls':>14} {'p50 ms':>16}")
+    for name in SAMPLE_RESUMES:
+        confidence, missing, calls, latency = fast[name]
+        _, _, base_calls, base_latency = baseline[name]
+        print(
+            f"{name:>10} {confidence:>10.2f} {missing[:28]:>28} "
+            f"{base_calls:>6.1f} -> {calls:<5.1f} {base_latency * 1000:>7.1f} -> {latency * 1000:<7.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Published site benchmark: serving a portfolio page per request.
+
+  generate miss   POST /generate/{id}?format=html with an empty render
+                  cache: render and compress on every request
+  generate hit    the same with the render cache warm (compressed body
+                  kept in memory)
+  site            GET /sites/{id}/ of the published page: the .br/.gz
+                  sibling read from disk (the page cache after the first
+                  read), nothing rendered or compressed
+  site range      GET with Range: bytes=0-1023 (resumed downloads)
+
+Requests go through the ASGI app in-process with Accept-Encoding:
+gzip, br; CPU time covers the app and the in-process client. Under
+uvicorn the file is still read in chunks (it has no zero-copy send), but
+nothing is rendered, compressed or copied into a cache per request.
+
+    python -m benchmarks.bench_sites --entries 1 10 50 --requests 300
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from benchmarks.documents import make_portfolio
+from benchmarks.results import add_json_argument, case, save_if_requested
+
+
+async def _measure(entries: int, requests: int, store) -> list:
+    import httpx
+
+    from app.main import app
+    from app.services.render_cache import get_render_cache
+
+    portfolio_id = store.create(make_portfolio(entries)).id
+    render_cache = get_render_cache()
+    headers = {"Accept-Encoding": "gzip, br"}
+
+    def clear_cache():
+        render_cache._entries.clear()
+
+    scenarios = {
+        "generate miss": ("POST", f"/api/v1/portfolio/generate/{portfolio_id}?format=html", {}, clear_cache),
+        "generate hit": ("POST", f"/api/v1/portfolio/generate/{portfolio_id}?format=html", {}, None),
+        "site": ("GET", f"/sites/{portfolio_id}/", {}, None),
+        "site range": ("GET", f"/sites/{portfolio_id}/", {"Range": "bytes=0-1023"}, None),
+    }
+
+    rows = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        published = await client.post(f"/api/v1/portfolio/publish/{portfolio_id}")
+        published.raise_for_status()
+        for name, (method, path, extra, before) in scenarios.items():
+            await client.request(method, path, headers={**headers, **extra})
+            sizes = []
+            wall = cpu = 0.0
+            for _ in range(requests):
+                if before is not None:
+                    before()
+                start_wall, start_cpu = time.perf_counter(), time.process_time()
+                response = await client.request(method, path, headers={**headers, **extra})
+                wall += time.perf_counter() - start_wall
+                cpu += time.process_time() - start_cpu
+                if response.status_code not in (200, 206):
+                    raise RuntimeError(f"{method} {path} returned {response.status_code}")
+                sizes.append(int(response.headers["content-length"]))
+            label = f"{name} entries={entries}"
+            print(f"{label:<28} {sum(sizes) / requests:>9.0f} {wall / requests * 1e6:>9.1f} {cpu / requests * 1e6:>9.1f}")
+            rows.append(case(
+                label,
+                wire_bytes=sum(sizes) / requests,
+                latency_us=wall / requests * 1e6,
+                cpu_us=cpu / requests * 1e6
+            ))
+    return rows
+
+
+def run(entry_counts: list, requests: int) -> list:
+    os.environ.setdefault("OPENAI_API_KEY", "mock-key")
+    from app.main import app
+    from app.services.portfolio_store import InMemoryPortfolioStore, get_portfolio_store
+    from app.services.static_sites import SitePublisher, get_site_publisher
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Publish into a scratch directory, whatever SITES_DIR says
+        store = InMemoryPortfolioStore()
+        publisher = SitePublisher(directory)
+        app.dependency_overrides[get_portfolio_store] = lambda: store
+        app.dependency_overrides[get_site_publisher] = lambda: publisher
+        try:
+            print(f"{'case':<28} {'bytes':>9} {'wall us':>9} {'CPU us':>9}")
+            rows = []
+            for entries in entry_counts:
+                rows.extend(asyncio.run(_measure(entries, requests, store)))
+            return rows
+        finally:
+            app.dependency_overrides.clear()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--requests", type=int, default=300)
+    add_json_argument(parser)
+    args = parser.parse_args()
+
+    save_if_requested(args, {"sites": run(args.entries, args.requests)})
+
+
+if __name__ == "__main__":
+    main()
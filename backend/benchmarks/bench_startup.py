@@ -0,0 +1,140 @@
+"""
+Cold start benchmark and budget check for the FastAPI app.
+
+Each run is a fresh interpreter, as in a new container:
+
+  import   time to `import app.main`, and which heavy modules it loaded
+           (the LLM SDK and document parsers should load on first use)
+  health   time from starting uvicorn to the first 200 from /health
+
+Runs without OPENAI_API_KEY by default, since the app must start without
+it. With budgets set, exits with status 1 when the median run is over a
+budget or a heavy module was imported eagerly, so CI can catch a
+regression in startup time.
+
+    python -m benchmarks.bench_startup --runs 5
+    python -m benchmarks.bench_startup --budget-import-ms 1500 --budget-health-ms 3000
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks.results import add_json_argument, case, save_if_requested
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Modules that must not be imported by `import app.main`
+HEAVY_MODULES = ("openai", "httpx", "PyPDF2", "docx")
+
+IMPORT_SCRIPT = f"""
+import json, sys, time
+start = time.perf_counter()
+import app.main
+seconds = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": seconds,
+    "modules": len(sys.modules),
+    "heavy": [name for name in {HEAVY_MODULES!r} if name in sys.modules],
+}}))
+"""
+
+
+def _env(with_key: bool) -> dict:
+    env = dict(os.environ)
+    env.pop("OPENAI_API_KEY", None)
+    if with_key:
+        env["OPENAI_API_KEY"] = "mock-key"
+    return env
+
+
+def measure_import(with_key: bool) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT],
+        cwd=BACKEND_DIR,
+        env=_env(with_key),
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def measure_first_health(port: int, with_key: bool, timeout: float = 60.0) -> float:
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=_env(with_key)
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                    return time.perf_counter() - start
+            except httpx.HTTPError:
+                pass
+            if process.poll() is not None:
+                raise RuntimeError("The app exited during startup")
+            time.sleep(0.01)
+        raise RuntimeError("The app did not answer /health in time")
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def run(runs: int, port: int, with_key: bool = False) -> list:
+    imports = [measure_import(with_key) for _ in range(runs)]
+    healths = [measure_first_health(port, with_key) for _ in range(runs)]
+
+    import_ms = statistics.median(result["seconds"] for result in imports) * 1000
+    health_ms = statistics.median(healths) * 1000
+    heavy = sorted({name for result in imports for name in result["heavy"]})
+    print(f"import app.main     {import_ms:8.1f} ms  (median of {runs}, {imports[0]['modules']} modules)")
+    print(f"first /health       {health_ms:8.1f} ms  (median of {runs}, from process start)")
+    print(f"heavy modules       {', '.join(heavy) or 'none'}")
+
+    return [case(
+        "cold start" + (" with key" if with_key else ""),
+        import_ms=import_ms,
+        first_health_ms=health_ms,
+        modules=imports[0]["modules"],
+        heavy_modules=len(heavy)
+    )]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8005)
+    parser.add_argument("--with-key", action="store_true", help="Set OPENAI_API_KEY (to a dummy value)")
+    parser.add_argument("--budget-import-ms", type=float, default=None)
+    parser.add_argument("--budget-health-ms", type=float, default=None)
+    add_json_argument(parser)
+    args = parser.parse_args()
+
+    rows = run(args.runs, args.port, args.with_key)
+    save_if_requested(args, {"startup": rows})
+
+    failures = []
+    metrics = rows[0]["metrics"]
+    if args.budget_import_ms is not None and metrics["import_ms"] > args.budget_import_ms:
+        failures.append(f"import took {metrics['import_ms']:.0f} ms (budget {args.budget_import_ms:g} ms)")
+    if args.budget_health_ms is not None and metrics["first_health_ms"] > args.budget_health_ms:
+        failures.append(f"first /health took {metrics['first_health_ms']:.0f} ms (budget {args.budget_health_ms:g} ms)")
+    if metrics["heavy_modules"] and (args.budget_import_ms is not None or args.budget_health_ms is not None):
+        failures.append("heavy modules were imported eagerly")
+    for failure in failures:
+        print(f"OVER BUDGET: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Edit session benchmark: stateless routes vs the portfolio store.
+
+A client refines and regenerates a portfolio --edits times:
+
+  stateless  POST /refine with the whole current_data, then POST /generate
+             with the whole data
+  by id      POST /refine/{id} with only the refinement, POST /generate/{id}
+             with no body, then a GET /{id} with If-None-Match to check it
+             is up to date (304), which the stateless client cannot do
+
+Reported per edit: bytes the client uploads, bytes it downloads, and CPU
+time of the app (with the in-process client and the mock LLM, which do the
+same work in both modes). Refines use patch mode, so the document keeps
+its size and the difference comes from what each request carries.
+
+    python -m benchmarks.bench_store --entries 1 10 50 --edits 20
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from benchmarks.documents import make_portfolio
+from benchmarks.mock_openai import MockOpenAIServer
+from benchmarks.results import add_json_argument, case, save_if_requested
+
+BASE = "/api/v1/portfolio"
+
+
+class Traffic:
+    """Counts request and response bytes through an httpx client"""
+
+    def __init__(self):
+        self.sent = 0
+        self.received = 0
+
+    async def request(self, client, method: str, path: str, **kwargs):
+        response = await client.request(method, path, **kwargs)
+        if response.status_code not in (200, 304):
+            raise RuntimeError(f"{method} {path} returned {response.status_code}: {response.text[:200]}")
+        self.sent += len(response.request.content or b"")
+        self.received += len(response.content)
+        return response
+
+
+async def _stateless_session(client, data: dict, edits: int, traffic: Traffic) -> None:
+    for i in range(edits):
+        refined = await traffic.request(client, "POST", f"{BASE}/refine", json={
+            "current_data": data,
+            "refinement": f"edit {i}",
+            "mode": "patch"
+        })
+        data = refined.json()["data"]
+        await traffic.request(client, "POST", f"{BASE}/generate", json={"data": data, "template": "template1"})
+
+
+async def _by_id_session(client, portfolio_id: str, edits: int, traffic: Traffic) -> None:
+    etag = None
+    for i in range(edits):
+        headers = {"If-Match": etag} if etag else {}
+        refined = await traffic.request(client, "POST", f"{BASE}/refine/{portfolio_id}", headers=headers, json={
+            "refinement": f"edit {i}",
+            "mode": "patch"
+        })
+        etag = refined.headers["etag"]
+        await traffic.request(client, "POST", f"{BASE}/generate/{portfolio_id}")
+        await traffic.request(client, "GET", f"{BASE}/{portfolio_id}", headers={"If-None-Match": etag})
+
+
+async def _measure(entries: int, edits: int) -> list:
+    import httpx
+
+    from app.main import app
+    from app.services.portfolio_store import get_portfolio_store
+
+    data = make_portfolio(entries).model_dump(mode="json")
+    rows = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        # Untimed first pass, so lazy imports and template loading are not counted
+        await _stateless_session(client, data, 1, Traffic())
+        await _by_id_session(client, get_portfolio_store().create(make_portfolio(entries)).id, 1, Traffic())
+        for mode in ("stateless", "by id"):
+            traffic = Traffic()
+            start = time.process_time()
+            if mode == "stateless":
+                await _stateless_session(client, data, edits, traffic)
+            else:
+                portfolio_id = get_portfolio_store().create(make_portfolio(entries)).id
+                await _by_id_session(client, portfolio_id, edits, traffic)
+            cpu = (time.process_time() - start) / edits
+            label = f"{mode} entries={entries}"
+            print(f"{label:<24} {traffic.sent / edits:>10.0f} {traffic.received / edits:>10.0f} {cpu * 1e3:>9.2f}")
+            rows.append(case(
+                label,
+                sent_bytes_per_edit=traffic.sent / edits,
+                received_bytes_per_edit=traffic.received / edits,
+                cpu_ms_per_edit=cpu * 1e3
+            ))
+    return rows
+
+
+def run(entry_counts: list, edits: int, mock_port: int = 8106) -> list:
+    with tempfile.TemporaryDirectory() as directory, MockOpenAIServer(port=mock_port, delay=0) as mock:
+        os.environ["OPENAI_API_KEY"] = "mock-key"
+        os.environ["OPENAI_BASE_URL"] = mock.base_url
+        os.environ.setdefault("PORTFOLIO_STORE_PATH", os.path.join(directory, "portfolios.sqlite3"))
+        print(f"{'session':<24} {'sent B':>10} {'recv B':>10} {'CPU ms':>9}  (per edit)")
+        rows = []
+        for entries in entry_counts:
+            rows.extend(asyncio.run(_measure(entries, edits)))
+        return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--edits", type=int, default=20)
+    parser.add_argument("--mock-port", type=int, default=8106)
+    add_json_argument(parser)
+    args = parser.parse_args()
+
+    save_if_requested(args, {"store": run(args.entries, args.edits, args.mock_port)})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Memory benchmark for upload handling.
+
+Compares peak Python heap while taking in a large multipart upload the
+old way (the form parser spools the file, then await file.read() hands
+the bytes to the parse pool) and through receive_upload (the body is
+parsed as it streams in and written once into a spooled file, hashed on
+the way).
+
+    python -m benchmarks.bench_upload --mb 8
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from starlette.requests import Request
+
+from benchmarks.documents import make_pdf
+
+BOUNDARY = "benchboundary"
+CHUNK = 64 * 1024
+
+
+def make_body(content: bytes) -> bytes:
+    return (
+        f"--{BOUNDARY}\r\n"
+        'Content-Disposition: form-data; name="file"; filename="resume.pdf"\r\n'
+        "Content-Type: application/pdf\r\n\r\n"
+    ).encode() + content + f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+def make_request(body: bytes) -> Request:
+    chunks = [body[i:i + CHUNK] for i in range(0, len(body), CHUNK)]
+
+    async def receive():
+        chunk = chunks.pop(0) if chunks else b""
+        return {"type": "http.request", "body": chunk, "more_body": bool(chunks)}
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/",
+        "headers": [(b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode())],
+    }
+    return Request(scope, receive)
+
+
+async def read_whole(request: Request) -> None:
+    from app.services.extraction_cache import ExtractionCache
+
+    form = await request.form()
+    data = await form["file"].read()
+    ExtractionCache.make_key(data, "model", "1")
+    await form.close()
+
+
+async def read_spooled(request: Request) -> None:
+    from app.services.extraction_cache import ExtractionCache
+    from app.services.uploads import receive_upload
+
+    upload, _ = await receive_upload(request)
+    with upload:
+        ExtractionCache.key_from_digest(upload.digest(), "model", "1")
+        upload.parse_source()
+
+
+def measure(fn, body: bytes) -> tuple:
+    # The request body chunks themselves are allocated before tracing starts
+    request = make_request(body)
+    tracemalloc.start()
+    start = time.perf_counter()
+    asyncio.run(fn(request))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mb", type=int, default=8)
+    args = parser.parse_args()
+
+    pdf = make_pdf(2)
+    # Pad a real PDF to the requested size so the sniffer accepts it
+    content = pdf + b"%" + b"0" * (args.mb * 1024 * 1024 - len(pdf) - 1)
+    body = make_body(content)
+
+    print(f"upload: {len(content) / 1024 / 1024:.1f} MB")
+    # Import outside the measurement
+    import app.services.uploads  # noqa: F401
+
+    for label, fn in (("form + read()", read_whole), ("receive_upload", read_spooled)):
+        peak, elapsed = measure(fn, body)
+        print(f"  {label:<16} peak heap {peak / 1024 / 1024:>6.2f} MB  {elapsed * 1000:>6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
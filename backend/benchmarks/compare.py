@@ -0,0 +1,71 @@
+"""
+Compare two benchmark result files.
+
+Prints every metric present in both runs with its relative change, and
+marks changes past the threshold in the wrong direction as regressions
+(higher cost, or lower throughput). Exits with status 1 if any were found,
+so a CI job can fail on them.
+
+    python -m benchmarks.compare base.json new.json --threshold 10
+"""
+import argparse
+import json
+import sys
+
+from benchmarks.results import HIGHER_IS_BETTER
+
+# Counts rather than measurements; shown but never flagged
+INFORMATIONAL = {"errors"}
+
+
+def load(path: str) -> dict:
+    with open(path) as handle:
+        document = json.load(handle)
+    metrics = {}
+    for benchmark, rows in document["benchmarks"].items():
+        for row in rows:
+            for name, value in row["metrics"].items():
+                metrics[(benchmark, row["case"], name)] = value
+    return document.get("meta", {}), metrics
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Percent change to flag")
+    parser.add_argument("--only-changes", action="store_true", help="Hide metrics within the threshold")
+    args = parser.parse_args()
+
+    base_meta, base = load(args.base)
+    new_meta, new = load(args.new)
+    print(f"base: {base_meta.get('commit')} {base_meta.get('created')}")
+    print(f"new:  {new_meta.get('commit')} {new_meta.get('created')}\n")
+
+    regressions = 0
+    current = None
+    for key in sorted(base.keys() & new.keys()):
+        benchmark, case_name, metric = key
+        old, value = base[key], new[key]
+        change = (value - old) / old * 100 if old else 0.0
+        worse = -change if metric in HIGHER_IS_BETTER else change
+        flag = ""
+        if metric not in INFORMATIONAL and abs(change) >= args.threshold:
+            flag = "REGRESSION" if worse > 0 else "improved"
+            regressions += worse > 0
+        if args.only_changes and not flag:
+            continue
+        if benchmark != current:
+            print(f"[{benchmark}]")
+            current = benchmark
+        print(f"  {case_name:<24} {metric:<18} {old:>12.2f} -> {value:>12.2f}  {change:>+7.1f}%  {flag}")
+
+    missing = sorted(base.keys() - new.keys())
+    if missing:
+        print(f"\n{len(missing)} metric(s) only in base, e.g. {missing[0]}")
+    print(f"\n{regressions} regression(s) past {args.threshold:g}%")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""
+Synthetic resume documents for benchmarks.
+"""
+import io
+
+import docx
+
+LINES_PER_PAGE = 40
+
+SAMPLE_LINES = [
+    "Senior Software Engineer at Acme Corp, Jan 2019 - Present",
+    "Designed and operated Python services handling 2M requests per day",
+    "Led migration of the billing pipeline to event-driven architecture",
+    "Mentored four engineers and ran the backend interview loop",
+    "Skills: Python, FastAPI, PostgreSQL, Redis, Kubernetes, Terraform",
+    "Education: MSc Computer Science, Technical University, 2014 - 2016",
+    "Project: portfogen - AI portfolio generator built with FastAPI",
+    "Published 3 papers on distributed systems and data processing",
+]
+
+
+def _line(page: int, index: int) -> str:
+    return f"{SAMPLE_LINES[index % len(SAMPLE_LINES)]} ({page}.{index})"
+
+
+def make_pdf(pages: int, salt: str = "") -> bytes:
+    """
+    Build a text PDF with the given number of pages
+
+    Args:
+        pages: Number of pages
+        salt: Extra text written into the trailer so otherwise identical
+            documents hash differently
+
+    Returns:
+        PDF file content as bytes
+    """
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_refs = []
+
+    for page in range(pages):
+        lines = [b"BT /F1 10 Tf 50 800 Td 14 TL"]
+        for index in range(LINES_PER_PAGE):
+            text = _line(page, index).replace("(", "[").replace(")", "]")
+            lines.append(f"({text}) '".encode("latin-1"))
+        lines.append(b"ET")
+        stream = b"\n".join(lines)
+
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_ref = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_ref
+        )
+        page_refs.append(len(objects))
+
+    kids = b" ".join(b"%d 0 R" % ref for ref in page_refs)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, pages)
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+
+    xref_offset = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\n" % (len(objects) + 1))
+    out.write(b"startxref\n%d\n%%%%EOF\n" % xref_offset)
+    if salt:
+        out.write(f"% {salt}\n".encode())
+    return out.getvalue()
+
+
+def make_docx(pages: int, salt: str = "") -> bytes:
+    """
+    Build a DOCX with roughly the given number of pages of paragraphs
+
+    Args:
+        pages: Number of pages worth of text
+        salt: Extra paragraph so otherwise identical documents hash differently
+
+    Returns:
+        DOCX file content as bytes
+    """
+    document = docx.Document()
+    for page in range(pages):
+        for index in range(LINES_PER_PAGE):
+            document.add_paragraph(_line(page, index))
+    if salt:
+        document.add_paragraph(salt)
+
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def make_portfolio(entries: int):
+    """
+    Build a PortfolioData with the given number of experience, education
+    and project entries
+
+    Args:
+        entries: Entries per list section
+
+    Returns:
+        PortfolioData instance
+    """
+    from app.models import PortfolioData
+
+    return PortfolioData(
+        personal_info={
+            "name": "Jane Doe",
+            "email": "jane@example.com",
+            "phone": "+1 555 0100",
+            "location": "Berlin, Germany",
+            "linkedin": "https://linkedin.com/in/janedoe",
+            "github": "https://github.com/janedoe",
+            "website": "https://janedoe.dev"
+        },
+        summary="Backend engineer focused on APIs, data pipelines and developer tooling.",
+        experience=[
+            {
+                "company": f"Company {i}",
+                "position": "Senior Engineer",
+                "start_date": "Jan 2020",
+                "end_date": None if i == 0 else "Dec 2021",
+                "description": SAMPLE_LINES[i % len(SAMPLE_LINES)],
+                "responsibilities": SAMPLE_LINES[:4]
+            }
+            for i in range(entries)
+        ],
+        education=[
+            {
+                "institution": f"University {i}",
+                "degree": "Master of Science",
+                "field": "Computer Science",
+                "start_date": "2014",
+                "end_date": "2016",
+                "gpa": "3.8/4.0"
+            }
+            for i in range(entries)
+        ],
+        skills=["Python", "FastAPI", "PostgreSQL", "Redis", "Kubernetes", "Terraform"] * max(1, entries // 2),
+        projects=[
+            {
+                "name": f"Project {i}",
+                "description": SAMPLE_LINES[i % len(SAMPLE_LINES)],
+                "technologies": ["Python", "FastAPI", "React"],
+                "link": f"https://example.com/{i}",
+                "github": f"https://github.com/janedoe/project-{i}"
+            }
+            for i in range(entries)
+        ],
+        certifications=["AWS Solutions Architect"]
+    )
+
+
+# Plain-text resumes in common layouts, as ResumeParser would return them
+SAMPLE_RESUMES = {
+    "classic": """Jane Doe
+Berlin, Germany | jane.doe@example.com | +49 30 1234 5678
+linkedin.com/in/janedoe | github.com/janedoe
+
+Summary
+Backend engineer with 8 years of experience building APIs and data pipelines.
+
+Experience
+Senior Software Engineer at Acme Corp, Jan 2019 - Present
+• Designed and operated Python services handling 2M requests per day
+• Led migration of the billing pipeline to an event-driven architecture
+Software Engineer at Globex, Mar 2015 - Dec 2018
+• Built the internal reporting API in Django
+• Cut nightly ETL runtime from 4 hours to 40 minutes
+
+Education
+MSc Computer Science, Technical University of Munich, 2013 - 2015
+BSc Computer Science, University of Hamburg, 2010 - 2013
+
+Skills
+Python, FastAPI, PostgreSQL, Redis, Kubernetes, Terraform
+
+Projects
+portfogen - AI portfolio generator built with FastAPI
+Technologies: Python, FastAPI, React
+queuebench - Load testing harness for message brokers
+
+Certifications
+AWS Certified Solutions Architect
+""",
+    "stacked": """JOHN SMITH
+john.smith@example.org
+(555) 123-4567
+San Francisco, CA
+https://johnsmith.dev
+
+PROFESSIONAL EXPERIENCE
+Stripe
+Staff Engineer | Jun 2020 - Present
+- Owned the payouts reconciliation service
+- Mentored six engineers
+Dropbox
+Software Engineer | Aug 2016 - May 2020
+- Worked on sync engine performance
+
+EDUCATION
+Stanford University
+Bachelor of Science in Computer Science, 2012 - 2016
+GPA: 3.9/4.0
+
+TECHNICAL SKILLS
+Languages: Go, Python, Rust
+Infrastructure: AWS, Kubernetes, Terraform
+""",
+    "undated": """Alex Chen
+alex.chen@example.com | +1 415 555 0199
+
+Experience
+Platform team lead at a logistics scale-up, most recently running on-call and the
+migration off the monolith; before that several years of backend work in Java.
+
+Education
+BA Mathematics, University of Toronto, 2008 - 2012
+
+Skills
+Java, Kotlin, Kafka, PostgreSQL
+""",
+    "freeform": """Maria Garcia - resume
+I am a designer who has worked with many startups over the last decade on branding,
+product design and marketing sites. Before that I studied fine arts and spent a few
+years freelancing. Recently I have been leading a small design team and teaching
+evening classes on interaction design. My clients include several fintech companies
+and a number of non-profits. I enjoy illustration, typography and motion design.
+""",
+}
@@ -0,0 +1,225 @@
+"""
+End-to-end load test of the FastAPI app against the mock OpenAI server.
+
+Starts the app with uvicorn in a subprocess (pointed at the mock LLM),
+then runs each scenario at a fixed concurrency and reports throughput,
+latency percentiles, errors and the server's resident memory (its own
+process plus worker processes such as the parse pool).
+
+Scenarios:
+  health           GET /health, the framework floor
+  generate         POST /generate with a different portfolio each time
+  generate_cached  POST /generate with the same portfolio (render cache)
+  prompt           POST /extract/prompt, one mock LLM call each
+  resume           POST /extract/resume with a different PDF each time
+
+    python -m benchmarks.load_app --requests 200 --concurrency 16
+    python -m benchmarks.load_app --scenarios generate prompt --json
+    python -m benchmarks.load_app --workers 4   # run.py --prod, shared state
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks.documents import make_pdf, make_portfolio
+from benchmarks.mock_openai import MockOpenAIServer
+from benchmarks.results import add_json_argument, case, latency_summary, rss_bytes, save_if_requested
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+SCENARIOS = ("health", "generate", "generate_cached", "prompt", "resume")
+
+
+def process_tree(pid: int) -> list:
+    """pid and all of its descendants"""
+    pids = [pid]
+    for parent in pids:
+        try:
+            children = Path(f"/proc/{parent}/task/{parent}/children").read_text().split()
+        except OSError:
+            continue
+        pids.extend(int(child) for child in children)
+    return pids
+
+
+def tree_rss(pid: int) -> int:
+    return sum(rss_bytes(child).get("rss", 0) for child in process_tree(pid))
+
+
+class MemorySampler:
+    """Polls the server's resident memory while a scenario runs"""
+
+    def __init__(self, pid: int, interval: float = 0.05):
+        self.pid = pid
+        self.interval = interval
+        self.peak = 0
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            self.peak = max(self.peak, tree_rss(self.pid))
+            await asyncio.sleep(self.interval)
+
+    def __enter__(self) -> "MemorySampler":
+        self.peak = tree_rss(self.pid)
+        self._task = asyncio.ensure_future(self._run())
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._task.cancel()
+
+
+def request_factory(scenario: str, requests: int):
+    """Build the (method, path, kwargs) for request i of a scenario"""
+    if scenario == "health":
+        return lambda i: ("GET", "/health", {})
+
+    if scenario in ("generate", "generate_cached"):
+        base = make_portfolio(5).model_dump(mode="json")
+
+        def generate(i: int):
+            data = dict(base)
+            if scenario == "generate":
+                data["summary"] = f"{base['summary']} ({i})"
+            return "POST", "/api/v1/portfolio/generate", {"json": {"data": data, "template": "template1"}}
+        return generate
+
+    if scenario == "prompt":
+        return lambda i: (
+            "POST",
+            "/api/v1/portfolio/extract/prompt",
+            {"json": {"prompt": f"Backend engineer #{i} with five years of Python and AWS"}}
+        )
+
+    if scenario == "resume":
+        documents = [make_pdf(2, salt=f"load-{i}") for i in range(requests)]
+        return lambda i: (
+            "POST",
+            "/api/v1/portfolio/extract/resume",
+            {"files": {"file": ("resume.pdf", documents[i], "application/pdf")}}
+        )
+
+    raise ValueError(f"Unknown scenario: {scenario}")
+
+
+async def run_scenario(base_url: str, pid: int, scenario: str, requests: int, concurrency: int) -> dict:
+    make_request = request_factory(scenario, requests)
+    latencies = []
+    errors = 0
+    next_index = 0
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        async def worker() -> None:
+            nonlocal errors, next_index
+            while next_index < requests:
+                index = next_index
+                next_index += 1
+                method, path, kwargs = make_request(index)
+                start = time.perf_counter()
+                try:
+                    response = await client.request(method, path, **kwargs)
+                    if response.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        rss_before = tree_rss(pid)
+        with MemorySampler(pid) as sampler:
+            start = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            wall = time.perf_counter() - start
+
+    return {
+        "rps": requests / wall,
+        **latency_summary(latencies),
+        "errors": errors,
+        "rss_mib": tree_rss(pid) / 1024 / 1024,
+        "rss_before_mib": rss_before / 1024 / 1024,
+        "peak_rss_mib": sampler.peak / 1024 / 1024,
+    }
+
+
+def start_app(port: int, mock_url: str, workers: int = 1, state_dir: str = None) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "mock-key"),
+        "OPENAI_BASE_URL": mock_url,
+    }
+    if workers > 1:
+        # Production launcher, with its shared state kept out of the tree
+        env["SHARED_STATE_PATH"] = os.path.join(state_dir, "state.sqlite3")
+        env["JOB_STORE_PATH"] = os.path.join(state_dir, "jobs.sqlite3")
+        command = [sys.executable, "run.py", "--prod", "--workers", str(workers),
+                   "--host", "127.0.0.1", "--port", str(port)]
+    else:
+        command = [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+                   "--port", str(port), "--log-level", "warning"]
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        if process.poll() is not None:
+            break
+        time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("The app did not start")
+
+
+def run(
+    scenarios: list,
+    requests: int,
+    concurrency: int,
+    port: int,
+    mock_port: int,
+    llm_delay: float,
+    workers: int = 1
+) -> list:
+    rows = []
+    suffix = f" w={workers}" if workers > 1 else ""
+    with MockOpenAIServer(port=mock_port, delay=llm_delay) as mock, tempfile.TemporaryDirectory() as state_dir:
+        process = start_app(port, mock.base_url, workers, state_dir)
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            print(f"{'scenario':<16} {'rps':>8} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'errors':>7} {'RSS MiB':>8} {'peak':>7}")
+            for scenario in scenarios:
+                result = asyncio.run(run_scenario(base_url, process.pid, scenario, requests, concurrency))
+                print(
+                    f"{scenario:<16} {result['rps']:>8.1f} {result['p50_ms']:>8.1f} {result['p90_ms']:>8.1f} "
+                    f"{result['p99_ms']:>8.1f} {result['errors']:>7} {result['rss_mib']:>8.1f} {result['peak_rss_mib']:>7.1f}"
+                )
+                rows.append(case(f"{scenario} c={concurrency}{suffix}", **result))
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--llm-delay", type=float, default=0.2)
+    parser.add_argument("--port", type=int, default=8003)
+    parser.add_argument("--mock-port", type=int, default=8104)
+    parser.add_argument("--workers", type=int, default=1, help="Above 1, start the app with run.py --prod")
+    add_json_argument(parser)
+    args = parser.parse_args()
+
+    rows = run(args.scenarios, args.requests, args.concurrency, args.port, args.mock_port, args.llm_delay, args.workers)
+    save_if_requested(args, {"load_app": rows})
+
+
+if __name__ == "__main__":
+    main()
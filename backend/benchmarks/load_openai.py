@@ -0,0 +1,57 @@
+"""
+Load test for OpenAIService against the local mock OpenAI server.
+
+Fires N extractions at once and compares the wall time with the time a
+serialized client would need (N x mock latency).
+
+    python -m benchmarks.load_openai --requests 50 --delay 0.2
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from benchmarks.mock_openai import MockOpenAIServer
+
+
+async def run_load(requests: int) -> tuple:
+    from app.services.openai_service import OpenAIService
+
+    service = OpenAIService()
+    # Warm the connection pool so the run measures steady state
+    await service.extract_portfolio_data("warmup")
+
+    async def one() -> float:
+        start = time.perf_counter()
+        await service.extract_portfolio_data("Jane Doe\nSenior Engineer at Acme Corp")
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(one() for _ in range(requests)))
+    return time.perf_counter() - start, sorted(latencies)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--delay", type=float, default=0.2)
+    parser.add_argument("--port", type=int, default=8100)
+    args = parser.parse_args()
+
+    with MockOpenAIServer(port=args.port, delay=args.delay) as server:
+        os.environ.setdefault("OPENAI_API_KEY", "mock-key")
+        os.environ["OPENAI_BASE_URL"] = server.base_url
+
+        wall, latencies = asyncio.run(run_load(args.requests))
+
+    serialized = args.requests * args.delay
+    print(f"requests:          {args.requests}")
+    print(f"mock latency:      {args.delay * 1000:.0f} ms")
+    print(f"wall time:         {wall:.2f} s (serialized would be {serialized:.2f} s)")
+    print(f"speedup:           {serialized / wall:.1f}x")
+    print(f"latency p50 / max: {statistics.median(latencies) * 1000:.0f} / {latencies[-1] * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Mixed-load latency check: probe lightweight endpoints while large PDFs are
+being uploaded and parsed.
+
+    python -m benchmarks.mixed_load --pages 200 --uploads 8
+"""
+import argparse
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import uvicorn
+
+from benchmarks.documents import make_pdf
+from benchmarks.mock_openai import MockOpenAIServer
+
+
+def percentile(samples: list, pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def probe(base_url: str, path: str, stop: threading.Event) -> list:
+    latencies = []
+    with httpx.Client(base_url=base_url) as client:
+        while not stop.is_set():
+            start = time.perf_counter()
+            client.get(path)
+            latencies.append(time.perf_counter() - start)
+            time.sleep(0.005)
+    return latencies
+
+
+def report(label: str, latencies: list) -> None:
+    print(
+        f"{label:<28} n={len(latencies):<5} "
+        f"p50={statistics.median(latencies) * 1000:7.1f} ms  "
+        f"p99={percentile(latencies, 99) * 1000:7.1f} ms  "
+        f"max={max(latencies) * 1000:7.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--uploads", type=int, default=8)
+    parser.add_argument("--port", type=int, default=8001)
+    args = parser.parse_args()
+
+    with MockOpenAIServer(port=8102, delay=0.05) as mock:
+        os.environ.setdefault("OPENAI_API_KEY", "mock-key")
+        os.environ["OPENAI_BASE_URL"] = mock.base_url
+        os.environ.setdefault("PARSE_MAX_PAGES", str(args.pages))
+
+        from app.main import app
+
+        server = uvicorn.Server(
+            uvicorn.Config(app, host="127.0.0.1", port=args.port, log_level="warning")
+        )
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        while not server.started:
+            time.sleep(0.01)
+
+        base_url = f"http://127.0.0.1:{args.port}"
+        documents = [make_pdf(args.pages, salt=str(i)) for i in range(args.uploads)]
+
+        # Idle baseline
+        stop = threading.Event()
+        timer = threading.Timer(1.0, stop.set)
+        timer.start()
+        idle = probe(base_url, "/health", stop)
+
+        def upload(document: bytes) -> int:
+            with httpx.Client(base_url=base_url, timeout=120) as client:
+                response = client.post(
+                    "/api/v1/portfolio/extract/resume",
+                    files={"file": ("resume.pdf", document, "application/pdf")}
+                )
+                return response.status_code
+
+        stop = threading.Event()
+        with ThreadPoolExecutor(max_workers=args.uploads + 2) as pool:
+            health = pool.submit(probe, base_url, "/health", stop)
+            templates = pool.submit(probe, base_url, "/api/v1/portfolio/templates", stop)
+            start = time.perf_counter()
+            statuses = list(pool.map(upload, documents))
+            upload_wall = time.perf_counter() - start
+            stop.set()
+
+        server.should_exit = True
+        thread.join()
+
+    print(f"uploads: {args.uploads} x {args.pages}-page PDF, statuses {sorted(set(statuses))}, "
+          f"wall {upload_wall:.2f} s")
+    report("/health (idle)", idle)
+    report("/health (under load)", health.result())
+    report("/templates (under load)", templates.result())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""
+Local mock of the OpenAI chat completions API used by the benchmarks.
+
+Run standalone with:
+    python -m benchmarks.mock_openai --port 8100 --delay 0.2
+
+Faults can be injected for the resilience benchmarks, either up front
+(--failure-rate, --slow-rate, ...) or at runtime with
+POST /mock/faults {"failure_rate": 0.3, "error_status": 503}.
+"""
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+import uuid
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+SAMPLE_PORTFOLIO = {
+    "personal_info": {
+        "name": "Jane Doe",
+        "email": "jane@example.com",
+        "phone": "+1 555 0100",
+        "location": "Berlin, Germany",
+        "linkedin": "linkedin.com/in/janedoe",
+        "github": "github.com/janedoe",
+        "website": None
+    },
+    "summary": "Backend engineer focused on APIs and data pipelines.",
+    "experience": [
+        {
+            "company": "Acme Corp",
+            "position": "Senior Engineer",
+            "start_date": "Jan 2020",
+            "end_date": "Present",
+            "description": "Platform team",
+            "responsibilities": ["Built the ingestion service", "Mentored two engineers"]
+        }
+    ],
+    "education": [
+        {
+            "institution": "TU Berlin",
+            "degree": "Master of Science",
+            "field": "Computer Science",
+            "start_date": "2014",
+            "end_date": "2016",
+            "gpa": None
+        }
+    ],
+    "skills": ["Python", "FastAPI", "PostgreSQL"],
+    "projects": [
+        {
+            "name": "portfogen",
+            "description": "Portfolio generator",
+            "technologies": ["Python"],
+            "link": None,
+            "github": "github.com/janedoe/portfogen"
+        }
+    ],
+    "certifications": []
+}
+
+
+STREAM_CHUNKS = 40
+
+
+async def stream_chunks(content: str, model: str, delay: float):
+    """Stream content as chat.completion.chunk events spread over delay seconds"""
+    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+    size = max(1, len(content) // STREAM_CHUNKS + 1)
+    for start in range(0, len(content), size):
+        await asyncio.sleep(delay / STREAM_CHUNKS)
+        chunk = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [
+                {"index": 0, "delta": {"content": content[start:start + size]}, "finish_reason": None}
+            ]
+        }
+        yield f"data: {json.dumps(chunk)}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+FAULT_FIELDS = ("failure_rate", "error_status", "slow_rate", "slow_delay", "model_delays")
+
+
+def create_app(
+    delay: float = 0.2,
+    failure_rate: float = 0.0,
+    error_status: int = 503,
+    slow_rate: float = 0.0,
+    slow_delay: float = 2.0,
+    seed: int = None,
+    model_delays: dict = None
+) -> FastAPI:
+    """
+    Build the mock app
+
+    Args:
+        delay: Seconds each completion takes, simulating model latency
+        failure_rate: Fraction of requests answered with error_status
+        error_status: HTTP status of injected failures (429 and 503 carry
+            a Retry-After header)
+        slow_rate: Fraction of requests that take slow_delay instead of delay
+        slow_delay: Latency of the slow tail in seconds
+        seed: Seed for the fault dice, for repeatable runs
+        model_delays: Per-model latency overriding delay, e.g.
+            {"big-model": 1.0, "small-model": 0.1}
+
+    Returns:
+        FastAPI application serving /v1/chat/completions
+    """
+    app = FastAPI()
+    app.state.delay = delay
+    app.state.calls = 0
+    app.state.failure_rate = failure_rate
+    app.state.error_status = error_status
+    app.state.slow_rate = slow_rate
+    app.state.slow_delay = slow_delay
+    app.state.random = random.Random(seed)
+    app.state.model_delays = model_delays or {}
+
+    @app.post("/mock/faults")
+    async def set_faults(request: Request):
+        body = await request.json()
+        for field in FAULT_FIELDS:
+            if field in body:
+                setattr(app.state, field, body[field])
+        return {field: getattr(app.state, field) for field in FAULT_FIELDS}
+
+    @app.get("/v1/models")
+    async def list_models():
+        return {"object": "list", "data": [{"id": "mock", "object": "model", "created": 0, "owned_by": "mock"}]}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        app.state.calls += 1
+        if app.state.random.random() < app.state.failure_rate:
+            await asyncio.sleep(app.state.delay / 10)
+            status = app.state.error_status
+            headers = {"Retry-After": "0"} if status in (429, 503) else None
+            return JSONResponse(
+                {"error": {"message": "Injected failure", "type": "server_error", "code": None}},
+                status_code=status,
+                headers=headers
+            )
+        delay = app.state.model_delays.get(body.get("model"), app.state.delay)
+        if app.state.random.random() < app.state.slow_rate:
+            delay = app.state.slow_delay
+        content = json.dumps(SAMPLE_PORTFOLIO, indent=2)
+        system = next((m.get("content") or "" for m in body.get("messages", []) if m.get("role") == "system"), "")
+        if "JSON Patch" in system:
+            content = json.dumps({"patch": [{"op": "replace", "path": "/summary", "value": "Backend engineer."}]})
+
+        if body.get("stream"):
+            return StreamingResponse(
+                stream_chunks(content, body.get("model", "mock"), delay),
+                media_type="text/event-stream"
+            )
+
+        await asyncio.sleep(delay)
+        prompt_chars = sum(len(m.get("content") or "") for m in body.get("messages", []))
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop"
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_chars // 4,
+                "completion_tokens": len(content) // 4,
+                "total_tokens": (prompt_chars + len(content)) // 4
+            }
+        }
+
+    return app
+
+
+class MockOpenAIServer:
+    """
+    Runs the mock app on a background thread for in-process benchmarks
+    """
+
+    def __init__(self, port: int = 8100, delay: float = 0.2, **faults):
+        self.app = create_app(delay, **faults)
+        self.port = port
+        self.server = uvicorn.Server(
+            uvicorn.Config(self.app, host="127.0.0.1", port=port, log_level="warning")
+        )
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    def __enter__(self) -> "MockOpenAIServer":
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.server.should_exit = True
+        self.thread.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--delay", type=float, default=0.2)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--slow-rate", type=float, default=0.0)
+    parser.add_argument("--slow-delay", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    app = create_app(
+        args.delay,
+        failure_rate=args.failure_rate,
+        error_status=args.error_status,
+        slow_rate=args.slow_rate,
+        slow_delay=args.slow_delay,
+        seed=args.seed
+    )
+    uvicorn.run(app, host="127.0.0.1", port=args.port)
@@ -0,0 +1,127 @@
+"""
+Shared helpers for benchmark results: percentiles, process memory and JSON
+result files that benchmarks.compare can diff.
+
+A result file looks like:
+
+    {
+      "meta": {"created": ..., "commit": ..., "python": ..., "cpus": ...},
+      "benchmarks": {
+        "parser": [{"case": "pdf pages=10", "metrics": {"ms": 12.3, ...}}, ...],
+        ...
+      }
+    }
+"""
+import datetime
+import json
+import os
+import platform
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# Metrics where a larger value is an improvement; everything else is a cost
+HIGHER_IS_BETTER = {"rps", "ops_per_s", "success_rate"}
+
+
+def percentile(samples: list, pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def latency_summary(latencies: list) -> Dict[str, float]:
+    """p50/p90/p99/max of a list of seconds, in milliseconds"""
+    if not latencies:
+        return {}
+    return {
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p90_ms": percentile(latencies, 90) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": max(latencies) * 1000,
+    }
+
+
+def rss_bytes(pid: Optional[int] = None) -> Dict[str, int]:
+    """
+    Resident memory of a process from /proc
+
+    Returns:
+        {"rss": current bytes, "peak_rss": high-water mark bytes}, or {}
+        where /proc is not available
+    """
+    path = Path(f"/proc/{pid or 'self'}/status")
+    try:
+        lines = path.read_text().splitlines()
+    except OSError:
+        return {}
+    values = {}
+    for line in lines:
+        key, _, value = line.partition(":")
+        if key in ("VmRSS", "VmHWM"):
+            values["rss" if key == "VmRSS" else "peak_rss"] = int(value.split()[0]) * 1024
+    return values
+
+
+def case(name: str, **metrics: float) -> Dict:
+    """One result row"""
+    return {"case": name, "metrics": {key: round(value, 4) for key, value in metrics.items()}}
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=Path(__file__).parent, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def write_results(benchmarks: Dict[str, List[Dict]], path: Optional[str] = None) -> Path:
+    """
+    Save result rows as JSON
+
+    Args:
+        benchmarks: Rows per benchmark name
+        path: Output file; defaults to benchmarks/results/<timestamp>.json
+
+    Returns:
+        Path written
+    """
+    now = datetime.datetime.now()
+    if path is None:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        path = RESULTS_DIR / f"{now:%Y%m%d-%H%M%S}.json"
+    path = Path(path)
+    document = {
+        "meta": {
+            "created": now.isoformat(timespec="seconds"),
+            "commit": _commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "benchmarks": benchmarks,
+    }
+    path.write_text(json.dumps(document, indent=2))
+    return path
+
+
+def add_json_argument(parser) -> None:
+    parser.add_argument(
+        "--json",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="PATH",
+        help="Save results as JSON (default path: benchmarks/results/<timestamp>.json)"
+    )
+
+
+def save_if_requested(args, benchmarks: Dict[str, List[Dict]]) -> None:
+    if args.json is not None:
+        path = write_results(benchmarks, args.json or None)
+        print(f"\nresults written to {path}")
@@ -0,0 +1,66 @@
+"""
+Run the benchmark suite and save one JSON result file.
+
+Micro-benchmarks (parser, render, models) run in this process; the load
+test starts the app and the mock LLM. Sizes are kept small enough for a
+laptop run in a minute or two; --quick shrinks them further for CI.
+
+    python -m benchmarks.run_all
+    python -m benchmarks.run_all --quick --json results/ci.json
+    python -m benchmarks.compare benchmarks/results/old.json benchmarks/results/new.json
+"""
+import argparse
+import os
+
+from benchmarks.results import write_results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="Smaller sizes and fewer iterations")
+    parser.add_argument("--skip-load", action="store_true", help="Only run the micro-benchmarks")
+    parser.add_argument("--json", default=None, metavar="PATH", help="Output file (default: benchmarks/results/<timestamp>.json)")
+    args = parser.parse_args()
+
+    os.environ.setdefault("OPENAI_API_KEY", "mock-key")
+    from benchmarks import bench_models, bench_parser, bench_render, bench_responses, bench_sites, bench_startup, load_app
+
+    quick = args.quick
+    results = {}
+
+    print("== parser ==")
+    sizes = [1, 10, 50] if quick else [1, 10, 50, 100]
+    results["parser"] = bench_parser.run("pdf", sizes, 1 if quick else 3) + bench_parser.run("docx", sizes, 1 if quick else 3)
+
+    print("\n== render ==")
+    results["render"] = bench_render.run([1, 10, 50], 50 if quick else 500)
+
+    print("\n== models ==")
+    results["models"] = bench_models.run([1, 10, 50], 200 if quick else 2000)
+
+    print("\n== responses ==")
+    results["responses"] = bench_responses.run([1, 10, 50], 50 if quick else 500, 20 if quick else 100)
+
+    print("\n== sites ==")
+    results["sites"] = bench_sites.run([1, 10, 50], 20 if quick else 200)
+
+    if not args.skip_load:
+        print("\n== startup ==")
+        results["startup"] = bench_startup.run(1 if quick else 3, port=8005)
+
+        print("\n== load_app ==")
+        results["load_app"] = load_app.run(
+            list(load_app.SCENARIOS),
+            requests=50 if quick else 200,
+            concurrency=8 if quick else 16,
+            port=8003,
+            mock_port=8104,
+            llm_delay=0.2
+        )
+
+    path = write_results(results, args.json)
+    print(f"\nresults written to {path}")
+
+
+if __name__ == "__main__":
+    main()
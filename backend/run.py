@@ -1,4 +1,47 @@
+"""
+Start the API server.
+
+    python run.py                      development: one process, auto-reload
+    python run.py --prod --workers 4   production: several worker processes
+
+Production mode shares metrics, usage stats, rendered previews, the
+extraction cache and job status between workers through one SQLite file
+(SHARED_STATE_PATH), and each worker warms up before taking traffic.
+Settings already present in the environment or .env take precedence.
+"""
+import argparse
+import os
+
 import uvicorn
+from dotenv import dotenv_values
+
+PROD_DEFAULTS = {
+    "SHARED_STATE_PATH": "portfogen-state.sqlite3",
+    "JOB_STORE": "sqlite",
+    "WARMUP_ON_STARTUP": "true",
+}
 
 if __name__ == "__main__":
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--prod", action="store_true", help="Several workers, no reload")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    if args.prod:
+        # Workers inherit the environment, so they all see the same paths
+        dotenv = dotenv_values(".env")
+        for name, value in PROD_DEFAULTS.items():
+            if name not in dotenv:
+                os.environ.setdefault(name, value)
+        uvicorn.run(
+            "app.main:app",
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            log_level="info",
+            timeout_graceful_shutdown=30
+        )
+    else:
+        uvicorn.run("app.main:app", host=args.host, port=args.port, reload=True)
@@ -0,0 +1,76 @@
+import pytest
+
+from app.services.json_patch import PatchError, apply_patch, parse_pointer
+
+DOCUMENT = {
+    "personal_info": {"name": "Jane Doe", "title": "Engineer"},
+    "skills": ["Python", "Go"],
+    "projects": [{"name": "A"}, {"name": "B"}],
+}
+
+
+def test_parse_pointer_unescapes_tokens():
+    assert parse_pointer("/a~1b/c~0d/0") == ["a/b", "c~d", "0"]
+
+
+def test_replace_add_and_remove_object_members():
+    result = apply_patch(DOCUMENT, [
+        {"op": "replace", "path": "/personal_info/title", "value": "Staff Engineer"},
+        {"op": "add", "path": "/personal_info/location", "value": "Remote"},
+        {"op": "remove", "path": "/personal_info/name"},
+    ])
+
+    assert result["personal_info"] == {"title": "Staff Engineer", "location": "Remote"}
+
+
+def test_list_insert_append_replace_and_remove():
+    result = apply_patch(DOCUMENT, [
+        {"op": "add", "path": "/skills/0", "value": "Rust"},
+        {"op": "add", "path": "/skills/-", "value": "SQL"},
+        {"op": "replace", "path": "/projects/1", "value": {"name": "C"}},
+        {"op": "remove", "path": "/projects/0"},
+    ])
+
+    assert result["skills"] == ["Rust", "Python", "Go", "SQL"]
+    assert result["projects"] == [{"name": "C"}]
+
+
+def test_original_document_is_not_modified():
+    apply_patch(DOCUMENT, [{"op": "add", "path": "/skills/-", "value": "SQL"}])
+
+    assert DOCUMENT["skills"] == ["Python", "Go"]
+
+
+def test_allowed_roots():
+    result = apply_patch(DOCUMENT, [{"op": "add", "path": "/skills/-", "value": "SQL"}], allowed_roots={"skills"})
+    assert result["skills"][-1] == "SQL"
+
+    with pytest.raises(PatchError):
+        apply_patch(DOCUMENT, [{"op": "remove", "path": "/personal_info/name"}], allowed_roots={"skills"})
+
+
+@pytest.mark.parametrize("operation", [
+    {"op": "replace", "path": "personal_info/name", "value": "x"},
+    {"op": "replace", "path": "", "value": {}},
+    {"op": "add", "path": "/skills/-"},
+    {"op": "replace", "path": "/personal_info/email", "value": "x"},
+    {"op": "remove", "path": "/personal_info/email"},
+    {"op": "remove", "path": "/skills/5"},
+    {"op": "add", "path": "/skills/3", "value": "x"},
+    {"op": "replace", "path": "/skills/first", "value": "x"},
+    {"op": "add", "path": "/missing/child", "value": "x"},
+])
+def test_rejects_invalid_operations(operation):
+    with pytest.raises(PatchError):
+        apply_patch(DOCUMENT, [operation])
+
+
+def test_failed_patch_applies_nothing():
+    document = {"skills": ["Python"]}
+    with pytest.raises(PatchError):
+        apply_patch(document, [
+            {"op": "add", "path": "/skills/-", "value": "Go"},
+            {"op": "remove", "path": "/skills/9"},
+        ])
+
+    assert document == {"skills": ["Python"]}
@@ -0,0 +1,63 @@
+import json
+
+from app.services.json_stream import IncrementalJSONParser
+
+DOCUMENT = {
+    "personal_info": {"name": "Jane \"JD\" Doe", "bio": "Likes {braces}, [brackets] and commas"},
+    "experience": [
+        {"company": "Acme", "responsibilities": ["Built", "Shipped"]},
+        {"company": "Initech", "responsibilities": []},
+    ],
+    "skills": ["Python", "Go"],
+    "projects": [],
+    "summary": None,
+}
+
+
+def feed_all(chunks):
+    parser = IncrementalJSONParser()
+    events = []
+    for chunk in chunks:
+        events.extend(parser.feed(chunk))
+    return parser, events
+
+
+def test_events_for_whole_document():
+    parser, events = feed_all([json.dumps(DOCUMENT)])
+
+    assert events == [
+        ("personal_info", DOCUMENT["personal_info"]),
+        ("experience[0]", DOCUMENT["experience"][0]),
+        ("experience[1]", DOCUMENT["experience"][1]),
+        ("skills", ["Python", "Go"]),
+        ("projects", []),
+        ("summary", None),
+    ]
+    assert parser.done
+
+
+def test_chunk_boundaries_do_not_matter():
+    text = json.dumps(DOCUMENT, indent=2)
+    _, whole = feed_all([text])
+    _, by_char = feed_all(list(text))
+
+    assert by_char == whole
+
+
+def test_array_elements_are_emitted_before_the_array_closes():
+    parser = IncrementalJSONParser()
+
+    assert parser.feed('{"experience": [{"company": "Acme"}') == []
+    assert parser.feed(', {"company": "Init') == [("experience[0]", {"company": "Acme"})]
+    assert parser.feed('ech"}') == []
+    assert parser.feed("]") == [("experience[1]", {"company": "Initech"})]
+    assert not parser.done
+    assert parser.feed("}") == []
+    assert parser.done
+
+
+def test_scalar_arrays_are_emitted_once_closed():
+    parser = IncrementalJSONParser()
+
+    assert parser.feed('{"skills": ["Python", ') == []
+    assert parser.feed('"Go"], ') == [("skills", ["Python", "Go"])]
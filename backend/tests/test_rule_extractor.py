@@ -0,0 +1,134 @@
+from app.services.rule_extractor import RuleBasedExtractor
+
+RESUME = """JANE DOE
+San Francisco, CA | jane.doe@example.com | +1 (415) 555-0134
+linkedin.com/in/janedoe | github.com/janedoe | janedoe.dev
+
+Summary
+Backend engineer who likes fast systems.
+
+Experience
+Senior Engineer at Acme Corp | Jan 2020 - Present
+- Built the billing pipeline
+- Cut p99 latency by 40%
+Software Engineer, Initech
+Jun 2016 - Dec 2019
+- Maintained TPS reports service
+
+Education
+B.Sc. in Computer Science, Stanford University | 2012 - 2016 | GPA: 3.8/4.0
+
+Skills
+Languages: Python, Go, SQL
+Tools: Docker; Kubernetes, python
+
+Projects
+Portfolio Generator (Python, FastAPI): Builds sites from resumes
+github.com/janedoe/portfogen
+"""
+
+
+def extract(text):
+    return RuleBasedExtractor().extract(text)
+
+
+def test_header_contact_details():
+    info = extract(RESUME).data["personal_info"]
+
+    assert info == {
+        "name": "Jane Doe",
+        "email": "jane.doe@example.com",
+        "phone": "+1 (415) 555-0134",
+        "location": "San Francisco, CA",
+        "linkedin": "linkedin.com/in/janedoe",
+        "github": "github.com/janedoe",
+        "website": "janedoe.dev",
+    }
+
+
+def test_experience_date_ranges_on_the_title_line_and_below_it():
+    experience = extract(RESUME).data["experience"]
+
+    assert [(e["position"], e["company"], e["start_date"], e["end_date"]) for e in experience] == [
+        ("Senior Engineer", "Acme Corp", "Jan 2020", "Present"),
+        ("Software Engineer", "Initech", "Jun 2016", "Dec 2019"),
+    ]
+    assert experience[0]["responsibilities"] == ["Built the billing pipeline", "Cut p99 latency by 40%"]
+    assert experience[1]["responsibilities"] == ["Maintained TPS reports service"]
+
+
+def test_date_range_separators():
+    for separator in ("-", "–", "to"):
+        text = f"Experience\nEngineer at Acme | 03/2019 {separator} 2021\n- Shipped things"
+        entry = extract(text).data["experience"][0]
+        assert (entry["start_date"], entry["end_date"]) == ("03/2019", "2021")
+
+
+def test_education_with_degree_and_institution_on_one_line():
+    education = extract(RESUME).data["education"]
+
+    assert education == [{
+        "institution": "Stanford University",
+        "degree": "B.Sc.",
+        "field": "Computer Science",
+        "start_date": "2012",
+        "end_date": "2016",
+        "gpa": "3.8/4.0",
+    }]
+
+
+def test_education_with_degree_and_institution_on_separate_lines():
+    text = "Education\nMassachusetts Institute of Technology\nMaster of Science in Physics\nSep 2010 - Jun 2012"
+    education = extract(text).data["education"]
+
+    assert len(education) == 1
+    assert education[0]["institution"] == "Massachusetts Institute of Technology"
+    assert education[0]["degree"] == "Master of Science"
+    assert education[0]["field"] == "Physics"
+    assert (education[0]["start_date"], education[0]["end_date"]) == ("Sep 2010", "Jun 2012")
+
+
+def test_skills_drop_labels_and_duplicates():
+    assert extract(RESUME).data["skills"] == ["Python", "Go", "SQL", "Docker", "Kubernetes"]
+
+
+def test_projects_with_technologies_and_github_link():
+    assert extract(RESUME).data["projects"] == [{
+        "name": "Portfolio Generator",
+        "description": "Builds sites from resumes",
+        "technologies": ["Python", "FastAPI"],
+        "link": None,
+        "github": "github.com/janedoe/portfogen",
+    }]
+
+
+def test_conventional_resume_is_fully_confident():
+    result = extract(RESUME)
+
+    assert result.confidence == 1.0
+    assert result.missing == []
+
+
+def test_missing_experience_section_is_reported():
+    text = RESUME[:RESUME.index("Experience")] + RESUME[RESUME.index("Education"):]
+    result = extract(text)
+
+    assert result.data["experience"] == []
+    assert "experience" in result.missing
+    assert result.confidence < 1.0
+
+
+def test_unrecognized_text_falls_back_on_every_field():
+    result = extract("some random text\nwith nothing recognizable\nlorem ipsum dolor\nanother line")
+
+    assert result.confidence == 0.0
+    assert set(result.missing) == {
+        "personal_info", "experience", "education", "skills", "projects", "summary", "certifications"
+    }
+
+
+def test_empty_text():
+    result = extract("")
+
+    assert result.confidence == 0.0
+    assert result.data["personal_info"]["name"] is None